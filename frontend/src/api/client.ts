@@ -1,4 +1,4 @@
-import type { LicensingPayload, SearchFilters, TrackResult, UiMetadata } from '../types'
+import type { LicensingPayload, ScoringProfile, SearchFilters, TrackResult, UiMetadata } from '../types'
 
 const API_BASE = '/api'
 
@@ -226,3 +226,19 @@ export async function fetchUiMetadata(): Promise<UiMetadata> {
   }
   return response.json() as Promise<UiMetadata>
 }
+
+export async function rescoreResults(
+  results: TrackResult[],
+  profile: ScoringProfile,
+  limit?: number,
+): Promise<TrackResult[]> {
+  const response = await fetch(`${API_BASE}/rescore`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ results, profile, limit }),
+  })
+  if (!response.ok) {
+    throw new Error(`Rescore request failed: ${response.status}`)
+  }
+  return ((await response.json()) as { results: TrackResult[] }).results
+}
@@ -133,10 +133,10 @@ export function SearchPanel({
             <input
               className="text-input"
               type="file"
-              accept=".csv,.xml"
+              accept=".csv,.gz,.zst,.xml,.parquet,.arrow,.feather"
               onChange={(e) => onCatalogFileChange(e.target.files?.[0] ?? null)}
             />
-            <div className="helper-text">{catalogFileName || 'Upload a .csv or .xml catalog file'}</div>
+            <div className="helper-text">{catalogFileName || 'Upload a catalog file (.csv, .csv.gz, .csv.zst, .xml, .parquet, .arrow)'}</div>
             <label className="checkbox-row">
               <span>Remixes per song</span>
               <input
@@ -93,7 +93,7 @@ export function useSearch() {
         setStatus('Complete: 1 track')
       } else if (mode === 'catalog_search' || mode === 'catalog_scatter') {
         if (!options?.catalogFile) {
-          setError('Please select a .csv or .xml catalog file first.')
+          setError('Please select a catalog file first.')
           setStatus('Catalog file required.')
           return
         }
@@ -76,6 +76,15 @@ export interface TrackResult {
     mid_revenue?: number
     threshold?: number
   }
+  scoring_inputs?: Record<string, number | string | null>
+}
+
+export interface ScoringProfile {
+  weights?: Record<string, Record<string, number>>
+  label_thresholds?: Partial<Record<Exclude<OpportunityLabel, 'WEAK'>, number>>
+  viability_threshold?: number
+  projection_tiers?: Record<string, number>
+  stream_rates?: Record<string, number>
 }
 
 export interface LicensingEntry {
@@ -0,0 +1,9 @@
+"""
+Benchmarks for Remix Radar.
+
+    python -m scripts.bench.e2e      # pipeline workflows against the local fakes
+    python -m scripts.bench.micro    # per-track CPU paths: ns/op and allocations
+
+Results are written as JSON under bench-results/ (see results.py) so runs
+from different commits can be compared with --compare.
+"""
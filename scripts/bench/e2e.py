@@ -0,0 +1,330 @@
+"""
+End-to-end throughput benchmark for the pipeline workflows.
+
+Each scenario runs one workflow from scripts.pipeline (or pipeline_async)
+against FakeServices serving a seeded synthetic world, with injected
+latency and the Chartmetric quota enforced on both sides:
+
+    analyze_url                 1 SoundCloud URL
+    analyze_url_async           same, through pipeline_async
+    search_song_remixes         one song, 20 remixes
+    search_song_remixes_async   same, through pipeline_async
+    search_artist_remixes       8 songs x 6 remixes for one artist
+    discover_remixes            30 tracks from discovery search
+    process_catalog_100         100-song catalog CSV, 5 remixes per song
+    process_catalog_1000        1,000-song catalog
+    process_catalog_10000       10,000-song catalog (skipped by --quick)
+
+Every scenario runs in a fresh interpreter (python -m scripts.bench.e2e
+--worker ...) so in-process caches, the rate limiter and peak RSS start
+cold, and scripts.config picks up the fake base URLs. The worker uses
+its own empty response-cache file.
+
+Reported per scenario: wall time, reports, per-track latency p50/p95/max
+(analyze_track_object), upstream calls per endpoint and non-200
+statuses (counted by the fakes), cache hit rates, rate-limiter waits and
+peak RSS. Results go to bench-results/e2e-<commit>-<time>.json.
+
+The default Chartmetric quota is scaled up (--cm-rps 200) so the larger
+catalogs finish in minutes; --cm-rps 4 --cm-burst 4 reproduces the
+production contract.
+
+Usage:
+    python -m scripts.bench.e2e --quick
+    python -m scripts.bench.e2e process_catalog_1000 --latency lognormal:60:0.5 --fault cm:429=0.01
+    python -m scripts.bench.e2e --compare bench-results/e2e-<old>.json
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from scripts.bench.results import REPO_ROOT, compare, format_comparison, load_results, write_results
+from scripts.fakes import FakeServices, Fixtures, parse_fault_specs, parse_latency_specs
+
+# name -> (world size (songs, remixes per song, songs per artist), workflow, workflow kwargs)
+SCENARIOS = {
+    "analyze_url": ((100, 5, 3), "analyze_url", {}),
+    "analyze_url_async": ((100, 5, 3), "analyze_url_async", {}),
+    "search_song_remixes": ((20, 20, 3), "search_song_remixes", {"limit": 20}),
+    "search_song_remixes_async": ((20, 20, 3), "search_song_remixes_async", {"limit": 20}),
+    "search_artist_remixes": ((64, 6, 8), "search_artist_remixes", {"limit_songs": 8, "limit_remixes": 6}),
+    "discover_remixes": ((100, 5, 3), "discover_remixes", {"limit": 30}),
+    "process_catalog_100": ((100, 5, 3), "process_catalog", {"limit_remixes": 5}),
+    "process_catalog_1000": ((1000, 5, 3), "process_catalog", {"limit_remixes": 5}),
+    "process_catalog_10000": ((10000, 5, 3), "process_catalog", {"limit_remixes": 5}),
+}
+QUICK_SKIP = ("process_catalog_10000",)
+
+# Metrics --compare checks, and which direction is better.
+COMPARE_METRICS = {
+    "wall_s": "lower",
+    "track_latency_ms.p50": "lower",
+    "track_latency_ms.p95": "lower",
+    "upstream.total": "lower",
+    "cache.hit_rate": "higher",
+    "peak_rss_mb": "lower",
+}
+
+
+# ── Scenario inputs ────────────────────────────────────────────────
+
+def _scenario_inputs(fixtures, workflow, kwargs, workdir):
+    """Resolve the workflow's arguments against the world it runs on."""
+    kwargs = dict(kwargs)
+    catalog = fixtures.catalog_rows()
+    if workflow.startswith("analyze_url"):
+        # First "Artist - Song (Remixer Remix)" track, so the full enrichment path runs.
+        tracks = fixtures.search_sc_tracks("remix", limit=50)
+        kwargs["sc_url"] = next(t for t in tracks if " - " in t["title"])["permalink_url"]
+    elif workflow.startswith("search_song_remixes"):
+        kwargs["song_name"], kwargs["artist_name"] = catalog[0]["title"], catalog[0]["artist"]
+    elif workflow == "search_artist_remixes":
+        counts = {}
+        for row in catalog:
+            counts[row["artist"]] = counts.get(row["artist"], 0) + 1
+        kwargs["artist_name"] = max(counts, key=counts.get)
+    elif workflow == "process_catalog":
+        path = os.path.join(workdir, "catalog.csv")
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=("artist", "title", "isrc"))
+            writer.writeheader()
+            writer.writerows(catalog)
+        kwargs["filepath"] = path
+    return kwargs
+
+
+# ── Worker (runs in the child interpreter) ─────────────────────────
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def _peak_rss_mb():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_worker(spec):
+    """Run one workflow in this (fresh) process and return its metrics."""
+    import asyncio
+
+    from scripts import pipeline, pipeline_async
+    from scripts.models import title_parse_cache_stats
+    from scripts.platforms import chartmetric
+    from scripts.platforms.chartmetric import new_artist_cache, new_track_isrc_cache
+
+    durations = []
+
+    def _timed(analyze):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return analyze(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - t0)
+        return wrapper
+
+    def _timed_async(analyze):
+        async def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await analyze(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - t0)
+        return wrapper
+
+    pipeline.analyze_track_object = _timed(pipeline.analyze_track_object)
+    pipeline_async.analyze_track_object = _timed_async(pipeline_async.analyze_track_object)
+
+    artist_cache, isrc_cache = new_artist_cache(), new_track_isrc_cache()
+    workflow, kwargs, workers = spec["workflow"], spec["kwargs"], spec["workers"]
+
+    t0 = time.perf_counter()
+    if workflow.endswith("_async"):
+        clients = pipeline_async.make_async_clients(artist_cache=artist_cache, track_isrc_cache=isrc_cache)
+        if workflow == "analyze_url_async":
+            result = asyncio.run(pipeline_async.analyze_url(kwargs["sc_url"], clients))
+        else:
+            result = asyncio.run(pipeline_async.search_song_remixes(clients=clients, max_concurrency=workers, **kwargs))
+    else:
+        clients = pipeline.make_clients(artist_cache=artist_cache, track_isrc_cache=isrc_cache)
+        if workflow == "analyze_url":
+            result = pipeline.analyze_url(kwargs["sc_url"], clients)
+        elif workflow == "search_artist_remixes":
+            result = pipeline.search_artist_remixes(clients=clients, **kwargs)
+        else:
+            result = getattr(pipeline, workflow)(clients=clients, max_workers=workers, **kwargs)
+    wall = time.perf_counter() - t0
+
+    reports = [result] if isinstance(result, dict) else (result or [])
+    durations.sort()
+    caches = {
+        "artist": artist_cache.stats(),
+        "track_isrc": isrc_cache.stats(),
+        "cm_search_memo": chartmetric.search_memo.stats(),
+        "response_cache": chartmetric.response_cache.stats() if chartmetric.response_cache else None,
+    }
+    # Overall: lookups of the upstream-facing caches answered without a request.
+    hits = lookups = 0
+    for stats in caches.values():
+        if stats:
+            served = stats["hits"] + stats.get("stale_hits", 0)
+            hits += served
+            lookups += served + stats["misses"]
+    caches["title_parse"] = title_parse_cache_stats()
+    caches["cm_search"] = chartmetric.search_stats.stats()
+    return {
+        "wall_s": round(wall, 3),
+        "reports": len(reports),
+        "tracks_analyzed": len(durations),
+        "track_latency_ms": {
+            "p50": round(_percentile(durations, 50) * 1000, 2) if durations else None,
+            "p95": round(_percentile(durations, 95) * 1000, 2) if durations else None,
+            "max": round(durations[-1] * 1000, 2) if durations else None,
+        },
+        "cache": {"hit_rate": round(hits / lookups, 4) if lookups else 0.0, **caches},
+        "rate_limiter": chartmetric.rate_limiter.stats(),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# ── Driver ─────────────────────────────────────────────────────────
+
+def run_scenario(name, args, latency, faults):
+    (songs, remixes, per_artist), workflow, kwargs = SCENARIOS[name]
+    fixtures = Fixtures.synthetic(songs, remixes, args.seed, songs_per_artist=per_artist)
+    with tempfile.TemporaryDirectory(prefix="bench-e2e-") as workdir, FakeServices(
+        fixtures,
+        latency=latency,
+        faults=faults,
+        cm_rate_limit=(args.cm_rps, args.cm_burst) if args.cm_rps > 0 else None,
+        seed=args.seed,
+    ) as fakes:
+        spec = {
+            "workflow": workflow,
+            "kwargs": _scenario_inputs(fixtures, workflow, kwargs, workdir),
+            "workers": args.workers,
+        }
+        env = {
+            **os.environ,
+            **fakes.env(),
+            # Client throttle matches the fakes' quota (unlimited fakes -> effectively unthrottled client).
+            "CM_RATE_LIMIT_RPS": str(args.cm_rps if args.cm_rps > 0 else 1e6),
+            "CM_RATE_LIMIT_BURST": str(args.cm_burst if args.cm_rps > 0 else 1_000_000),
+            "CM_CACHE_ENABLED": "1",
+            "CM_CACHE_PATH": os.path.join(workdir, "chartmetric.sqlite3"),
+        }
+        proc = subprocess.run(
+            [sys.executable, "-m", "scripts.bench.e2e", "--worker", json.dumps(spec)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=args.timeout,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed (exit {proc.returncode}):\n{proc.stderr[-4000:]}")
+        metrics = json.loads(proc.stdout.strip().splitlines()[-1])
+        upstream = fakes.stats()
+
+    errors = {}
+    for route, statuses in upstream["status"].items():
+        failed = sum(count for status, count in statuses.items() if status != "200")
+        if failed:
+            errors[route] = failed
+    return {
+        "workflow": workflow,
+        "world": {"songs": songs, "remixes_per_song": remixes, "songs_per_artist": per_artist},
+        **metrics,
+        "upstream": {
+            "total": upstream["total"],
+            "calls": upstream["calls"],
+            "errors": errors,
+            "injected_latency_s": upstream["injected_latency_s"],
+        },
+    }
+
+
+def _format_row(name, m):
+    lat = m["track_latency_ms"]
+    fmt = lambda v: f"{v:.1f}" if v is not None else "-"  # noqa: E731
+    return (f"{name:<27} {m['wall_s']:>8.2f} {m['reports']:>7} {fmt(lat['p50']):>8} {fmt(lat['p95']):>8} "
+            f"{m['upstream']['total']:>8} {m['cache']['hit_rate']:>6.1%} {m['peak_rss_mb']:>7.1f}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench.e2e", description="Pipeline workflow benchmarks")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument("--quick", action="store_true", help=f"skip {', '.join(QUICK_SKIP)}")
+    parser.add_argument("--workers", type=int, default=8, help="max_workers / max_concurrency for the workflows")
+    parser.add_argument("--latency", action="append", default=[], metavar="[SERVICE=]SPEC",
+                        help="fake latency (default lognormal:25:0.5 for every service)")
+    parser.add_argument("--fault", action="append", default=[], metavar="SERVICE:STATUS=RATE")
+    parser.add_argument("--cm-rps", type=float, default=200.0, help="Chartmetric quota, client and fakes (0 = unlimited)")
+    parser.add_argument("--cm-burst", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds per scenario")
+    parser.add_argument("--out", help="results file or directory (default: bench-results/)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged as a regression")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.worker:
+        print(json.dumps(_run_worker(json.loads(args.worker))))
+        return 0
+
+    names = args.scenarios or [n for n in SCENARIOS if not (args.quick and n in QUICK_SKIP)]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"error: unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    try:
+        latency = parse_latency_specs(args.latency or ["lognormal:25:0.5"])
+        faults = parse_fault_specs(args.fault)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    print(f"{'scenario':<27} {'wall_s':>8} {'reports':>7} {'p50_ms':>8} {'p95_ms':>8} "
+          f"{'calls':>8} {'hit%':>6} {'rss_mb':>7}")
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, args, latency, faults)
+        print(_format_row(name, results[name]), flush=True)
+
+    config = {
+        "scenarios": names,
+        "workers": args.workers,
+        "latency": {service: repr(spec) for service, spec in latency.items()},
+        "faults": faults,
+        "cm_rps": args.cm_rps,
+        "cm_burst": args.cm_burst,
+        "seed": args.seed,
+    }
+    path = write_results("e2e", results, config, out=args.out)
+    print(f"\nwrote {path}")
+
+    if args.compare:
+        rows = compare(load_results(args.compare), {"results": results}, COMPARE_METRICS, args.threshold)
+        print()
+        print(format_comparison(rows))
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Microbenchmarks for the per-track CPU paths.
+
+Once network work is cached, every analysed track still pays for title
+parsing, scoring, the API summary and (on the CLI) text rendering. This
+suite times those functions in isolation:
+
+    models.parse_remix_title        memoised, over the corpus in order
+    models._parse_title (uncached)  the scanner itself, memo bypassed
+    models._log_score               on the play/listener/follower counts
+    models.build_opportunity_score  with the arguments _build_report passes
+    search._score_label_candidate   on the label strings of the reports
+    search._pick_track_label        on each report's original_track
+    search._summarize_report        full report -> API summary
+    reporting.format_track_report   one report -> text
+    reporting.format_summary_table  25 reports -> ranked table
+
+Inputs come from one seeded synthetic world (scripts.fakes): 100,000
+SoundCloud titles, with the golden parser corpus mixed in for the awkward
+real-world formats, and 10,000 reports assembled from the world's
+Chartmetric data by the pipeline's own record builders and
+_build_report. No network is touched.
+
+Per benchmark:
+    ns_per_op            best of --repeat passes over the inputs (median too)
+    alloc_blocks_per_op  objects still alive per call when results are kept
+                         (sys.getallocatedblocks delta, GC off)
+    alloc_bytes_per_op   bytes still alive per call (tracemalloc)
+    peak_bytes_per_op    transient working memory per call (tracemalloc peak)
+
+The "harness.noop" row is the cost of the benchmark loop itself and is
+included in every ns_per_op. Results go to bench-results/micro-<commit>-<time>.json.
+
+Usage:
+    python -m scripts.bench.micro
+    python -m scripts.bench.micro parse_remix_title summarize_report --titles 20000
+    python -m scripts.bench.micro --compare bench-results/micro-<old>.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from scripts.bench.results import REPO_ROOT, compare, format_comparison, load_results, write_results
+from scripts.fakes import Fixtures
+from scripts.fakes.server import FAKE_CLIENT_ID
+
+# scripts.config fetches a SoundCloud client_id over the network when none is set.
+os.environ.setdefault("SOUNDCLOUD_CLIENT_ID", FAKE_CLIENT_ID)
+
+from scripts import models, reporting  # noqa: E402
+from scripts.pipeline import _artist_record, _build_report, _isrc_track_record, normalize_sc_track  # noqa: E402
+from scripts.platforms.soundcloud import SoundCloudClient  # noqa: E402
+from server.routes import search  # noqa: E402
+
+GOLDEN_PATH = os.path.join(REPO_ROOT, "scripts", "testdata", "remix_titles_golden.json")
+TABLE_ROWS = 25
+
+# Metrics --compare checks, and which direction is better.
+COMPARE_METRICS = {"ns_per_op": "lower", "alloc_blocks_per_op": "lower", "peak_bytes_per_op": "lower"}
+
+# Label spellings seen in Chartmetric album/track metadata that the picker must rank.
+_LABEL_VARIANTS = ("{label}", "{label} UK", "2019 {label}", "{label} / {other}", "{label} | {other}",
+                   "Unknown", "", "{label} Music Group; {other}")
+
+
+# ── Corpus ─────────────────────────────────────────────────────────
+
+def build_corpus(titles=100_000, reports=10_000, seed=0):
+    """(titles, reports) for the benchmarks; same arguments, same inputs."""
+    rng = random.Random(seed)
+    fixtures = Fixtures.synthetic(songs=max(1, titles // 6), remixes_per_song=5, seed=seed)
+    tracks = list(fixtures.sc_tracks.values())
+    with open(GOLDEN_PATH, encoding="utf-8") as fh:
+        golden = [row[0] for row in json.load(fh)]
+
+    corpus = [t["title"] for t in tracks]
+    corpus = (corpus * (titles // max(len(corpus), 1) + 1))[:titles - min(len(golden), titles // 10)]
+    corpus.extend(golden[:titles - len(corpus)])
+    rng.shuffle(corpus)
+
+    labels = sorted({album["label"] for album in fixtures.cm_albums.values()} - {""})
+    sample = rng.sample(tracks, min(reports, len(tracks)))
+    return corpus, [_report(fixtures, track, rng, labels) for track in sample]
+
+
+def _artist(fixtures, name):
+    for search_result in fixtures.search_cm_artists(name, limit=1):
+        if search_result["name"].casefold() == name.casefold():
+            artist = fixtures.cm_artists[search_result["id"]]
+            return _artist_record(name, search_result, artist["meta"], artist["career"], artist["ids"])
+    return None
+
+
+def _original_track(fixtures, parsed, rng, labels):
+    artist, song = parsed["original_artist"], parsed["original_song"]
+    if not artist or not song:
+        return None
+    for hit in fixtures.search_cm_tracks(f"{song} {artist}"):
+        if hit["name"] != song or " & ".join(hit["artist_names"]) != artist:
+            continue
+        track_id, full = hit["id"], dict(fixtures.cm_tracks[hit["id"]])
+        album = fixtures.cm_albums.get((full.get("album_ids") or [None])[0]) or {}
+        if full.get("release_dates"):
+            full["release_date"] = full["release_dates"][0]
+        variant = rng.choice(_LABEL_VARIANTS)
+        full["album_label"] = variant.format(label=full["record_label"], other=rng.choice(labels))
+        return _isrc_track_record(track_id, full, full["isrc"], album.get("label") or "")
+    return None
+
+
+def _report(fixtures, sc_track, rng, labels):
+    """A pipeline report for `sc_track`, enriched from the world's Chartmetric data."""
+    norm_track = normalize_sc_track(sc_track)
+    parsed = models.parse_remix_title(norm_track["title"])
+    sc_metrics = SoundCloudClient.compute_metrics(sc_track)
+    original_name = (parsed["original_artist"] or "").split(" & ")[0]
+    original_artist = _artist(fixtures, original_name) if original_name else None
+    remix_name = parsed["remix_artist"] or sc_track["user"]["username"]
+    remix_artist = _artist(fixtures, remix_name)
+    original_track = _original_track(fixtures, parsed, rng, labels)
+    return _build_report(norm_track, parsed, sc_metrics, original_artist, remix_artist, original_track)
+
+
+# ── Harness ────────────────────────────────────────────────────────
+
+def _noop(*args):
+    return None
+
+
+def _time(fn, inputs, repeat):
+    """ns per call for each of `repeat` passes over `inputs` (GC off, like timeit)."""
+    per_op = []
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter_ns()
+            for args in inputs:
+                fn(*args)
+            per_op.append((time.perf_counter_ns() - t0) / len(inputs))
+    finally:
+        if enabled:
+            gc.enable()
+    return per_op
+
+
+def _allocations(fn, inputs):
+    """(blocks, bytes, peak bytes) per call, keeping every result alive."""
+    n = len(inputs)
+    kept = [None] * n
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        for i, args in enumerate(inputs):
+            kept[i] = fn(*args)
+        blocks = sys.getallocatedblocks() - before
+
+        kept = [None] * n
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            peak_total = 0
+            for i, args in enumerate(inputs):
+                tracemalloc.reset_peak()
+                current, _ = tracemalloc.get_traced_memory()
+                kept[i] = fn(*args)
+                peak_total += tracemalloc.get_traced_memory()[1] - current
+            retained = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+    finally:
+        gc.enable()
+    return blocks / n, retained / n, peak_total / n
+
+
+def run_benchmark(fn, inputs, repeat, alloc_sample, setup=None):
+    """Time `fn` over `inputs` (argument tuples) and count allocations on a sample."""
+    if setup:
+        setup()
+    timings = _time(fn, inputs, repeat)
+    if setup:
+        setup()
+    blocks, retained, peak = _allocations(fn, inputs[:alloc_sample])
+    return {
+        "ops": len(inputs),
+        "ns_per_op": round(min(timings), 1),
+        "ns_per_op_median": round(statistics.median(timings), 1),
+        "alloc_blocks_per_op": round(blocks, 2),
+        "alloc_bytes_per_op": round(retained, 1),
+        "peak_bytes_per_op": round(peak, 1),
+    }
+
+
+# ── Benchmarks ─────────────────────────────────────────────────────
+
+def _clear_title_cache():
+    models._parse_title.cache_clear()
+
+
+def benchmarks(titles, reports):
+    """name -> (function, argument tuples, setup)."""
+    counts = []
+    for report in reports:
+        metrics = report["sc_metrics"]
+        counts.append((metrics["plays"],))
+        for artist in (report["original_artist"], report["remix_artist"]):
+            if artist:
+                counts.append((artist.get("sp_monthly_listeners"),))
+                counts.append((artist.get("sp_followers"),))
+
+    score_args = []
+    for report in reports:
+        original, remix = report["original_artist"] or {}, report["remix_artist"] or {}
+        score_args.append((
+            report["sc_metrics"], original, remix, original.get("geo_cities", []), remix.get("geo_cities", []),
+            original.get("career", {}), remix.get("career", {}), report["revenue"]["projections"],
+        ))
+
+    tracks = [(report["original_track"] or {},) for report in reports]
+    labels = []
+    for (track,) in tracks:
+        for key in ("album_record_label", "track_record_label", "album_label"):
+            value = track.get(key)
+            if isinstance(value, str):
+                labels.append((value,))
+
+    ranked = sorted(reports, key=lambda r: r["opportunity_score"]["overall"], reverse=True)
+    tables = [(ranked[i:i + TABLE_ROWS],) for i in range(0, len(ranked), TABLE_ROWS)]
+
+    title_args = [(title,) for title in titles]
+    return {
+        "harness.noop": (_noop, title_args, None),
+        "parse_remix_title": (models.parse_remix_title, title_args, _clear_title_cache),
+        "parse_title_uncached": (models._parse_title.__wrapped__, title_args, None),
+        "log_score": (models._log_score, counts, None),
+        "build_opportunity_score": (models.build_opportunity_score, score_args, None),
+        "score_label_candidate": (search._score_label_candidate, labels, None),
+        "pick_track_label": (search._pick_track_label, tracks, None),
+        "summarize_report": (search._summarize_report, [(r,) for r in reports], None),
+        "format_track_report": (reporting.format_track_report, [(r,) for r in reports], None),
+        "format_summary_table": (reporting.format_summary_table, tables, None),
+    }
+
+
+# ── Driver ─────────────────────────────────────────────────────────
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench.micro", description="Per-track CPU microbenchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK", help="benchmarks to run (default: all)")
+    parser.add_argument("--titles", type=int, default=100_000, help="SoundCloud titles in the corpus")
+    parser.add_argument("--reports", type=int, default=10_000, help="synthetic reports")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes per benchmark")
+    parser.add_argument("--alloc-sample", type=int, default=5_000, help="calls measured for allocations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="results file or directory (default: bench-results/)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged as a regression")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    t0 = time.perf_counter()
+    titles, reports = build_corpus(args.titles, args.reports, args.seed)
+    print(f"corpus: {len(titles):,} titles, {len(reports):,} reports ({time.perf_counter() - t0:.1f}s)\n")
+
+    table = benchmarks(titles, reports)
+    names = args.benchmarks or list(table)
+    unknown = [n for n in names if n not in table]
+    if unknown:
+        print(f"error: unknown benchmark(s): {', '.join(unknown)} (expected: {', '.join(table)})", file=sys.stderr)
+        return 2
+
+    print(f"{'benchmark':<26} {'ops':>8} {'ns/op':>10} {'median':>10} {'blocks/op':>10} {'bytes/op':>10} {'peak/op':>10}")
+    results = {}
+    for name in names:
+        fn, inputs, setup = table[name]
+        result = run_benchmark(fn, inputs, args.repeat, args.alloc_sample, setup)
+        if name == "parse_remix_title":
+            result["cache"] = models.title_parse_cache_stats()
+        results[name] = result
+        print(f"{name:<26} {result['ops']:>8} {result['ns_per_op']:>10.1f} {result['ns_per_op_median']:>10.1f} "
+              f"{result['alloc_blocks_per_op']:>10.2f} {result['alloc_bytes_per_op']:>10.1f} "
+              f"{result['peak_bytes_per_op']:>10.1f}", flush=True)
+
+    config = {
+        "benchmarks": names,
+        "titles": len(titles),
+        "reports": len(reports),
+        "repeat": args.repeat,
+        "alloc_sample": args.alloc_sample,
+        "seed": args.seed,
+        "title_parse_cache_size": models._parse_title.cache_info().maxsize,
+    }
+    path = write_results("micro", results, config, out=args.out)
+    print(f"\nwrote {path}")
+
+    if args.compare:
+        rows = compare(load_results(args.compare), {"results": results}, COMPARE_METRICS, args.threshold)
+        print()
+        print(format_comparison(rows))
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Machine-readable benchmark results, shared by the bench suites.
+
+Every run writes one JSON document:
+
+    {
+      "suite":   "e2e",
+      "meta":    {"commit", "dirty", "started_at", "python", "platform", "cpus", "argv"},
+      "config":  {...suite options...},
+      "results": {"<scenario>": {...metrics...}, ...}
+    }
+
+to bench-results/<suite>-<commit>[-dirty]-<timestamp>.json, so runs from
+different commits sit side by side and compare() can diff any two.
+
+Usage:
+    from scripts.bench.results import compare, format_comparison, load_results, write_results
+
+    path = write_results("e2e", results, config)
+    rows = compare(load_results(old_path), load_results(path), {"wall_s": "lower"})
+    print(format_comparison(rows))
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUT_DIR = os.path.join(REPO_ROOT, "bench-results")
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata():
+    """Where and on what code a run happened."""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "--short=12", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "argv": sys.argv[1:],
+    }
+
+
+def write_results(suite, results, config, meta=None, out=None):
+    """Write a results document; `out` is a file path or directory. Returns the path."""
+    meta = meta or run_metadata()
+    out = out or DEFAULT_OUT_DIR
+    if not out.endswith(".json"):
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        name = f"{suite}-{meta['commit'] or 'nogit'}{'-dirty' if meta['dirty'] else ''}-{stamp}.json"
+        out = os.path.join(out, name)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump({"suite": suite, "meta": meta, "config": config, "results": results}, fh, indent=2)
+        fh.write("\n")
+    return out
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _lookup(metrics, dotted):
+    value = metrics
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(baseline, current, metrics, threshold=0.10):
+    """
+    Per-scenario change of each metric between two results documents.
+
+    `metrics` maps dotted metric paths to "lower" or "higher" (which
+    direction is better). Returns rows of (scenario, metric, old, new,
+    relative change, regressed), where regressed means worse by more
+    than `threshold`. Scenarios missing from either side are skipped.
+    """
+    rows = []
+    old_results, new_results = baseline.get("results", {}), current.get("results", {})
+    for scenario, new in new_results.items():
+        old = old_results.get(scenario)
+        if not old:
+            continue
+        for metric, better in metrics.items():
+            before, after = _lookup(old, metric), _lookup(new, metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+            worse = change > threshold if better == "lower" else change < -threshold
+            rows.append((scenario, metric, before, after, change, worse))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'scenario':<28} {'metric':<24} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for scenario, metric, before, after, change, regressed in rows:
+        flag = "  REGRESSED" if regressed else ""
+        lines.append(f"{scenario:<28} {metric:<24} {before:>12.4g} {after:>12.4g} {change:>+8.1%}{flag}")
+    return "\n".join(lines)
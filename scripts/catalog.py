@@ -1,21 +1,50 @@
-"""Catalog import utilities for bulk (Option 1) workflows."""
+"""
+Catalog import utilities for bulk (Option 1) workflows.
+
+Supported inputs: .csv, .csv.gz, .csv.zst, .xml, .parquet and Arrow IPC
+(.arrow / .feather). Every format is streamed — CSV line by line, XML
+with iterparse, Parquet/Arrow in record batches projected to the
+artist/title/isrc columns — so catalogs of millions of rows are never
+materialised in memory. Parquet/Arrow need `pyarrow` and .csv.zst needs
+`zstandard`; both are optional and only imported for those formats.
+"""
 
 import csv
+import gzip
+import io
+import mmap
+import os
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+from scripts.catalog_index import CatalogDedupIndex
+
+# Column/header aliases, in priority order, shared by CSV and columnar inputs.
+_ARTIST_KEYS = ("artist", "artist_name")
+_TITLE_KEYS = ("title", "song", "song_title", "track_name")
+_ISRC_KEYS = ("isrc",)
+
+SUPPORTED_SUFFIXES = (".csv", ".csv.gz", ".csv.zst", ".xml", ".parquet", ".arrow", ".feather")
+_BATCH_ROWS = 64 * 1024
+
+
+def catalog_suffix(filename):
+    """Return the supported catalog suffix of `filename` (e.g. ".csv.gz"), or None."""
+    name = (filename or "").lower()
+    for suffix in sorted(SUPPORTED_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    return None
 
 
 def parse_catalog_file(filepath):
     """
-    Parse CSV or XML catalog files into a normalized song list.
+    Parse a catalog file into a normalized song list.
 
     Returns list of:
         {"artist": str|None, "title": str|None, "isrc": str|None}
     """
-    if filepath.lower().endswith(".csv"):
-        return _parse_csv(filepath)
-    if filepath.lower().endswith(".xml"):
-        return _parse_xml(filepath)
-    raise ValueError("Unsupported catalog format. Use .csv or .xml")
+    return list(stream_catalog_records(filepath))
 
 
 def stream_catalog_records(filepath):
@@ -23,30 +52,106 @@ def stream_catalog_records(filepath):
     Lazy generator version of parse_catalog_file.
 
     Yields one normalized record at a time so callers can start processing
-    without waiting for the full file to be read into memory.
-    XML falls back to full parse (not easily streamed).
+    without waiting for the full file to be read into memory. Memory stays
+    flat regardless of file size for every supported format.
+
+    A file that cannot be decoded raises ValueError (UnicodeDecodeError,
+    or a corrupt .gz/.zst stream) or xml.etree.ElementTree.ParseError.
     """
-    if filepath.lower().endswith(".csv"):
-        with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                record = _norm_record(
-                    artist=row.get("artist") or row.get("artist_name"),
-                    title=row.get("title") or row.get("song") or row.get("song_title") or row.get("track_name"),
-                    isrc=row.get("isrc"),
-                )
-                if record["artist"] or record["title"] or record["isrc"]:
-                    yield record
-    elif filepath.lower().endswith(".xml"):
-        yield from parse_catalog_file(filepath)
+    suffix = catalog_suffix(filepath)
+    if suffix in (".csv", ".csv.gz", ".csv.zst"):
+        corrupt = (EOFError, gzip.BadGzipFile)
+        if suffix == ".csv.zst":
+            corrupt += (_import_optional("zstandard", "zstandard", ".csv.zst").ZstdError,)
+        try:
+            with _open_csv_text(filepath, suffix) as f:
+                for row in csv.DictReader(f):
+                    record = _record_from_row(row)
+                    if record["artist"] or record["title"] or record["isrc"]:
+                        yield record
+        except corrupt as exc:
+            raise ValueError(f"corrupt {suffix} file: {exc}") from exc
+    elif suffix == ".xml":
+        yield from _iter_xml(filepath)
+    elif suffix == ".parquet":
+        yield from _iter_parquet(filepath)
+    elif suffix in (".arrow", ".feather"):
+        yield from _iter_arrow(filepath)
     else:
-        raise ValueError("Unsupported catalog format. Use .csv or .xml")
+        raise ValueError(f"Unsupported catalog format. Use one of: {', '.join(SUPPORTED_SUFFIXES)}")
+
+
+def iter_catalog_songs(filepath, offset=0, count=0, index=None):
+    """
+    Yield the catalog records a search should run for.
+
+    Skips records without a title and duplicates (see CatalogDedupIndex:
+    normalised ISRC, else normalised artist + title among ISRC-less rows),
+    then applies the `offset`/`count` window over what remains (count=0
+    means no limit).
+    Yielded records carry the normalised ISRC (None if missing/invalid).
+    Pass your own `index` to read its stats() afterwards.
+    """
+    if index is None:
+        index = CatalogDedupIndex()
+    valid_idx = 0  # counts records that pass dedup + have a title
+    for record in stream_catalog_records(filepath):
+        if not record.get("title"):
+            continue
+        if not index.add(record):
+            continue
 
+        valid_idx += 1
+        if valid_idx <= offset:
+            continue
+        if count > 0 and (valid_idx - offset) > count:
+            return
+        yield record
 
-def count_csv_rows(filepath):
-    """Fast approximate row count for a CSV (excludes header). Used to show progress before streaming."""
-    with open(filepath, "r", encoding="utf-8-sig") as f:
-        return max(0, sum(1 for _ in f) - 1)
+
+def count_csv_rows(filepath, chunk_size=8 << 20):
+    """
+    Fast row count for a CSV (excludes header). Used to show progress before streaming.
+
+    Counts newline bytes over a memory-mapped view in fixed-size chunks,
+    so it never decodes text and never holds more than one chunk.
+    """
+    with open(filepath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = sum(mm[i:i + chunk_size].count(b"\n") for i in range(0, size, chunk_size))
+            if mm[size - 1:size] != b"\n":
+                lines += 1  # last row has no trailing newline
+    return max(0, lines - 1)
+
+
+def count_catalog_rows(filepath):
+    """
+    Cheap exact row count where the format allows it, else None.
+
+    Plain CSV counts newlines (see count_csv_rows); Parquet reads the row
+    count from the footer metadata. Compressed CSV and XML return None.
+    """
+    suffix = catalog_suffix(filepath)
+    if suffix == ".csv":
+        return count_csv_rows(filepath)
+    if suffix == ".parquet":
+        pq = _import_optional("pyarrow.parquet", "pyarrow", "Parquet")
+        return pq.ParquetFile(filepath).metadata.num_rows
+    return None
+
+
+def estimate_csv_rows(filepath, sample_bytes=1 << 16):
+    """Quick row estimate (excludes header) from the average row length of the first `sample_bytes`."""
+    size = os.path.getsize(filepath)
+    with open(filepath, "rb") as f:
+        sample = f.read(sample_bytes)
+    newlines = sample.count(b"\n")
+    if not newlines or len(sample) >= size:
+        return count_csv_rows(filepath)
+    return max(0, round(size * newlines / len(sample)) - 1)
 
 
 def _norm_record(artist=None, title=None, isrc=None):
@@ -57,42 +162,178 @@ def _norm_record(artist=None, title=None, isrc=None):
     }
 
 
-def _parse_csv(filepath):
-    rows = []
-    with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(
-                _norm_record(
-                    artist=row.get("artist") or row.get("artist_name"),
-                    title=row.get("title") or row.get("song") or row.get("song_title") or row.get("track_name"),
-                    isrc=row.get("isrc"),
-                )
+def _first(row, keys):
+    for key in keys:
+        value = row.get(key)
+        if value:
+            return value if isinstance(value, str) else str(value)
+    return None
+
+
+def _record_from_row(row):
+    """Normalize one CSV row / columnar row dict using the shared header aliases."""
+    return _norm_record(
+        artist=_first(row, _ARTIST_KEYS),
+        title=_first(row, _TITLE_KEYS),
+        isrc=_first(row, _ISRC_KEYS),
+    )
+
+
+def _import_optional(module, package, fmt):
+    import importlib
+
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ValueError(f"{fmt} catalogs need the optional '{package}' package (pip install {package})") from exc
+
+
+def _open_csv_text(filepath, suffix):
+    """Open a (possibly compressed) CSV as text, decompressing on the fly."""
+    if suffix == ".csv.gz":
+        return gzip.open(filepath, "rt", encoding="utf-8-sig", newline="")
+    if suffix == ".csv.zst":
+        zstandard = _import_optional("zstandard", "zstandard", ".csv.zst")
+        raw = open(filepath, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8-sig", newline="")
+    return open(filepath, "r", encoding="utf-8-sig", newline="")
+
+
+def _projected_columns(names):
+    """The alias columns present in a columnar schema, in alias priority order."""
+    present = set(names)
+    return [key for key in (*_ARTIST_KEYS, *_TITLE_KEYS, *_ISRC_KEYS) if key in present]
+
+
+def _iter_batches_records(batches):
+    for batch in batches:
+        columns = batch.to_pydict()
+        artists = [columns[k] for k in _ARTIST_KEYS if k in columns]
+        titles = [columns[k] for k in _TITLE_KEYS if k in columns]
+        isrcs = [columns[k] for k in _ISRC_KEYS if k in columns]
+        for i in range(batch.num_rows):
+            record = _norm_record(
+                artist=_first_value(artists, i),
+                title=_first_value(titles, i),
+                isrc=_first_value(isrcs, i),
             )
-    return [r for r in rows if r["artist"] or r["title"] or r["isrc"]]
-
-
-def _parse_xml(filepath):
-    tree = ET.parse(filepath)
-    root = tree.getroot()
-    rows = []
-
-    # Flexible parsing for basic XML shapes:
-    # <catalog><track><artist>..</artist><title>..</title><isrc>..</isrc></track></catalog>
-    # or similar tags.
-    for track in root.findall(".//track"):
-        artist = track.findtext("artist") or track.findtext("artist_name")
-        title = track.findtext("title") or track.findtext("song") or track.findtext("song_title")
-        isrc = track.findtext("isrc")
-        rows.append(_norm_record(artist=artist, title=title, isrc=isrc))
-
-    if rows:
-        return [r for r in rows if r["artist"] or r["title"] or r["isrc"]]
-
-    # fallback: parse all nodes named item/record/entry
-    for node in root.findall(".//item") + root.findall(".//record") + root.findall(".//entry"):
-        artist = node.findtext("artist") or node.findtext("artist_name")
-        title = node.findtext("title") or node.findtext("song") or node.findtext("song_title")
-        isrc = node.findtext("isrc")
-        rows.append(_norm_record(artist=artist, title=title, isrc=isrc))
-    return [r for r in rows if r["artist"] or r["title"] or r["isrc"]]
+            if record["artist"] or record["title"] or record["isrc"]:
+                yield record
+
+
+def _first_value(column_lists, i):
+    for values in column_lists:
+        value = values[i]
+        if value:
+            return value if isinstance(value, str) else str(value)
+    return None
+
+
+def _iter_parquet(filepath):
+    """Stream a Parquet catalog in record batches, reading only the alias columns."""
+    pq = _import_optional("pyarrow.parquet", "pyarrow", "Parquet")
+    pf = pq.ParquetFile(filepath)
+    columns = _projected_columns(pf.schema_arrow.names)
+    if not columns:
+        return
+    yield from _iter_batches_records(pf.iter_batches(batch_size=_BATCH_ROWS, columns=columns))
+
+
+def _iter_arrow(filepath):
+    """Stream an Arrow IPC file (or stream-format file) batch by batch from a memory map."""
+    pa = _import_optional("pyarrow", "pyarrow", "Arrow")
+    with pa.memory_map(filepath, "r") as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            reader = pa.ipc.open_stream(source)
+            batches = iter(reader)
+        columns = _projected_columns(reader.schema.names)
+        if not columns:
+            return
+        yield from _iter_batches_records(batch.select(columns) for batch in batches)
+
+
+# Element shapes recognised as one catalog song. <track> wins wherever it
+# appears; the others are read only from files with no <track> at all.
+_XML_TRACK_TAG = "track"
+_XML_FALLBACK_TAGS = {"item", "record", "entry"}
+
+
+def _local_name(tag):
+    """Strip an XML namespace: '{urn:ddex}track' -> 'track'."""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+class _TrackFound(Exception):
+    pass
+
+
+def _xml_has_track(filepath):
+    """True if any <track> element appears in the file (expat scan, no tree built)."""
+    def start(name, _attrs):
+        if _local_name(name) == _XML_TRACK_TAG:
+            raise _TrackFound
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.StartElementHandler = start
+    with open(filepath, "rb") as f:
+        try:
+            parser.ParseFile(f)
+        except _TrackFound:
+            return True
+    return False
+
+
+def _iter_xml(filepath):
+    """
+    Stream records from a catalog XML file with iterparse.
+
+    Supports <track>, <item>, <record> and <entry> elements holding
+    <artist>/<artist_name>, <title>/<song>/<song_title> and <isrc>
+    children (namespaces ignored). If the file contains any <track>, only
+    <track> elements are read; otherwise the fallback shapes are. When a
+    fallback element closes before any <track> has been seen, one extra
+    tree-less scan of the file settles the shape. Each element is detached
+    from the tree as soon as it is handled, so only the current path is
+    held in memory.
+    """
+    stack = []
+    record_depth = 0  # open recognised elements on the current path
+    shape = None
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        tag = _local_name(elem.tag)
+        is_record_tag = tag == _XML_TRACK_TAG or tag in _XML_FALLBACK_TAGS
+        if event == "start":
+            stack.append(elem)
+            if is_record_tag:
+                record_depth += 1
+            continue
+
+        stack.pop()
+        if is_record_tag:
+            record_depth -= 1
+            if shape is None:
+                if tag == _XML_TRACK_TAG or _xml_has_track(filepath):
+                    shape = _XML_TRACK_TAG
+                else:
+                    shape = "fallback"
+            if (tag == _XML_TRACK_TAG) == (shape == _XML_TRACK_TAG):
+                fields = {}
+                for child in elem:
+                    fields.setdefault(_local_name(child.tag), child.text)
+                record = _norm_record(
+                    artist=fields.get("artist") or fields.get("artist_name"),
+                    title=fields.get("title") or fields.get("song") or fields.get("song_title"),
+                    isrc=fields.get("isrc"),
+                )
+                if record["artist"] or record["title"] or record["isrc"]:
+                    yield record
+
+        # Children of an open record are still needed; everything else can go.
+        if record_depth == 0 and stack:
+            elem.clear()
+            stack[-1].remove(elem)
@@ -0,0 +1,164 @@
+"""
+ISRC normalisation and a compact dedup index for catalog preprocessing.
+
+Catalog exports spell the same ISRC many ways ("usrc11902726",
+"US-RC1-19-02726", "USRC11902726 "), and rows without an ISRC repeat the
+same artist/title with different casing and punctuation. CatalogDedupIndex
+reduces each song to one 64-bit key — the ISRC packed into an integer,
+or a hash of the normalised (artist, title) — and stores the keys in an
+open-addressing table backed by array('Q') — a few dozen bytes per song
+rather than a Python str object plus set entry per key.
+
+Usage:
+    from scripts.catalog_index import CatalogDedupIndex, normalize_isrc
+
+    normalize_isrc("US-RC1-19-02726")  # -> "USRC11902726"
+    index = CatalogDedupIndex()
+    index.add(record)                  # -> True first time, False for a duplicate
+    index.stats()
+"""
+
+import hashlib
+import re
+import unicodedata
+from array import array
+
+# CC (country) + XXX (registrant, alphanumeric) + YY (year) + NNNNN (designation).
+_ISRC_RE = re.compile(r"^[A-Z]{2}[A-Z0-9]{3}[0-9]{7}$")
+_ISRC_STRIP_RE = re.compile(r"[\s\-_.]+")
+_ISRC_PREFIX_RE = re.compile(r"^ISRC:?", re.IGNORECASE)
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+_TEXT_KEY_FLAG = 1 << 63  # packed ISRCs are < 2**50, so text keys never collide with them
+
+
+def normalize_isrc(value):
+    """Canonical 12-character ISRC, or None if `value` is empty or not a valid ISRC."""
+    if not value:
+        return None
+    text = str(value).strip().upper()
+    if len(text) != 12:
+        text = _ISRC_STRIP_RE.sub("", _ISRC_PREFIX_RE.sub("", text))
+    return text if _ISRC_RE.match(text) else None
+
+
+def isrc_key(isrc):
+    """Pack a normalised ISRC into an int: base-36 country+registrant, then the 7 digits."""
+    return int(isrc[:5], 36) * 10_000_000 + int(isrc[5:])
+
+
+def normalize_text(value):
+    """Casefold, strip accents and punctuation, collapse whitespace."""
+    text = value or ""
+    if not text.isascii():
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD_RE.sub(" ", text.casefold()).split())
+
+
+def song_key(artist, title):
+    """64-bit key for a normalised (artist, title) pair."""
+    raw = f"{normalize_text(artist)}\x1f{normalize_text(title)}".encode("utf-8")
+    return _TEXT_KEY_FLAG | int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little") >> 2
+
+
+class _IntSet:
+    """Open-addressing set of non-negative ints below 2**64, stored in one array('Q')."""
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._len = 0
+        self._limit = size // 2  # keep the load factor at or below 0.5
+
+    def __len__(self):
+        return self._len
+
+    def add(self, key):
+        """Insert `key`; returns False if it was already present."""
+        stored = key + 1  # 0 marks an empty slot
+        slots, mask = self._slots, self._mask
+        i = (stored * 0x9E3779B97F4A7C15 >> 20) & mask
+        while True:
+            current = slots[i]
+            if current == 0:
+                break
+            if current == stored:
+                return False
+            i = (i + 1) & mask
+        slots[i] = stored
+        self._len += 1
+        if self._len > self._limit:
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        self._len = 0
+        self._limit = len(self._slots) // 2
+        for stored in old:
+            if stored:
+                self.add(stored - 1)
+
+    @property
+    def nbytes(self):
+        return self._slots.itemsize * len(self._slots)
+
+
+class CatalogDedupIndex:
+    """
+    Decides which catalog records are duplicates of ones already seen.
+
+    Records with a valid ISRC are deduplicated by ISRC. Records without one
+    (or with an invalid one) are deduplicated by normalised (artist, title)
+    against the other ISRC-less records only. The kept rows therefore do not
+    depend on row order: one ISRC-less row could match several recordings
+    with different ISRCs, so the two kinds are never compared.
+    """
+
+    def __init__(self, capacity=1024):
+        self._keys = _IntSet(capacity)
+        self.rows = 0
+        self.unique = 0
+        self.duplicate_isrc = 0
+        self.duplicate_title = 0
+        self.invalid_isrc = 0
+
+    def add(self, record):
+        """
+        Normalise `record["isrc"]` in place and register the record.
+
+        Returns True if the record is new, False if it duplicates an earlier one.
+        Invalid ISRCs are dropped (set to None) and the title key is used instead.
+        """
+        self.rows += 1
+        raw_isrc = record.get("isrc")
+        isrc = normalize_isrc(raw_isrc)
+        if raw_isrc and isrc is None:
+            self.invalid_isrc += 1
+        record["isrc"] = isrc
+
+        if isrc:
+            if not self._keys.add(isrc_key(isrc)):
+                self.duplicate_isrc += 1
+                return False
+        elif not self._keys.add(song_key(record.get("artist"), record.get("title"))):
+            self.duplicate_title += 1
+            return False
+        self.unique += 1
+        return True
+
+    def stats(self):
+        return {
+            "rows": self.rows,
+            "unique": self.unique,
+            "duplicate_isrc": self.duplicate_isrc,
+            "duplicate_title": self.duplicate_title,
+            "invalid_isrc": self.invalid_isrc,
+            "index_bytes": self._keys.nbytes,
+        }
@@ -0,0 +1,159 @@
+"""
+Small concurrency helpers shared by the pipeline workflows.
+
+    map_ordered(fn, items, max_workers)  # workflow-level pool (one per run), input order kept
+    fan_out(fn_a, fn_b, ...)             # run independent leaf calls at once, get futures back
+    SingleFlight().do(key, fn)           # concurrent callers with the same key share one call
+    await AsyncSingleFlight().do(key, coro_fn)  # same, for coroutines on one event loop
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from scripts.config import cfg
+
+_fanout_lock = threading.Lock()
+_fanout_executor = None
+_fanout_local = threading.local()
+
+
+def map_ordered(fn, items, max_workers=1):
+    """
+    Apply `fn` to every item on a bounded thread pool.
+
+    Results come back in input order, and the first exception raised by
+    `fn` propagates to the caller, exactly like a serial list comprehension.
+    max_workers <= 1 runs serially on the calling thread. Each item runs
+    in a copy of the caller's context, as with fan_out().
+
+    Meant for workflow-level parallelism (one call per workflow run, over
+    tracks or catalog songs), so the pool is created per call. Those items
+    are long-running and use fan_out() themselves; running them on the
+    shared fan-out pool would make their leaf calls run inline and could
+    occupy every fan-out worker. Per-request leaf calls belong in fan_out().
+    """
+    items = list(items)
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def _mark_fanout_worker():
+    _fanout_local.active = True
+
+
+def _get_fanout_executor():
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=cfg.FANOUT_WORKERS,
+                    thread_name_prefix="fanout",
+                    initializer=_mark_fanout_worker,
+                )
+    return _fanout_executor
+
+
+def fan_out(*fns):
+    """
+    Run independent zero-arg calls concurrently and wait for all of them.
+
+    Returns completed Futures in argument order; call .result() on each to
+    get the value or re-raise its exception. Intended for leaf I/O calls
+    (single upstream requests). When invoked from inside a fan-out worker
+    the calls run inline, so nested use can never deadlock the shared pool.
+    Each call runs in a copy of the caller's context (e.g. its trace span).
+    """
+    if len(fns) <= 1 or getattr(_fanout_local, "active", False):
+        futures = []
+        for fn in fns:
+            future = Future()
+            try:
+                future.set_result(fn())
+            except Exception as exc:
+                future.set_exception(exc)
+            futures.append(future)
+        return futures
+    executor = _get_fanout_executor()
+    futures = [executor.submit(contextvars.copy_context().run, fn) for fn in fns]
+    wait(futures)
+    return futures
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight block and receive the same result (or exception). Nothing is
+    cached once the call completes — pair this with a regular cache.
+
+    A fan-out worker never blocks on a flight: the leader may be waiting
+    on fan_out() calls queued behind that worker, so with a small pool the
+    two would wait on each other forever. A worker that finds the key in
+    flight runs `fn` itself instead (a duplicate call, not counted in
+    `shared`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self.shared = 0  # calls answered by another caller's in-flight request
+
+    def do(self, key, fn):
+        on_fanout_worker = getattr(_fanout_local, "active", False)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+            elif on_fanout_worker and not call.done():
+                call = None
+            else:
+                self.shared += 1
+
+        if call is None:
+            return fn()
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight.
+
+    `coro_fn` is a zero-arg coroutine function. The shared task is shielded,
+    so a cancelled waiter does not cancel the lookup for everyone else.
+    """
+
+    def __init__(self):
+        self._calls: dict = {}
+        self.shared = 0
+
+    async def do(self, key, coro_fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _t: self._calls.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
@@ -11,16 +11,21 @@ Usage:
     cfg.cm_token()    # -> valid Chartmetric bearer token (auto-refreshes)
     cfg.lum_token()   # -> valid Luminate bearer token (auto-refreshes)
     cfg.SC_CLIENT_ID  # -> SoundCloud public client_id
+    cfg.http          # -> shared keep-alive HttpTransport
+    cfg.ahttp         # -> shared AsyncHttpTransport (httpx) for the async clients
 """
 
 import logging
 import os
 import re
+import threading
 import time
 
 import requests
 from dotenv import load_dotenv
 
+from scripts.transport import AsyncHttpTransport, HttpTransport
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,12 +60,14 @@ class _Config:
 
     All API credentials and base URLs live here so that platform
     modules import one object and never touch os.environ directly.
+    The base URLs can be overridden from the environment, e.g. to point
+    every client at the local fake services (python -m scripts.fakes).
     """
 
     # ── SoundCloud (unofficial v2 API) ─────────────────────────────
 
     SC_CLIENT_ID = os.getenv("SOUNDCLOUD_CLIENT_ID", "b73paRnaV82c1ypnjCCsgrFwg47vYs8a")
-    SC_BASE = "https://soundcloud-proxy.adam-guerin12.workers.dev"
+    SC_BASE = os.getenv("SC_BASE", "https://soundcloud-proxy.adam-guerin12.workers.dev")
 
     # SoundCloud's api-v2 rejects requests without browser-like headers.
     SC_HEADERS = {
@@ -74,18 +81,54 @@ class _Config:
 
     # ── Chartmetric ────────────────────────────────────────────────
 
-    CM_BASE = "https://api.chartmetric.com/api"
+    CM_BASE = os.getenv("CM_BASE", "https://api.chartmetric.com/api")
     CM_REFRESH_TOKEN = os.getenv("CHARTMETRIC_REFRESH_TOKEN")
-    CM_ENABLED = False  # Temporarily disabled — re-enable by setting to bool(os.getenv("CHARTMETRIC_REFRESH_TOKEN"))
-    CM_RATE_LIMIT_DELAY = 0.3  # seconds between requests (4 req/sec limit)
+    CM_ENABLED = os.getenv("CM_ENABLED") == "1"  # Temporarily off by default — re-enable with CM_ENABLED=1
+    CM_RATE_LIMIT_RPS = float(os.getenv("CM_RATE_LIMIT_RPS", "4"))  # Chartmetric contract: 4 requests/second
+    CM_RATE_LIMIT_BURST = int(os.getenv("CM_RATE_LIMIT_BURST", "4"))  # tokens an idle client may spend back-to-back
+
+    # Persistent response cache (SQLite). Set CM_CACHE_ENABLED=0 to bypass.
+    CM_CACHE_ENABLED = os.getenv("CM_CACHE_ENABLED", "1") != "0"
+    CM_CACHE_PATH = os.getenv(
+        "CM_CACHE_PATH",
+        os.path.join(os.path.dirname(__file__), "..", ".cache", "chartmetric.sqlite3"),
+    )
+    # (family, path regex, fresh TTL seconds, extra stale-while-revalidate seconds)
+    CM_CACHE_TTLS = (
+        ("album", r"^/album/\d+$", 7 * 86400, 7 * 86400),
+        ("track_isrc_ids", r"^/track/isrc/[^/]+/get-ids$", 7 * 86400, 7 * 86400),
+        ("artist_ids", r"^/artist/chartmetric/\d+/get-ids$", 7 * 86400, 7 * 86400),
+        ("track", r"^/track/\d+$", 86400, 86400),
+        ("artist_career", r"^/artist/\d+/career$", 6 * 3600, 6 * 3600),
+        ("artist", r"^/artist/\d+$", 6 * 3600, 6 * 3600),
+        ("search", r"^/search$", 15 * 60, 15 * 60),
+    )
+
+    # In-process enrichment caches (enrich_artist / resolve_track_by_isrc).
+    CM_ARTIST_CACHE_SIZE = int(os.getenv("CM_ARTIST_CACHE_SIZE", "5000"))
+    CM_ISRC_CACHE_SIZE = int(os.getenv("CM_ISRC_CACHE_SIZE", "20000"))
+    CM_ARTIST_CACHE_BYTES = int(os.getenv("CM_ARTIST_CACHE_BYTES", str(64 << 20)))
+    CM_ISRC_CACHE_BYTES = int(os.getenv("CM_ISRC_CACHE_BYTES", str(64 << 20)))
+    CM_ARTIST_CACHE_TTL = 6 * 3600    # matches the "artist" response-cache family
+    CM_ISRC_CACHE_TTL = 86400         # matches the "track" response-cache family
+    CM_NEGATIVE_CACHE_TTL = int(os.getenv("CM_NEGATIVE_CACHE_TTL", "300"))  # not-found / failed lookups
+    # In-process memo of parsed /search results (normalised query); 0 disables.
+    CM_SEARCH_MEMO_SIZE = int(os.getenv("CM_SEARCH_MEMO_SIZE", "2000"))
+    CM_SEARCH_MEMO_TTL = 15 * 60      # matches the "search" response-cache family
 
     # ── Luminate ───────────────────────────────────────────────────
 
-    LUM_BASE = "https://api.luminatedata.com"
+    LUM_BASE = os.getenv("LUM_BASE", "https://api.luminatedata.com")
     LUM_API_KEY = os.getenv("LUMINATE_API_KEY")
     LUM_EMAIL = os.getenv("LUMINATE_EMAIL")
     LUM_PASSWORD = os.getenv("LUMINATE_PASSWORD")
 
+    # ── MusicBrainz ────────────────────────────────────────────────
+
+    # "host:port" of a plain-HTTP MusicBrainz server; unset = musicbrainz.org.
+    MB_HOST = os.getenv("MB_HOST")
+    MB_RATE_DELAY = float(os.getenv("MB_RATE_DELAY", "1.1"))  # seconds between lookups (1 req/s anonymous)
+
     # ── Revenue model constants ────────────────────────────────────
 
     STREAM_RATES = {
@@ -102,10 +145,41 @@ class _Config:
 
     VIABILITY_THRESHOLD = 50_000  # USD — minimum mid-tier revenue to recommend clearance
 
+    # Distinct titles parse_remix_title memoises (scripts/models.py).
+    TITLE_PARSE_CACHE_SIZE = int(os.getenv("TITLE_PARSE_CACHE_SIZE", "8192"))
+
+    # ── HTTP connection pooling ────────────────────────────────────
+
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # keep-alive sockets per host
+
+    # Shared pool for concurrent leaf requests (e.g. enrich_artist sub-calls).
+    FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", "16"))
+
+    # Songs the /api/search/catalog stream processes at once (per request).
+    CATALOG_SONG_CONCURRENCY = int(os.getenv("CATALOG_SONG_CONCURRENCY", "4"))
+    CATALOG_MAX_SONG_CONCURRENCY = 16
+
+    # Background catalog jobs (server/jobs.py): SQLite checkpoint store + worker pool.
+    JOBS_DB_PATH = os.getenv(
+        "JOBS_DB_PATH",
+        os.path.join(os.path.dirname(__file__), "..", ".cache", "jobs.sqlite3"),
+    )
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
     # ── Internal token cache ───────────────────────────────────────
 
     def __init__(self):
         self._tokens = {}
+        self._token_lock = threading.Lock()  # one refresh at a time across worker threads
+        self.http = HttpTransport(
+            pool_connections=self.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.HTTP_POOL_MAXSIZE,
+        )
+        self.ahttp = AsyncHttpTransport(
+            pool_connections=self.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.HTTP_POOL_MAXSIZE,
+        )
         if not os.getenv("SOUNDCLOUD_CLIENT_ID"):
             fetched = _fetch_sc_client_id()
             if fetched:
@@ -124,14 +198,18 @@ class _Config:
         if cached and (time.time() - cached["ts"]) < 3000:
             return cached["token"]
 
-        resp = requests.post(
-            f"{self.CM_BASE}/token",
-            json={"refreshtoken": self.CM_REFRESH_TOKEN},
-        )
-        resp.raise_for_status()
-        token = resp.json()["token"]
-        self._tokens["cm"] = {"token": token, "ts": time.time()}
-        return token
+        with self._token_lock:
+            cached = self._tokens.get("cm")
+            if cached and (time.time() - cached["ts"]) < 3000:
+                return cached["token"]
+            resp = self.http.post(
+                f"{self.CM_BASE}/token",
+                json={"refreshtoken": self.CM_REFRESH_TOKEN},
+            )
+            resp.raise_for_status()
+            token = resp.json()["token"]
+            self._tokens["cm"] = {"token": token, "ts": time.time()}
+            return token
 
     # ── Luminate auth ──────────────────────────────────────────────
 
@@ -145,20 +223,24 @@ class _Config:
         if cached and (time.time() - cached["ts"]) < 80000:
             return cached["token"]
 
-        resp = requests.post(
-            f"{self.LUM_BASE}/auth",
-            headers={
-                "x-api-key": self.LUM_API_KEY,
-                "content-type": "application/x-www-form-urlencoded",
-                "accept": "application/json",
-            },
-            data=f"username={self.LUM_EMAIL}&password={self.LUM_PASSWORD}",
-        )
-        resp.raise_for_status()
-        body = resp.json()
-        token = body.get("access_token") or body.get("token")
-        self._tokens["lum"] = {"token": token, "ts": time.time()}
-        return token
+        with self._token_lock:
+            cached = self._tokens.get("lum")
+            if cached and (time.time() - cached["ts"]) < 80000:
+                return cached["token"]
+            resp = self.http.post(
+                f"{self.LUM_BASE}/auth",
+                headers={
+                    "x-api-key": self.LUM_API_KEY,
+                    "content-type": "application/x-www-form-urlencoded",
+                    "accept": "application/json",
+                },
+                data=f"username={self.LUM_EMAIL}&password={self.LUM_PASSWORD}",
+            )
+            resp.raise_for_status()
+            body = resp.json()
+            token = body.get("access_token") or body.get("token")
+            self._tokens["lum"] = {"token": token, "ts": time.time()}
+            return token
 
     # ── Credential validation ──────────────────────────────────────
 
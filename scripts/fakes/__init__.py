@@ -0,0 +1,23 @@
+"""
+Hermetic local stand-ins for SoundCloud, Chartmetric, Luminate and MusicBrainz.
+
+FakeServices serves a Fixtures set over HTTP with configurable latency,
+injected 429/401/500 responses and Chartmetric-style rate limiting, so
+the real platform clients, pipelines and test_pipeline.py can run (and be
+timed) offline. Clients switch to it through the base URLs in
+scripts.config — set the variables from FakeServices.env() before
+scripts.config is imported.
+
+Usage:
+    python -m scripts.fakes --songs 1000 --latency cm=lognormal:80:0.5 --fault cm:429=0.01
+    # prints the SC_BASE / CM_BASE / LUM_BASE / MB_HOST exports to use
+
+    from scripts.fakes import FakeServices, Fixtures
+
+    with FakeServices(Fixtures.synthetic(songs=100), latency="const:20") as fakes:
+        subprocess.run([...], env={**os.environ, **fakes.env()})
+        fakes.stats()
+"""
+
+from .fixtures import Fixtures, synthetic_world
+from .server import FakeServices, Latency, parse_fault_specs, parse_latency_specs
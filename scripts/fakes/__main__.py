@@ -0,0 +1,79 @@
+"""
+Run the fake upstream services in the foreground.
+
+    python -m scripts.fakes                          # bundled fixtures on :8765
+    python -m scripts.fakes --songs 10000 --remixes 5 --seed 1
+    python -m scripts.fakes --latency lognormal:60:0.5 --latency cm=uniform:80:250 \\
+                            --fault cm:429=0.02 --fault sc:500=0.01 --cm-rps 4 --cm-burst 4
+    python -m scripts.fakes --songs 1000 --dump /tmp/world.json   # write fixtures and exit
+"""
+
+import argparse
+import logging
+import sys
+
+from scripts.fakes.fixtures import Fixtures
+from scripts.fakes.server import FakeServices, parse_fault_specs, parse_latency_specs
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts.fakes", description="Fake upstream services for Remix Radar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="fixture JSON file (default: the bundled set)")
+    source.add_argument("--songs", type=int, help="generate a synthetic world with this many songs")
+    parser.add_argument("--remixes", type=int, default=5, help="SoundCloud remixes per synthetic song")
+    parser.add_argument("--seed", type=int, default=0, help="seed for synthetic data, latency and faults")
+    parser.add_argument("--latency", action="append", default=[], metavar="[SERVICE=]SPEC",
+                        help="const:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--fault", action="append", default=[], metavar="SERVICE:STATUS=RATE",
+                        help="inject 401/429/500 responses, e.g. cm:429=0.02")
+    parser.add_argument("--cm-rps", type=float, default=4.0, help="Chartmetric requests/second per token (0 = unlimited)")
+    parser.add_argument("--cm-burst", type=int, default=4)
+    parser.add_argument("--dump", metavar="PATH", help="write the fixtures to PATH and exit")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    elif args.songs:
+        fixtures = Fixtures.synthetic(args.songs, args.remixes, args.seed)
+    else:
+        fixtures = Fixtures.default()
+    if args.dump:
+        fixtures.dump(args.dump)
+        print(f"wrote {args.dump}")
+        return 0
+
+    try:
+        services = FakeServices(
+            fixtures,
+            host=args.host,
+            port=args.port,
+            latency=parse_latency_specs(args.latency),
+            faults=parse_fault_specs(args.fault),
+            cm_rate_limit=(args.cm_rps, args.cm_burst) if args.cm_rps > 0 else None,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    services.start()
+    print(f"# Fake services on {services.url} — point the clients at them with:")
+    for key, value in services.env().items():
+        print(f"export {key}={value}", flush=True)
+    try:
+        services.wait()
+    except KeyboardInterrupt:
+        services.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+"""
+Fixture data for the fake upstream services.
+
+A fixture set is one JSON document with a section per service, holding
+upstream objects in the shapes the real APIs return them:
+
+    {
+      "soundcloud":  {"tracks": [track, ...]},
+      "chartmetric": {"artists": [{"id", "name", "search", "meta", "career", "ids",
+                                   "where_people_listen", "stats"}, ...],
+                      "tracks":  [full track, ...],
+                      "albums":  [album, ...]},
+      "luminate":    {"songs": [{"isrc", "title", "display_artist_name", "metrics"}, ...]},
+      "musicbrainz": {"recordings": [{"id", "title", "artist", "releases", "works"}, ...],
+                      "works":      [{"id", "title", "writers", "publishers"}, ...]},
+      "catalog":     [{"artist", "title", "isrc"}, ...]
+    }
+
+fixtures/default.json is a small hand-curated world (three songs and
+their SoundCloud remixes) in the recorded response shapes.
+Fixtures.synthetic() generates a seeded world of any size in the same
+shapes, for throughput runs.
+
+Usage:
+    from scripts.fakes.fixtures import Fixtures
+
+    fixtures = Fixtures.default()
+    fixtures = Fixtures.synthetic(songs=1_000, remixes_per_song=5, seed=7)
+    fixtures.dump("/tmp/world.json")
+    fixtures.catalog_rows()  # -> [{"artist", "title", "isrc"}, ...] for process_catalog
+"""
+
+import json
+import os
+import random
+import re
+import uuid
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "default.json")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(str(text or "").casefold())
+
+
+class _TokenIndex:
+    """Inverted index: every token of a document's text -> document keys."""
+
+    def __init__(self):
+        self._postings = {}
+        self._order = {}
+
+    def add(self, key, text):
+        self._order.setdefault(key, len(self._order))
+        for token in set(_tokens(text)):
+            self._postings.setdefault(token, set()).add(key)
+
+    def search(self, text):
+        """Keys whose text contains every token of `text`, in insertion order."""
+        tokens = set(_tokens(text))
+        if not tokens:
+            return []
+        postings = sorted((self._postings.get(token, set()) for token in tokens), key=len)
+        smallest, rest = postings[0], postings[1:]
+        hits = [key for key in smallest if all(key in other for other in rest)]
+        hits.sort(key=self._order.__getitem__)
+        return hits
+
+
+class Fixtures:
+    """Indexed fixture set the fake services answer from."""
+
+    def __init__(self, data):
+        self.data = data
+
+        soundcloud = data.get("soundcloud") or {}
+        self.sc_tracks = {}
+        self.sc_permalinks = {}
+        self._sc_index = _TokenIndex()
+        for track in soundcloud.get("tracks", []):
+            self.sc_tracks[track["id"]] = track
+            if track.get("permalink_url"):
+                self.sc_permalinks[track["permalink_url"].rstrip("/")] = track["id"]
+            user = track.get("user") or {}
+            text = " ".join([
+                track.get("title") or "",
+                user.get("username") or "",
+                track.get("description") or "",
+                track.get("tag_list") or "",
+            ])
+            self._sc_index.add(track["id"], text)
+
+        chartmetric = data.get("chartmetric") or {}
+        self.cm_artists = {}
+        self._cm_artist_index = _TokenIndex()
+        for artist in chartmetric.get("artists", []):
+            self.cm_artists[artist["id"]] = artist
+            self._cm_artist_index.add(artist["id"], artist["name"])
+        self.cm_tracks = {}
+        self.cm_isrcs = {}
+        self._cm_track_index = _TokenIndex()
+        for track in chartmetric.get("tracks", []):
+            self.cm_tracks[track["id"]] = track
+            if track.get("isrc"):
+                self.cm_isrcs.setdefault(track["isrc"].upper(), []).append(track["id"])
+            self._cm_track_index.add(track["id"], " ".join([track.get("name") or "", *track.get("artist_names", [])]))
+        self.cm_albums = {album["id"]: album for album in chartmetric.get("albums", [])}
+
+        luminate = data.get("luminate") or {}
+        self.lum_songs = {}
+        self._lum_index = _TokenIndex()
+        for song in luminate.get("songs", []):
+            isrc = song["isrc"].upper()
+            self.lum_songs[isrc] = song
+            self._lum_index.add(isrc, f"{song.get('title') or ''} {song.get('display_artist_name') or ''}")
+
+        musicbrainz = data.get("musicbrainz") or {}
+        self.mb_recordings = {}
+        self._mb_index = _TokenIndex()
+        for recording in musicbrainz.get("recordings", []):
+            self.mb_recordings[recording["id"]] = recording
+            self._mb_index.add(recording["id"], f"{recording['title']} {recording.get('artist') or ''}")
+        self.mb_works = {work["id"]: work for work in musicbrainz.get("works", [])}
+
+    # ── Loading ────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    @classmethod
+    def default(cls):
+        """The hand-curated fixture set shipped with the package (fixtures/default.json)."""
+        return cls.load(DEFAULT_PATH)
+
+    @classmethod
+    def synthetic(cls, songs=100, remixes_per_song=5, seed=0, songs_per_artist=3):
+        """Seeded world of `songs` original songs with their remixes (see synthetic_world)."""
+        return cls(synthetic_world(songs, remixes_per_song, seed, songs_per_artist))
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, indent=1, ensure_ascii=False)
+
+    def catalog_rows(self):
+        """Original songs as catalog records ({"artist", "title", "isrc"})."""
+        return [dict(row) for row in self.data.get("catalog", [])]
+
+    def sc_urls(self):
+        """Permalink URLs of every SoundCloud track, in fixture order."""
+        return list(self.sc_permalinks)
+
+    # ── Queries ────────────────────────────────────────────────────
+
+    def search_sc_tracks(self, query, limit=50, genre=None, created_after=None):
+        tracks = (self.sc_tracks[key] for key in self._sc_index.search(query))
+        results = []
+        for track in tracks:
+            if genre and (track.get("genre") or "").casefold() != genre.casefold():
+                continue
+            if created_after and (track.get("created_at") or "") < created_after:
+                continue
+            results.append(track)
+            if len(results) >= limit:
+                break
+        return results
+
+    def search_cm_artists(self, query, limit=5):
+        """Artists whose name contains every query token; exact name first, then by cm_artist_score."""
+        wanted = " ".join(_tokens(query))
+        artists = [self.cm_artists[key] for key in self._cm_artist_index.search(query)]
+        artists.sort(key=lambda a: (" ".join(_tokens(a["name"])) != wanted, -(a.get("search", {}).get("cm_artist_score") or 0)))
+        return [{"id": a["id"], "name": a["name"], **a.get("search", {})} for a in artists[:limit]]
+
+    def search_cm_tracks(self, query, limit=5):
+        hits = []
+        for key in self._cm_track_index.search(query)[:limit]:
+            track = self.cm_tracks[key]
+            hits.append({
+                "id": track["id"],
+                "name": track.get("name"),
+                "isrc": track.get("isrc"),
+                "artist_names": list(track.get("artist_names", [])),
+            })
+        return hits
+
+    def search_lum(self, query, entity_type="song", size=10):
+        songs = [self.lum_songs[key] for key in self._lum_index.search(query)]
+        if entity_type == "artist":
+            names = list(dict.fromkeys(song.get("display_artist_name") for song in songs))
+            return [{"entity_type": "artist", "name": name} for name in names[:size]]
+        return [
+            {"entity_type": entity_type, "id": song["isrc"], "title": song.get("title"),
+             "display_artist_name": song.get("display_artist_name")}
+            for song in songs[:size]
+        ]
+
+    def search_mb_recordings(self, recording, artist=None, limit=25):
+        """(recording, score) pairs: 100 when title and artist match, 50 on title alone."""
+        strong = self._mb_index.search(f"{recording} {artist or ''}")
+        matched = set(strong)
+        weak = [key for key in self._mb_index.search(recording) if key not in matched]
+        scored = [(self.mb_recordings[key], 100) for key in strong]
+        scored += [(self.mb_recordings[key], 50) for key in weak]
+        return scored[:limit]
+
+
+# ── Synthetic worlds ──────────────────────────────────────────────
+
+_SYLLABLES = (
+    "ka", "lo", "mi", "ra", "ve", "no", "sa", "ti", "lu", "ze", "mo", "ri", "da", "fe", "ni",
+    "po", "sha", "ko", "le", "va", "ru", "bel", "xan", "tor", "mel", "quin", "dar", "sol", "fen", "lyr",
+)
+_TITLE_WORDS = (
+    ("Blinding", "Midnight", "Golden", "Electric", "Silent", "Broken", "Endless", "Neon", "Velvet",
+     "Crystal", "Wild", "Hollow", "Burning", "Frozen", "Secret", "Distant", "Restless", "Paper",
+     "Silver", "Lonely", "Fading", "Bright", "Hidden", "Sweet"),
+    ("Lights", "Hearts", "City", "Dreams", "Summer", "Rain", "Fire", "Ocean", "Shadows", "Roads",
+     "Skies", "Echoes", "Waves", "Stars", "Nights", "Memories", "Signals", "Gardens", "Mirrors",
+     "Horizons", "Colours", "Rivers", "Voices", "Lines"),
+)
+_REMIX_TEMPLATES = (
+    "{artist} - {song} ({remixer} Remix)",
+    "{artist} - {song} ({remixer} Remix)",
+    "{song} ({remixer} Remix)",
+    "{artist} - {song} [{remixer} Bootleg]",
+    "{artist} - {song} ({remixer} Edit)",
+    "{artist} - {song} ({remixer} Flip)",
+)
+_GENRES = ("Deep House", "House", "Tech House", "Drum & Bass", "Dance & EDM", "Electronic", "Hip-hop & Rap")
+_LABELS = ("Republic Records", "Atlantic", "Columbia", "Island", "Interscope", "Parlophone", "XL Recordings", "Warp")
+_PUBLISHERS = ("Sony Music Publishing", "Universal Music Publishing", "Warner Chappell", "Kobalt", "BMG Rights")
+_CITIES = (
+    ("London", "GB"), ("Berlin", "DE"), ("Paris", "FR"), ("Lagos", "NG"), ("Seoul", "KR"), ("Austin", "US"),
+    ("Toronto", "CA"), ("Madrid", "ES"), ("Tokyo", "JP"), ("Lima", "PE"), ("Oslo", "NO"), ("Sydney", "AU"),
+)
+_STAGES = ("undiscovered", "developing", "mid-level", "mainstream", "superstar", "legendary")
+_MOMENTA = ("decline", "gradual decline", "steady", "growth", "explosive growth")
+
+
+def _slug(text):
+    return "-".join(_tokens(text))
+
+
+def _b36(n, width):
+    digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = ""
+    for _ in range(width):
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+    return out
+
+
+def _isrc(n):
+    return f"QZ{_b36(n // 100_000, 3)}24{n % 100_000:05d}"
+
+
+def _date(rng, start_year=2015, end_year=2024):
+    return f"{rng.randint(start_year, end_year)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _count(rng, low, high):
+    return int(10 ** rng.uniform(low, high))
+
+
+class _Names:
+    """Unique made-up artist names ("Kalo Mira")."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.used = set()
+
+    def __call__(self):
+        while True:
+            words = ["".join(self.rng.choice(_SYLLABLES) for _ in range(2)).capitalize() for _ in range(2)]
+            name = " ".join(words)
+            if name.casefold() not in self.used:
+                self.used.add(name.casefold())
+                return name
+
+
+def _cm_artist(rng, cm_id, name, mainstream):
+    listeners = _count(rng, 5.5, 7.8) if mainstream else _count(rng, 2.5, 5.5)
+    followers = int(listeners * rng.uniform(0.05, 0.6))
+    city, code2 = rng.choice(_CITIES)
+    cities = rng.sample(_CITIES, rng.randint(2, 6))
+    return {
+        "id": cm_id,
+        "name": name,
+        "search": {
+            "sp_followers": followers,
+            "sp_monthly_listeners": listeners,
+            "spotify_followers_to_listeners_ratio": round(followers / listeners, 3),
+            "tiktok_followers": _count(rng, 2, 7),
+            "cm_artist_score": round(rng.uniform(20, 95) if mainstream else rng.uniform(1, 40), 2),
+        },
+        "meta": {
+            "name": name,
+            "record_label": rng.choice(_LABELS) if mainstream else None,
+            "genres": {"primary": {"name": rng.choice(_GENRES)}},
+            "cm_artist_rank": rng.randint(1, 500_000),
+            "hometown_city": city,
+            "code2": code2,
+        },
+        "career": [{
+            "stage": rng.choice(_STAGES[2:] if mainstream else _STAGES[:3]),
+            "stage_score": round(rng.uniform(0, 100), 1),
+            "momentum": rng.choice(_MOMENTA),
+            "momentum_score": round(rng.uniform(0, 100), 1),
+        }],
+        "ids": [{
+            "cm_artist": cm_id,
+            "artist_name": name,
+            "spotify_artist_id": uuid.UUID(int=rng.getrandbits(128)).hex[:22],
+            "itunes_artist_id": rng.randint(10**8, 10**9),
+            "deezer_artist_id": rng.randint(10**6, 10**8),
+        }],
+        "where_people_listen": {
+            "cities": {
+                name: [{"listeners": _count(rng, 3, 6), "code2": code, "city_affinity": round(rng.uniform(0.3, 3), 2)}]
+                for name, code in cities
+            },
+            "countries": {},
+        },
+        "stats": {},
+    }
+
+
+def synthetic_world(songs=100, remixes_per_song=5, seed=0, songs_per_artist=3):
+    """
+    Seeded fixture data: `songs` original songs, each with Chartmetric,
+    Luminate and (mostly) MusicBrainz records and `remixes_per_song`
+    SoundCloud remixes, plus the occasional radio-edit decoy on Chartmetric
+    and unrelated remix on SoundCloud. Songs are spread over
+    songs / songs_per_artist original artists. Same arguments, same world.
+    """
+    rng = random.Random(seed)
+    names = _Names(rng)
+    ids = {"artist": 1000, "track": 50_000, "album": 900_000, "sc": 10_000_000, "user": 500_000}
+
+    def next_id(kind):
+        ids[kind] += 1
+        return ids[kind]
+
+    cm_artists, cm_tracks, albums = [], [], []
+    lum_songs, recordings, works, catalog, sc_tracks = [], [], [], [], []
+    users = {}
+
+    originals = [names() for _ in range(max(1, songs // songs_per_artist))]
+    for name in originals:
+        cm_artists.append(_cm_artist(rng, next_id("artist"), name, mainstream=True))
+    remixers = [names() for _ in range(max(4, songs * remixes_per_song // 4))]
+    for name in remixers:
+        if rng.random() < 0.7:  # the rest are unknown to Chartmetric
+            cm_artists.append(_cm_artist(rng, next_id("artist"), name, mainstream=False))
+
+    def sc_user(name):
+        if name not in users:
+            users[name] = {"id": next_id("user"), "username": name, "permalink": _slug(name),
+                           "followers_count": _count(rng, 2, 6)}
+        return users[name]
+
+    def sc_track(title, uploader, tags, isrc=None):
+        user = sc_user(uploader)
+        plays = _count(rng, 3, 7.5)
+        track = {
+            "id": next_id("sc"),
+            "kind": "track",
+            "title": title,
+            "permalink_url": f"https://soundcloud.com/{user['permalink']}/{_slug(title)}",
+            "user": user,
+            "genre": rng.choice(_GENRES),
+            "tag_list": tags,
+            "description": "",
+            "duration": rng.randint(150_000, 330_000),
+            "playback_count": plays,
+            "likes_count": int(plays * rng.uniform(0.003, 0.05)),
+            "reposts_count": int(plays * rng.uniform(0.0005, 0.005)),
+            "comment_count": int(plays * rng.uniform(0.0001, 0.002)),
+            "created_at": f"{_date(rng, 2019, 2025)}T{rng.randint(0, 23):02d}:00:00Z",
+        }
+        if isrc:
+            track["publisher_metadata"] = {"isrc": isrc}
+        sc_tracks.append(track)
+
+    for n in range(songs):
+        artists = [rng.choice(originals)]
+        if rng.random() < 0.1:
+            artists.append(rng.choice([a for a in originals if a != artists[0]] or originals))
+        artist = " & ".join(artists)
+        song = f"{rng.choice(_TITLE_WORDS[0])} {rng.choice(_TITLE_WORDS[1])}"
+        isrc = _isrc(2 * n)
+        label = rng.choice(_LABELS)
+        writers = [names() for _ in range(rng.randint(1, 3))]
+
+        album_ids, release_dates = [], []
+        for i in range(rng.choice((1, 1, 2, 3))):
+            album_id = next_id("album")
+            released = _date(rng)
+            # Compilations (and some originals) come back without a label.
+            albums.append({"id": album_id, "name": f"{song} - Single" if i == 0 else f"Hits {released[:4]}",
+                           "label": label if i == 0 and rng.random() < 0.8 else "", "release_date": released})
+            album_ids.append(album_id)
+            release_dates.append(released)
+        cm_tracks.append({
+            "id": next_id("track"),
+            "name": song,
+            "isrc": isrc,
+            "artist_names": artists,
+            "album_ids": album_ids,
+            "release_dates": release_dates,
+            "songwriters": writers,
+            "album_label": [label],
+            "record_label": label,
+            "spotify_track_ids": [uuid.UUID(int=rng.getrandbits(128)).hex[:22]],
+        })
+        if rng.random() < 0.25:
+            cm_tracks.append({
+                "id": next_id("track"), "name": f"{song} - Radio Edit", "isrc": _isrc(2 * n + 1),
+                "artist_names": artists, "album_ids": [], "release_dates": [], "songwriters": writers,
+                "album_label": [label], "record_label": label,
+            })
+        catalog.append({"artist": artist, "title": song, "isrc": isrc})
+
+        if rng.random() < 0.8:
+            lum_songs.append({
+                "isrc": isrc, "title": song, "display_artist_name": artist,
+                "metrics": [{"metric_name": "Total Streams", "value": _count(rng, 5, 9)}],
+            })
+        if rng.random() < 0.7:
+            work_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            works.append({
+                "id": work_id,
+                "title": song,
+                "writers": [{"name": w, "type": rng.choice(("composer", "lyricist", "writer"))} for w in writers],
+                "publishers": rng.sample(_PUBLISHERS, rng.randint(0, 2)),
+            })
+            recordings.append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "title": song,
+                "artist": artist,
+                "releases": [{"title": f"{song} - Single", "status": "Official", "labels": [label]}],
+                "works": [{"id": work_id, "type": "performance"}],
+            })
+
+        for remixer in rng.sample(remixers, min(remixes_per_song, len(remixers))):
+            title = rng.choice(_REMIX_TEMPLATES).format(artist=artist, song=song, remixer=remixer)
+            remix_isrc = _isrc(10**7 + len(sc_tracks)) if rng.random() < 0.2 else None
+            sc_track(title, remixer, f'"{artist}" remix', remix_isrc)
+        if rng.random() < 0.3:
+            other = rng.choice(remixers)
+            sc_track(f"{song} ({other} Remix)", other, "remix")
+
+    return {
+        "soundcloud": {"tracks": sc_tracks},
+        "chartmetric": {"artists": cm_artists, "tracks": cm_tracks, "albums": albums},
+        "luminate": {"songs": lum_songs},
+        "musicbrainz": {"recordings": recordings, "works": works},
+        "catalog": catalog,
+    }
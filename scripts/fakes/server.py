@@ -0,0 +1,647 @@
+"""
+Local HTTP stand-ins for the upstream APIs, answered from a Fixtures set.
+
+One ThreadingHTTPServer serves all four services under path prefixes:
+
+    /soundcloud/...        SC_BASE    /resolve, /search/tracks, /tracks/{id}
+    /chartmetric/api/...   CM_BASE    /token, /search, /artist/..., /track/..., /album/{id}
+    /luminate/...          LUM_BASE   /auth, /search, /songs/{isrc}, /musical_recordings/{isrc}
+    /ws/2/...              MB_HOST    recording search + lookup, work lookup (XML, as musicbrainzngs expects)
+    /_fakes/stats          GET        call counters;  POST /_fakes/reset clears them
+
+Each request sleeps for a delay drawn from its service's Latency, may be
+failed on purpose (429 / 401 / 500 at the configured rates), and
+Chartmetric calls are metered per bearer token against a token bucket
+like the real 4 req/s contract: over-quota calls get a 429 with
+Retry-After. Clients are pointed here through the base URLs in
+scripts.config (FakeServices.env()).
+
+Usage:
+    from scripts.fakes import FakeServices, Fixtures
+
+    with FakeServices(Fixtures.synthetic(songs=200), latency="lognormal:60:0.5",
+                      faults={"cm": {429: 0.01}}) as fakes:
+        env = fakes.env()   # SC_BASE, CM_BASE, LUM_BASE, MB_HOST, fake credentials
+        ...
+        fakes.stats()       # {"calls": {"cm.search": 412, ...}, "status": {...}, ...}
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from scripts.fakes.fixtures import Fixtures
+from scripts.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+SERVICES = ("sc", "cm", "lum", "mb")
+FAULT_STATUSES = (401, 429, 500)
+
+FAKE_CLIENT_ID = "fakeclientid0000000000000000000"
+FAKE_CREDENTIALS = {
+    "SOUNDCLOUD_CLIENT_ID": FAKE_CLIENT_ID,
+    "CHARTMETRIC_REFRESH_TOKEN": "fake-refresh-token",
+    "LUMINATE_API_KEY": "fake-api-key",
+    "LUMINATE_EMAIL": "fakes@example.com",
+    "LUMINATE_PASSWORD": "fake-password",
+}
+
+_MB_NS = "http://musicbrainz.org/ns/mmd-2.0#"
+_MB_EXT_NS = "http://musicbrainz.org/ns/ext#-2.0"
+_MB_FIELD_RE = re.compile(r"(\w+):\((.*?)\)(?=\s+\w+:\(|\s*$)")
+_LUCENE_ESCAPE_RE = re.compile(r"\\(.)")
+
+
+class Latency:
+    """
+    Per-request delay distribution, specified in milliseconds.
+
+    Specs: "0" (none), "const:40", "uniform:20:120", "normal:80:20"
+    (mean, stddev) and "lognormal:80:0.5" (median, sigma).
+    """
+
+    _ARITY = {"const": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+
+    def __init__(self, kind="const", *params):
+        if kind not in self._ARITY or len(params) != self._ARITY[kind]:
+            raise ValueError(f"bad latency {kind}:{':'.join(map(str, params))}")
+        if any(p < 0 for p in params):
+            raise ValueError("latency parameters must be >= 0")
+        self.kind = kind
+        self.params = tuple(float(p) for p in params)
+
+    @classmethod
+    def parse(cls, spec):
+        if isinstance(spec, Latency):
+            return spec
+        if spec is None or spec == "":
+            return cls("const", 0)
+        if isinstance(spec, (int, float)):
+            return cls("const", spec)
+        kind, *params = str(spec).split(":")
+        if not params:
+            kind, params = "const", [kind]
+        try:
+            return cls(kind, *(float(p) for p in params))
+        except (TypeError, ValueError):
+            raise ValueError(f"bad latency spec {spec!r}") from None
+
+    def sample(self, rng):
+        """One delay in seconds (never negative)."""
+        a, b = (self.params + (0.0,))[:2]
+        if self.kind == "const":
+            ms = a
+        elif self.kind == "uniform":
+            ms = rng.uniform(a, b)
+        elif self.kind == "normal":
+            ms = rng.gauss(a, b)
+        else:
+            ms = a * math.exp(rng.gauss(0.0, b)) if a else 0.0
+        return max(ms, 0.0) / 1000.0
+
+    def __repr__(self):
+        return f"Latency({':'.join([self.kind, *(f'{p:g}' for p in self.params)])})"
+
+
+def parse_latency_specs(specs):
+    """["lognormal:60:0.5", "cm=uniform:80:250"] -> {service: Latency}; bare specs apply to all."""
+    latency = {}
+    for spec in specs:
+        service, sep, value = spec.partition("=")
+        targets = [service] if sep else list(SERVICES)
+        value = value if sep else spec
+        for target in targets:
+            if target not in SERVICES:
+                raise ValueError(f"unknown service {target!r} (expected one of {', '.join(SERVICES)})")
+            latency[target] = Latency.parse(value)
+    return latency
+
+
+def parse_fault_specs(specs):
+    """["cm:429=0.02", "sc:500=0.01"] -> {"cm": {429: 0.02}, "sc": {500: 0.01}}."""
+    faults = {}
+    for spec in specs:
+        try:
+            target, rate = spec.split("=")
+            service, status = target.split(":")
+            faults.setdefault(service, {})[int(status)] = float(rate)
+        except ValueError:
+            raise ValueError(f"bad fault spec {spec!r} (expected service:status=rate)") from None
+    return faults
+
+
+class _Reply(Exception):
+    """Raised by handlers to answer with a non-200 status."""
+
+    def __init__(self, status, payload=None, headers=None):
+        super().__init__(status)
+        self.status = status
+        self.payload = payload if payload is not None else {"error": _REASONS.get(status, "error")}
+        self.headers = headers or {}
+
+
+_REASONS = {400: "bad request", 401: "unauthorized", 404: "not found", 429: "too many requests",
+            500: "internal server error"}
+
+
+def _int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class FakeServices:
+    """Fake SoundCloud / Chartmetric / Luminate / MusicBrainz on one local port."""
+
+    def __init__(self, fixtures=None, host="127.0.0.1", port=0, latency=None, faults=None,
+                 cm_rate_limit=(4.0, 4), seed=0):
+        """
+        Args:
+            fixtures:      Fixtures to serve (default: Fixtures.default()).
+            host, port:    Bind address; port 0 picks a free port.
+            latency:       Latency spec for every service, or {service: spec}
+                           with services "sc", "cm", "lum", "mb".
+            faults:        {service: {status: probability}} with status 401, 429
+                           or 500; applied to data endpoints, not auth.
+            cm_rate_limit: (requests per second, burst) allowed per Chartmetric
+                           token, or None for no limit.
+            seed:          Seeds latency sampling and fault injection.
+        """
+        self.fixtures = fixtures if fixtures is not None else Fixtures.default()
+        self.host = host
+        self.port = port
+        if not isinstance(latency, dict):
+            latency = {service: latency for service in SERVICES}
+        unknown = set(latency) - set(SERVICES)
+        if unknown:
+            raise ValueError(f"unknown services in latency: {sorted(unknown)}")
+        self.latency = {service: Latency.parse(latency.get(service)) for service in SERVICES}
+        self.faults = {}
+        for service, rates in (faults or {}).items():
+            if service not in SERVICES:
+                raise ValueError(f"unknown service in faults: {service!r}")
+            for status, rate in rates.items():
+                if int(status) not in FAULT_STATUSES or not 0 <= rate <= 1:
+                    raise ValueError(f"bad fault {service}:{status}={rate}")
+            self.faults[service] = {int(status): float(rate) for status, rate in rates.items()}
+        self.cm_rate_limit = cm_rate_limit
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cm_tokens = {}   # bearer token -> TokenBucket (or None when unlimited)
+        self._lum_tokens = set()
+        self._calls = Counter()
+        self._statuses = Counter()
+        self._latency_total = 0.0
+        self._httpd = None
+        self._thread = None
+        self._routes = self._build_routes()
+
+    # ── Lifecycle ──────────────────────────────────────────────────
+
+    def start(self):
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.services = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        logger.info("Fake services listening on %s", self.url)
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def wait(self):
+        """Block until stop() is called or the process is interrupted."""
+        while self._thread is not None and self._thread.is_alive():
+            self._thread.join(0.5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── Client configuration ───────────────────────────────────────
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def base_urls(self):
+        return {
+            "SC_BASE": f"{self.url}/soundcloud",
+            "CM_BASE": f"{self.url}/chartmetric/api",
+            "LUM_BASE": f"{self.url}/luminate",
+            "MB_HOST": f"{self.host}:{self.port}",
+        }
+
+    def env(self):
+        """
+        Environment that points scripts.config at these fakes.
+
+        Apply it before scripts.config is imported (it reads the environment
+        once). Also enables Chartmetric, disables the MusicBrainz courtesy
+        delay and the persistent response cache, so fake data never lands in
+        the real cache file.
+        """
+        return {
+            **self.base_urls(),
+            **FAKE_CREDENTIALS,
+            "CM_ENABLED": "1",
+            "CM_CACHE_ENABLED": "0",
+            "MB_RATE_DELAY": "0",
+        }
+
+    # ── Counters ───────────────────────────────────────────────────
+
+    def stats(self):
+        with self._lock:
+            statuses = {}
+            for (route, status), count in sorted(self._statuses.items()):
+                statuses.setdefault(route, {})[str(status)] = count
+            return {
+                "total": sum(self._calls.values()),
+                "calls": dict(sorted(self._calls.items())),
+                "status": statuses,
+                "injected_latency_s": round(self._latency_total, 3),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self._statuses.clear()
+            self._latency_total = 0.0
+
+    # ── Dispatch ───────────────────────────────────────────────────
+
+    def _build_routes(self):
+        sc, cm, lum, mb = "/soundcloud", "/chartmetric/api", "/luminate", "/ws/2"
+        table = [
+            ("sc", "GET", sc + r"/resolve", "sc.resolve", self._sc_resolve),
+            ("sc", "GET", sc + r"/search/tracks", "sc.search_tracks", self._sc_search_tracks),
+            ("sc", "GET", sc + r"/tracks/(\d+)", "sc.track", self._sc_track),
+            ("cm", "POST", cm + r"/token", "cm.token", self._cm_token),
+            ("cm", "GET", cm + r"/search", "cm.search", self._cm_search),
+            ("cm", "GET", cm + r"/artist/(\d+)", "cm.artist", self._cm_artist),
+            ("cm", "GET", cm + r"/artist/(\d+)/career", "cm.artist_career", self._cm_artist_career),
+            ("cm", "GET", cm + r"/artist/(\d+)/where-people-listen", "cm.artist_geo", self._cm_artist_geo),
+            ("cm", "GET", cm + r"/artist/(\d+)/stat/([\w-]+)", "cm.artist_stat", self._cm_artist_stat),
+            ("cm", "GET", cm + r"/artist/chartmetric/(\d+)/get-ids", "cm.artist_ids", self._cm_artist_ids),
+            ("cm", "GET", cm + r"/track/(\d+)", "cm.track", self._cm_track),
+            ("cm", "GET", cm + r"/track/isrc/([^/]+)/get-ids", "cm.track_isrc_ids", self._cm_track_isrc_ids),
+            ("cm", "GET", cm + r"/track/chartmetric/(\d+)/get-ids", "cm.track_ids", self._cm_track_ids),
+            ("cm", "GET", cm + r"/album/(\d+)", "cm.album", self._cm_album),
+            ("lum", "POST", lum + r"/auth", "lum.auth", self._lum_auth),
+            ("lum", "GET", lum + r"/search", "lum.search", self._lum_search),
+            ("lum", "GET", lum + r"/songs/([^/]+)", "lum.songs", self._lum_song),
+            ("lum", "GET", lum + r"/musical_recordings/([^/]+)", "lum.musical_recordings", self._lum_song),
+            ("mb", "GET", mb + r"/recording/?", "mb.recording_search", self._mb_recording_search),
+            ("mb", "GET", mb + r"/recording/([0-9a-f-]{36})", "mb.recording", self._mb_recording),
+            ("mb", "GET", mb + r"/work/([0-9a-f-]{36})", "mb.work", self._mb_work),
+        ]
+        return [(service, method, re.compile(pattern + "$"), name, handler)
+                for service, method, pattern, name, handler in table]
+
+    def handle(self, method, target, headers, body):
+        """Answer one request. Returns (status, headers, body bytes)."""
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query, keep_blank_values=True).items()}
+
+        if path == "/_fakes/stats" and method == "GET":
+            return self._encode(200, self.stats())
+        if path == "/_fakes/reset" and method == "POST":
+            self.reset()
+            return self._encode(200, {"ok": True})
+
+        for service, route_method, pattern, name, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return self._encode(404, {"error": f"no fake for {method} {path}"})
+
+        with self._lock:
+            self._calls[name] += 1
+            delay = self.latency[service].sample(self._rng)
+            self._latency_total += delay
+            fault = self._draw_fault(service) if not name.endswith((".token", ".auth")) else None
+        try:
+            self._authorize(service, name, query, headers)
+            if fault:
+                headers_out = {"Retry-After": "1"} if fault == 429 else None
+                raise _Reply(fault, {"error": f"injected {fault}"}, headers_out)
+            if service == "cm" and name != "cm.token":
+                self._meter_cm(headers)
+            payload = handler(*match.groups(), query=query, body=body)
+            status, extra = 200, None
+        except _Reply as reply:
+            status, payload, extra = reply.status, reply.payload, reply.headers
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self._statuses[(name, status)] += 1
+        return self._encode(status, payload, extra)
+
+    def _draw_fault(self, service):
+        for status, rate in self.faults.get(service, {}).items():
+            if rate and self._rng.random() < rate:
+                return status
+        return None
+
+    def _authorize(self, service, name, query, headers):
+        if service == "sc" and not query.get("client_id"):
+            raise _Reply(401)
+        bearer = (headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+        if service == "cm" and name != "cm.token":
+            with self._lock:
+                known = bearer in self._cm_tokens
+            if not known:
+                raise _Reply(401, {"error": "invalid or expired token"})
+        if service == "lum" and name != "lum.auth":
+            with self._lock:
+                known = bearer in self._lum_tokens
+            if not known or not headers.get("x-api-key"):
+                raise _Reply(401, {"message": "Unauthorized"})
+
+    def _meter_cm(self, headers):
+        bearer = (headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+        bucket = self._cm_tokens.get(bearer)
+        if bucket is not None and not bucket.try_acquire():
+            raise _Reply(429, {"error": "rate limit exceeded"}, {"Retry-After": "1"})
+
+    @staticmethod
+    def _encode(status, payload, headers=None):
+        headers = dict(headers or {})
+        if isinstance(payload, bytes):
+            headers.setdefault("Content-Type", "application/xml; charset=utf-8")
+            return status, headers, payload
+        headers["Content-Type"] = "application/json"
+        return status, headers, json.dumps(payload).encode("utf-8")
+
+    # ── SoundCloud ─────────────────────────────────────────────────
+
+    def _sc_resolve(self, query, body):
+        track_id = self.fixtures.sc_permalinks.get((query.get("url") or "").split("?")[0].rstrip("/"))
+        if track_id is None:
+            raise _Reply(404)
+        return self.fixtures.sc_tracks[track_id]
+
+    def _sc_search_tracks(self, query, body):
+        limit = min(max(_int(query.get("limit"), 50), 1), 200)
+        tracks = self.fixtures.search_sc_tracks(
+            query.get("q") or "", limit=limit, genre=query.get("genres"), created_after=query.get("created_at[from]"),
+        )
+        return {"collection": tracks, "total_results": len(tracks), "next_href": None}
+
+    def _sc_track(self, track_id, query, body):
+        track = self.fixtures.sc_tracks.get(int(track_id))
+        if track is None:
+            raise _Reply(404)
+        return track
+
+    # ── Chartmetric ────────────────────────────────────────────────
+
+    def _cm_token(self, query, body):
+        try:
+            refresh = json.loads(body or b"{}").get("refreshtoken")
+        except ValueError:
+            refresh = None
+        if not refresh:
+            raise _Reply(401, {"error": "invalid refresh token"})
+        token = f"fake-cm-{uuid.uuid4().hex}"
+        bucket = TokenBucket(*self.cm_rate_limit) if self.cm_rate_limit else None
+        with self._lock:
+            self._cm_tokens[token] = bucket
+        return {"token": token, "expires_in": 3600, "refresh_token": refresh, "scope": "api"}
+
+    def _cm_search(self, query, body):
+        entity_type = query.get("type") or "artists"
+        limit = _int(query.get("limit"), 5)
+        if entity_type == "artists":
+            hits = self.fixtures.search_cm_artists(query.get("q") or "", limit)
+        elif entity_type == "tracks":
+            hits = self.fixtures.search_cm_tracks(query.get("q") or "", limit)
+        else:
+            hits = []
+        return {"obj": {entity_type: hits}}
+
+    def _artist(self, cm_id):
+        artist = self.fixtures.cm_artists.get(int(cm_id))
+        if artist is None:
+            raise _Reply(404)
+        return artist
+
+    def _cm_artist(self, cm_id, query, body):
+        return {"obj": self._artist(cm_id).get("meta", {})}
+
+    def _cm_artist_career(self, cm_id, query, body):
+        return {"obj": self._artist(cm_id).get("career", [])}
+
+    def _cm_artist_geo(self, cm_id, query, body):
+        return {"obj": self._artist(cm_id).get("where_people_listen", {"cities": {}, "countries": {}})}
+
+    def _cm_artist_stat(self, cm_id, platform, query, body):
+        return {"obj": self._artist(cm_id).get("stats", {}).get(platform, [])}
+
+    def _cm_artist_ids(self, cm_id, query, body):
+        return {"obj": self._artist(cm_id).get("ids", [])}
+
+    def _cm_track(self, track_id, query, body):
+        track = self.fixtures.cm_tracks.get(int(track_id))
+        if track is None:
+            raise _Reply(404)
+        return {"obj": track}
+
+    def _track_ids_rows(self, track_ids):
+        rows = []
+        for track_id in track_ids:
+            track = self.fixtures.cm_tracks[track_id]
+            rows.append({"chartmetric_ids": [track_id], "isrc": track.get("isrc"), "track_name": track.get("name"),
+                         "spotify_ids": track.get("spotify_track_ids", [])})
+        return rows
+
+    def _cm_track_isrc_ids(self, isrc, query, body):
+        return {"obj": self._track_ids_rows(self.fixtures.cm_isrcs.get(isrc.upper(), []))}
+
+    def _cm_track_ids(self, track_id, query, body):
+        if int(track_id) not in self.fixtures.cm_tracks:
+            raise _Reply(404)
+        return {"obj": self._track_ids_rows([int(track_id)])}
+
+    def _cm_album(self, album_id, query, body):
+        album = self.fixtures.cm_albums.get(int(album_id))
+        if album is None:
+            raise _Reply(404)
+        return {"obj": album}
+
+    # ── Luminate ───────────────────────────────────────────────────
+
+    def _lum_auth(self, query, body):
+        form = parse_qs((body or b"").decode("utf-8"))
+        if not form.get("username") or not form.get("password"):
+            raise _Reply(401, {"message": "Invalid credentials"})
+        token = f"fake-lum-{uuid.uuid4().hex}"
+        with self._lock:
+            self._lum_tokens.add(token)
+        return {"access_token": token, "token_type": "Bearer", "expires_in": 86400}
+
+    def _lum_search(self, query, body):
+        size = _int(query.get("size"), 10)
+        if size < 10:  # the real API silently returns nothing below 10
+            return {"results": []}
+        return {"results": self.fixtures.search_lum(query.get("query") or "", query.get("entity_type") or "song", size)}
+
+    def _lum_song(self, isrc, query, body):
+        song = self.fixtures.lum_songs.get(isrc.upper())
+        if song is None:
+            raise _Reply(404, {"message": "Not Found"})
+        return {**song, "id": song["isrc"], "location": query.get("location", "US"),
+                "start_date": query.get("start_date"), "end_date": query.get("end_date")}
+
+    # ── MusicBrainz ────────────────────────────────────────────────
+
+    def _mb_recording_search(self, query, body):
+        fields = {key: _LUCENE_ESCAPE_RE.sub(r"\1", value)
+                  for key, value in _MB_FIELD_RE.findall(query.get("query") or "")}
+        limit = _int(query.get("limit"), 25)
+        results = self.fixtures.search_mb_recordings(fields.get("recording", ""), fields.get("artist"), limit)
+        listing = ET.Element("recording-list", {"count": str(len(results)), "offset": "0"})
+        for recording, score in results:
+            listing.append(_mb_recording_element(recording, score=score, includes=("releases",)))
+        return _mb_document(listing)
+
+    def _mb_recording(self, recording_id, query, body):
+        recording = self.fixtures.mb_recordings.get(recording_id)
+        if recording is None:
+            raise _Reply(404, _mb_error())
+        includes = tuple((query.get("inc") or "").split())
+        return _mb_document(_mb_recording_element(recording, includes=includes))
+
+    def _mb_work(self, work_id, query, body):
+        work = self.fixtures.mb_works.get(work_id)
+        if work is None:
+            raise _Reply(404, _mb_error())
+        return _mb_document(_mb_work_element(work, includes=tuple((query.get("inc") or "").split())))
+
+
+# ── MusicBrainz XML ───────────────────────────────────────────────
+
+def _mb_id(kind, name):
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"fake-mb/{kind}/{name}"))
+
+
+def _mb_document(child):
+    root = ET.Element("metadata", {"xmlns": _MB_NS, "xmlns:ext": _MB_EXT_NS})
+    root.append(child)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _mb_error():
+    root = ET.Element("error")
+    ET.SubElement(root, "text").text = "Not Found"
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _text(parent, tag, text):
+    ET.SubElement(parent, tag).text = text
+
+
+def _named(parent, tag, name):
+    element = ET.SubElement(parent, tag, {"id": _mb_id(tag, name)})
+    _text(element, "name", name)
+    _text(element, "sort-name", name)
+    return element
+
+
+def _mb_recording_element(recording, score=None, includes=()):
+    element = ET.Element("recording", {"id": recording["id"]})
+    if score is not None:
+        element.set("ext:score", str(score))
+    _text(element, "title", recording["title"])
+    credit = ET.SubElement(ET.SubElement(element, "artist-credit"), "name-credit")
+    _named(credit, "artist", recording.get("artist") or "")
+    if "releases" in includes:
+        releases = recording.get("releases", [])
+        release_list = ET.SubElement(element, "release-list", {"count": str(len(releases))})
+        for release in releases:
+            release_el = ET.SubElement(release_list, "release", {"id": _mb_id("release", release["title"])})
+            _text(release_el, "title", release["title"])
+            _text(release_el, "status", release.get("status") or "Official")
+            labels = ET.SubElement(release_el, "label-info-list")
+            for label in release.get("labels", []):
+                _named(ET.SubElement(labels, "label-info"), "label", label)
+    if "work-rels" in includes and recording.get("works"):
+        relations = ET.SubElement(element, "relation-list", {"target-type": "work"})
+        for work in recording["works"]:
+            relation = ET.SubElement(relations, "relation", {"type": work.get("type") or "performance"})
+            _text(relation, "target", work["id"])
+            work_el = ET.SubElement(relation, "work", {"id": work["id"]})
+            _text(work_el, "title", recording["title"])
+    return element
+
+
+def _mb_work_element(work, includes=()):
+    element = ET.Element("work", {"id": work["id"]})
+    _text(element, "title", work["title"])
+    if "artist-rels" in includes and work.get("writers"):
+        relations = ET.SubElement(element, "relation-list", {"target-type": "artist"})
+        for writer in work["writers"]:
+            relation = ET.SubElement(relations, "relation", {"type": writer.get("type") or "writer"})
+            _text(relation, "target", _mb_id("artist", writer["name"]))
+            _named(relation, "artist", writer["name"])
+    if "label-rels" in includes and work.get("publishers"):
+        relations = ET.SubElement(element, "relation-list", {"target-type": "label"})
+        for publisher in work["publishers"]:
+            relation = ET.SubElement(relations, "relation", {"type": "publisher"})
+            _text(relation, "target", _mb_id("label", publisher))
+            _named(relation, "label", publisher)
+    return element
+
+
+# ── HTTP plumbing ─────────────────────────────────────────────────
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # benchmark runs open many keep-alive connections at once
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+    server_version = "RemixRadarFakes/1.0"
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def _serve(self, method):
+        length = _int(self.headers.get("Content-Length"), 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = self.server.services.handle(method, self.path, self.headers, body)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("fakes: " + format, *args)
@@ -0,0 +1,156 @@
+"""
+Thread-safe bounded LRU + TTL cache for in-process enrichment results.
+
+Drop-in for the plain dicts ChartmetricClient used for its artist and
+ISRC caches, so one instance can be shared by every client (sync and
+async) in a long-lived server process. Entries are bounded by count and
+by approximate serialized size, and expire after `ttl` seconds — or after
+`negative_ttl` seconds when the cached value is None, so a transient
+upstream failure is retried soon instead of sticking for the process
+lifetime.
+
+Usage:
+    from scripts.lru import MISSING, LRUCache
+
+    cache = LRUCache(maxsize=5000, max_bytes=64 << 20, ttl=6 * 3600, negative_ttl=300)
+    cache["the weeknd"] = {...}
+    cache.get("the weeknd", MISSING)
+    cache.stats()  # -> {"size": 1, "bytes": ..., "hits": ..., "evictions": ..., "expirations": ...}
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Sentinel for .get() so cached None (negative results) can be told apart from a miss.
+MISSING = object()
+
+
+def approx_size(value):
+    """Approximate in-memory footprint of a JSON-like value (its compact JSON length)."""
+    if value is None:
+        return 4
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class LRUCache:
+    """
+    Least-recently-used mapping with count, byte and TTL bounds.
+
+    Args:
+        maxsize:      Max number of entries.
+        max_bytes:    Max total approx_size() of stored values (None = unbounded).
+        ttl:          Seconds a non-None value stays valid (None = no expiry).
+        negative_ttl: Seconds a None value stays valid (defaults to `ttl`).
+    """
+
+    def __init__(self, maxsize=1024, max_bytes=None, ttl=None, negative_ttl=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        # key -> (value, expires_at or None, nbytes)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.byte_evictions = 0
+        self.expirations = 0
+
+    def _live(self, key, now):
+        """Return the entry for `key`, dropping it if expired. Caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            self._bytes -= entry[2]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            if entry[0] is None:
+                self.negative_hits += 1
+            return entry[0]
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        lifetime = self.negative_ttl if value is None else self.ttl
+        expires_at = time.monotonic() + lifetime if lifetime is not None else None
+        nbytes = approx_size(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                # Larger than the whole budget: don't cache rather than flush everything.
+                self.byte_evictions += 1
+                return
+            self._data[key] = (value, expires_at, nbytes)
+            self._bytes += nbytes
+            while len(self._data) > self.maxsize:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.evictions += 1
+            while self.max_bytes is not None and self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.byte_evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._live(key, time.monotonic()) is not None
+
+    def __len__(self):
+        return len(self._data)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[2]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "byte_evictions": self.byte_evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,252 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Counters, gauges and fixed-bucket histograms with labels, held in one
+process-wide registry and rendered on demand (GET /metrics on the API
+server). Updating a metric is a dict lookup plus a few additions under a
+lock; nothing is exported until a scrape asks for it.
+
+Values that already live elsewhere (cache counters, rate-limiter queue
+depth) are not copied on the hot path: register a collector that reads
+them at scrape time instead.
+
+Usage:
+    from scripts import metrics
+
+    REQUESTS = metrics.counter("remixradar_things_total", "Things done.", ("kind",))
+    REQUESTS.labels("remix").inc()
+    LATENCY = metrics.histogram("remixradar_thing_seconds", "Thing latency.", ("kind",))
+    LATENCY.labels("remix").observe(0.12)
+
+    metrics.observe_upstream("cm", "/artist/123", 200, 0.084)  # used by the platform clients
+    text = metrics.REGISTRY.render()
+"""
+
+import bisect
+import math
+import threading
+
+from scripts.tracing import path_template
+
+# Upstream API and route latencies: 5 ms .. 30 s.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _label_text(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """The child for one combination of label values (strings; created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount=1.0):
+        self.labels().dec(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            le = (("le", _format_value(bound)),)
+            lines.append(f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics plus scrape-time collectors, rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"metric {metric.name!r} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def register_collector(self, collect):
+        """
+        Add a scrape-time source. `collect()` returns an iterable of
+        (name, kind, documentation, [(labels dict, value), ...]).
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def unregister_collector(self, collect):
+        with self._lock:
+            if collect in self._collectors:
+                self._collectors.remove(collect)
+
+    def render(self):
+        """Everything in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collect in collectors:
+            for name, kind, documentation, samples in collect():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_label_text(labels, labels.values())} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# ── Upstream API calls (fed by the platform clients) ───────────────
+
+UPSTREAM_REQUESTS = counter(
+    "remixradar_upstream_requests_total",
+    "Upstream API responses by platform, endpoint and HTTP status (\"error\" = no response).",
+    ("platform", "endpoint", "status"),
+)
+UPSTREAM_LATENCY = histogram(
+    "remixradar_upstream_request_duration_seconds",
+    "Upstream API request latency by platform and endpoint.",
+    ("platform", "endpoint"),
+)
+
+
+def observe_upstream(platform, path, status, seconds):
+    """Count one upstream response (or failure) and its latency."""
+    endpoint = path_template(path)
+    UPSTREAM_REQUESTS.labels(platform, endpoint, str(status)).inc()
+    UPSTREAM_LATENCY.labels(platform, endpoint).observe(seconds)
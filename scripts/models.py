@@ -6,71 +6,188 @@ These are the domain-specific logic components that sit between
 the raw API data and the final pipeline output.
 """
 
-import re
+import functools
 import math
+import re
 
 from scripts.config import cfg
 
 
-_REMIX_PAREN = re.compile(
-    r"\s*\(([^)]+?)\s+(?:remix|edit|bootleg|flip|rework|vip|mix)\)",
-    re.IGNORECASE,
-)
+# Marker words that close a "(Name <kind>)" / "[Name <kind>]" group, and the
+# subset accepted after a trailing dash ("Song - Remix").
+_MARKER_KINDS = ("remix", "edit", "bootleg", "flip", "rework", "vip", "mix")
+_TRAILING_KINDS = ("remix", "edit", "bootleg", "flip", "rework")
+_SEPARATORS = (" - ", " \u2013 ", " \u2014 ")
+_DASHES = "-\u2013"
 
-_REMIX_BRACKET = re.compile(
-    r"\s*\[([^\]]+?)\s+(?:remix|edit|bootleg|flip|rework|vip|mix)\]",
+# Unicode fallbacks: re.IGNORECASE also folds a few non-ASCII letters
+# (e.g. "\u0130", "\u0131", "\u212a") onto i/k, which str.lower() does not.
+_MARKER_WORD_RE = re.compile("|".join(f"({kind})" for kind in _MARKER_KINDS), re.IGNORECASE)
+_TRAILING_REMIX = re.compile(
+    r"\s*[-\u2013]\s*(" + "|".join(_TRAILING_KINDS) + r")$",
     re.IGNORECASE,
 )
-
-_COVER_RE = re.compile(r"cover", re.IGNORECASE)
 _COVER_STRIP = re.compile(r"\s+cover.*$", re.IGNORECASE)
-_TRAILING_REMIX = re.compile(r"\s*[-\u2013]\s*(?:remix|edit|bootleg|flip|rework)$", re.IGNORECASE)
 
 
-def parse_remix_title(title):
-    """Extract original artist, song, and remix artist from a SoundCloud title.
+def _marker_kind(word):
+    """Canonical marker kind if `word` is a remix/edit/... marker, else None."""
+    if word.isascii():
+        word = word.lower()
+        return word if word in _MARKER_KINDS else None
+    match = _MARKER_WORD_RE.fullmatch(word)
+    return _MARKER_KINDS[match.lastindex - 1] if match else None
 
-    Handles patterns like 'Artist - Song (RemixArtist Remix)' and cover
-    patterns like 'Revelries - Blinding Lights (Weeknd Cover Remix)'.
 
-    Returns dict with original_artist, original_song, remix_artist, raw_title.
+def _split_marker(content):
     """
-    result = {
-        "original_artist": None,
-        "original_song": None,
-        "remix_artist": None,
-        "raw_title": title,
-    }
+    Split a group body like "Tiesto Remix" into ("Tiesto", "remix").
+
+    The body must end in whitespace + marker word; returns None otherwise.
+    """
+    if not content or content[-1].isspace():
+        return None
+    word = content.rsplit(None, 1)[-1]
+    kind = _marker_kind(word)
+    if kind is None:
+        return None
+    prefix = content[: len(content) - len(word)]
+    name = prefix.rstrip()
+    if not name:
+        # Only whitespace before the marker: the name is that whitespace's first
+        # character, which still needs at least one more to separate it.
+        if len(prefix) < 2:
+            return None
+        name = prefix[0]
+    return name, kind
+
+
+def _strip_marker_groups(text, open_char, close_char):
+    """
+    Remove every "<ws>(Name kind)" group from `text` in one left-to-right scan.
 
-    match = _REMIX_PAREN.search(title) or _REMIX_BRACKET.search(title)
+    Returns (name, kind, cleaned) where name/kind come from the first group
+    removed (None if there was none).
+    """
+    first = None
+    pieces = []
+    copied = 0
+    i = text.find(open_char)
+    while i != -1:
+        j = text.find(close_char, i + 1)
+        if j == -1:
+            break
+        split = _split_marker(text[i + 1 : j])
+        if split is None:
+            i = text.find(open_char, i + 1)
+            continue
+        if first is None:
+            first = split
+        start = i
+        while start > copied and text[start - 1].isspace():
+            start -= 1
+        pieces.append(text[copied:start])
+        copied = j + 1
+        i = text.find(open_char, copied)
+    if first is None:
+        return None, None, text
+    pieces.append(text[copied:])
+    return first[0], first[1], "".join(pieces)
+
+
+def _strip_trailing_marker(clean):
+    """Drop a trailing "- Remix" style marker; returns (kind or None, remaining text)."""
+    tail = clean[-7:]
+    if not tail.isascii():
+        match = _TRAILING_REMIX.search(clean)
+        if not match:
+            return None, clean
+        return _marker_kind(match.group(1)), clean[: match.start()]
+    tail = tail.lower()
+    for kind in _TRAILING_KINDS:
+        if tail.endswith(kind):
+            head = clean[: -len(kind)].rstrip()
+            if head and head[-1] in _DASHES:
+                return kind, head[:-1].rstrip()
+            return None, clean
+    return None, clean
+
+
+@functools.lru_cache(maxsize=cfg.TITLE_PARSE_CACHE_SIZE)
+def _parse_title(title):
+    """Memoised parse: (original_artist, original_song, remix_artist, is_cover, remix_kind)."""
+    original_artist = remix_artist = None
     is_cover = False
 
-    if match:
-        inner = match.group(1).strip()
-        if _COVER_RE.search(inner):
+    inner, kind, clean = _strip_marker_groups(title, "(", ")")
+    bracket_inner, bracket_kind, clean = _strip_marker_groups(clean, "[", "]")
+    if inner is None:
+        inner, kind = bracket_inner, bracket_kind
+
+    if inner is not None:
+        inner = inner.strip()
+        if "cover" in inner.lower():
             is_cover = True
             cover_name = _COVER_STRIP.sub("", inner).strip()
             if cover_name:
-                result["original_artist"] = cover_name
+                original_artist = cover_name
         else:
-            result["remix_artist"] = inner
+            remix_artist = inner
 
-    clean = _REMIX_PAREN.sub("", title)
-    clean = _REMIX_BRACKET.sub("", clean).strip()
-    clean = _TRAILING_REMIX.sub("", clean).strip()
+    trailing_kind, clean = _strip_trailing_marker(clean.strip())
+    clean = clean.strip()
+    kind = kind or trailing_kind
 
-    for sep in (" - ", " \u2013 ", " \u2014 "):
-        if sep in clean:
-            parts = clean.split(sep, 1)
+    for sep in _SEPARATORS:
+        idx = clean.find(sep)
+        if idx != -1:
+            head = clean[:idx].strip()
             if is_cover:
-                result["remix_artist"] = parts[0].strip()
+                remix_artist = head
             else:
-                result["original_artist"] = parts[0].strip()
-            result["original_song"] = parts[1].strip()
-            return result
+                original_artist = head
+            return original_artist, clean[idx + len(sep) :].strip(), remix_artist, is_cover, kind
+
+    return original_artist, clean, remix_artist, is_cover, kind
+
+
+def parse_remix_title(title):
+    """Extract original artist, song, and remix artist from a SoundCloud title.
+
+    Handles patterns like 'Artist - Song (RemixArtist Remix)' and cover
+    patterns like 'Revelries - Blinding Lights (Weeknd Cover Remix)'.
+
+    Returns dict with original_artist, original_song, remix_artist, raw_title,
+    is_cover and remix_kind (the marker word, e.g. "remix" or "edit", or None).
+    Results are memoised per title (cfg.TITLE_PARSE_CACHE_SIZE entries).
+    """
+    original_artist, original_song, remix_artist, is_cover, remix_kind = _parse_title(title)
+    return {
+        "original_artist": original_artist,
+        "original_song": original_song,
+        "remix_artist": remix_artist,
+        "raw_title": title,
+        "is_cover": is_cover,
+        "remix_kind": remix_kind,
+    }
 
-    result["original_song"] = clean
-    return result
+
+def parse_many(titles):
+    """parse_remix_title over an iterable of titles; repeated titles are parsed once."""
+    return [parse_remix_title(title) for title in titles]
+
+
+def title_parse_cache_stats():
+    """Hit/miss counters of the parse_remix_title memo."""
+    info = _parse_title.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
 
 
 def project_revenue(sc_plays):
@@ -92,6 +209,10 @@ def project_revenue(sc_plays):
     return result
 
 
+_VIABLE_RECOMMENDATION = "This remix warrants clearance evaluation."
+_NOT_VIABLE_RECOMMENDATION = "May not justify clearance costs at current engagement."
+
+
 def assess_viability(projections):
     """Check if a remix clears the viability threshold.
 
@@ -100,10 +221,7 @@ def assess_viability(projections):
     mid_rev = projections["mid"]["revenue"]["all_dsps_avg"]
     clears = mid_rev >= cfg.VIABILITY_THRESHOLD
 
-    if clears:
-        rec = "This remix warrants clearance evaluation."
-    else:
-        rec = "May not justify clearance costs at current engagement."
+    rec = _VIABLE_RECOMMENDATION if clears else _NOT_VIABLE_RECOMMENDATION
 
     return {
         "clears_threshold": clears,
@@ -151,27 +269,49 @@ def _engagement_score(engagement_rate):
     return _clamp((rate / 0.03) * 100.0)
 
 
+_MOMENTUM_CATEGORY_SCORES = {
+    "decline": 15,
+    "gradual decline": 30,
+    "steady": 45,
+    "growth": 70,
+    "explosive growth": 95,
+}
+
+_STAGE_RANKS = {
+    "undiscovered": 0,
+    "developing": 1,
+    "mid-level": 2,
+    "mainstream": 3,
+    "superstar": 4,
+    "legendary": 5,
+}
+
+
 def _momentum_category_score(momentum):
-    mapping = {
-        "decline": 15,
-        "gradual decline": 30,
-        "steady": 45,
-        "growth": 70,
-        "explosive growth": 95,
-    }
-    return float(mapping.get((momentum or "").strip().lower(), 45))
+    return float(_MOMENTUM_CATEGORY_SCORES.get((momentum or "").strip().lower(), 45))
 
 
 def _stage_rank(stage):
-    mapping = {
-        "undiscovered": 0,
-        "developing": 1,
-        "mid-level": 2,
-        "mainstream": 3,
-        "superstar": 4,
-        "legendary": 5,
-    }
-    return mapping.get((stage or "").strip().lower(), 0)
+    return _STAGE_RANKS.get((stage or "").strip().lower(), 0)
+
+
+# Component weights of the opportunity score. scripts/scoring.py re-scores
+# stored results under profiles that override any of these.
+SCORE_WEIGHTS = {
+    "demand": {"plays": 0.45, "likes": 0.25, "engagement": 0.15, "velocity": 0.15},
+    "conversion": {
+        "original_listeners": 0.30,
+        "remix_listeners": 0.25,
+        "loyalty": 0.15,
+        "geo_divergence": 0.15,
+        "tiktok": 0.15,
+    },
+    "momentum": {"remix_momentum": 0.70, "original_stage": 0.30},
+    "overall": {"demand": 0.60, "revenue": 0.20, "conversion": 0.10, "momentum": 0.10},
+}
+
+# Minimum overall score per label, highest first; anything lower is "WEAK".
+LABEL_THRESHOLDS = {"STRONG": 85, "MODERATE": 70, "MARGINAL": 55}
 
 
 def compute_geo_divergence(cities_a, cities_b, top_n=10):
@@ -217,11 +357,12 @@ def compute_demand_score(sc_metrics):
     if reposts > 50:
         bonus += 3.0
 
+    w = SCORE_WEIGHTS["demand"]
     score = (
-        (plays_score * 0.45)
-        + (likes_score * 0.25)
-        + (engagement_score * 0.15)
-        + (velocity_score * 0.15)
+        (plays_score * w["plays"])
+        + (likes_score * w["likes"])
+        + (engagement_score * w["engagement"])
+        + (velocity_score * w["velocity"])
         + bonus
     )
     return _clamp(score)
@@ -239,12 +380,13 @@ def compute_conversion_score(original_artist, remix_artist, original_geo, remix_
     geo_divergence_score = compute_geo_divergence(original_geo, remix_geo) * 100.0
     tiktok_score = _log_score(remix_artist.get("tiktok_followers"), floor_value=1_000, cap_value=10_000_000)
 
+    w = SCORE_WEIGHTS["conversion"]
     score = (
-        (original_listeners_score * 0.30)
-        + (remix_listeners_score * 0.25)
-        + (loyalty_score * 0.15)
-        + (geo_divergence_score * 0.15)
-        + (tiktok_score * 0.15)
+        (original_listeners_score * w["original_listeners"])
+        + (remix_listeners_score * w["remix_listeners"])
+        + (loyalty_score * w["loyalty"])
+        + (geo_divergence_score * w["geo_divergence"])
+        + (tiktok_score * w["tiktok"])
     )
     return _clamp(score)
 
@@ -277,34 +419,33 @@ def compute_momentum_score(original_career, remix_career):
         penalty = 15.0
 
     base = _clamp(remix_momentum + stage_bonus - penalty)
-    return _clamp(base * 0.70 + orig_stage_score * 0.30)
+    w = SCORE_WEIGHTS["momentum"]
+    return _clamp(base * w["remix_momentum"] + orig_stage_score * w["original_stage"])
 
 
 def compute_opportunity_score(demand, conversion, momentum, revenue_score=0.0):
     """
     Compose overall Opportunity Score and decision label.
 
-    Formula:
+    Formula (SCORE_WEIGHTS["overall"]):
         overall = demand*0.60 + revenue*0.20 + conversion*0.10 + momentum*0.10
 
     SC stream count (via demand) and revenue projection together carry 80% of
     the weight. Thresholds map to UI grades: A=8.5+ (85), B=7.0+ (70),
     C=5.5+ (55), D=below 5.5.
     """
+    w = SCORE_WEIGHTS["overall"]
     overall = _clamp(
-        (demand * 0.60)
-        + (revenue_score * 0.20)
-        + (conversion * 0.10)
-        + (momentum * 0.10)
+        (demand * w["demand"])
+        + (revenue_score * w["revenue"])
+        + (conversion * w["conversion"])
+        + (momentum * w["momentum"])
     )
-    if overall >= 85:
-        label = "STRONG"
-    elif overall >= 70:
-        label = "MODERATE"
-    elif overall >= 55:
-        label = "MARGINAL"
-    else:
-        label = "WEAK"
+    label = "WEAK"
+    for name, threshold in LABEL_THRESHOLDS.items():
+        if overall >= threshold:
+            label = name
+            break
 
     return {
         "overall": round(overall, 1),
@@ -325,3 +466,34 @@ def build_opportunity_score(sc_metrics, original_artist, remix_artist, original_
         mid_revenue = (revenue_projections.get("mid") or {}).get("revenue", {}).get("all_dsps_avg", 0.0)
     rev_score = _revenue_score(mid_revenue)
     return compute_opportunity_score(demand, conversion, momentum, rev_score)
+
+
+def scoring_inputs(sc_metrics, original_artist, remix_artist):
+    """
+    The raw signals build_opportunity_score reads, as one flat dict.
+
+    Stored on every report (and its API summary) so results can be
+    re-scored under different weights without refetching anything; see
+    scripts.scoring.rescore(). Revenue is re-derived from `plays`.
+    """
+    original = original_artist or {}
+    remix = remix_artist or {}
+    original_career = original.get("career") or {}
+    remix_career = remix.get("career") or {}
+    return {
+        "plays": sc_metrics.get("plays") or 0,
+        "likes": sc_metrics.get("likes") or 0,
+        "comments": sc_metrics.get("comments") or 0,
+        "reposts": sc_metrics.get("reposts") or 0,
+        "engagement_rate": sc_metrics.get("engagement_rate") or 0,
+        "daily_velocity": sc_metrics.get("daily_velocity") or 0,
+        "original_listeners": original.get("sp_monthly_listeners") or 0,
+        "remix_listeners": remix.get("sp_monthly_listeners") or 0,
+        "remix_loyalty_ratio": remix.get("spotify_followers_to_listeners_ratio") or 0,
+        "remix_tiktok": remix.get("tiktok_followers") or 0,
+        "geo_divergence": compute_geo_divergence(original.get("geo_cities", []), remix.get("geo_cities", [])),
+        "original_stage": original_career.get("stage"),
+        "remix_stage": remix_career.get("stage"),
+        "remix_momentum": remix_career.get("momentum"),
+        "remix_momentum_score": remix_career.get("momentum_score") or 0,
+    }
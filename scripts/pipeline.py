@@ -8,20 +8,27 @@ This module now exposes reusable analysis functions suitable for both:
 """
 
 import argparse
+import functools
 import logging
 import re
 import time
 from datetime import datetime
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
-from scripts.catalog import parse_catalog_file
+from scripts import tracing
+from scripts.catalog import iter_catalog_songs
+from scripts.catalog_index import CatalogDedupIndex
+from scripts.concurrency import fan_out, map_ordered
 from scripts.config import cfg
+from scripts.lru import MISSING
 from scripts.models import (
     assess_viability,
     build_opportunity_score,
     parse_remix_title,
     project_revenue,
+    scoring_inputs,
 )
 from scripts.platforms import ChartmetricClient, LuminateClient, SoundCloudClient
 from scripts.reporting import format_summary_table, format_track_report
@@ -107,37 +114,19 @@ def _extract_songwriters(track_obj):
     return names
 
 
-def resolve_track_by_isrc(cm, isrc):
-    """Resolve canonical Chartmetric track metadata by ISRC."""
-    clean_isrc = (isrc or "").strip().upper()
-    if not clean_isrc:
-        return None
+def _ids_row(ids_obj):
+    """First row of a Chartmetric get-ids payload (list or dict)."""
+    if isinstance(ids_obj, list):
+        return ids_obj[0] if ids_obj else {}
+    if isinstance(ids_obj, dict):
+        return ids_obj
+    return {}
 
-    if clean_isrc in cm._track_isrc_cache:
-        logger.debug("resolve_track_by_isrc: cache hit for %s", clean_isrc)
-        return cm._track_isrc_cache[clean_isrc]
-
-    try:
-        ids_obj = cm.get_track_ids_by_isrc(clean_isrc) or {}
-        if isinstance(ids_obj, list):
-            ids_row = ids_obj[0] if ids_obj else {}
-        elif isinstance(ids_obj, dict):
-            ids_row = ids_obj
-        else:
-            ids_row = {}
-        cm_ids = ids_row.get("chartmetric_ids") or []
-        if not cm_ids:
-            cm._track_isrc_cache[clean_isrc] = None
-            return None
-        cm_track_id = cm_ids[0]
-        full = cm.get_track(cm_track_id) or {}
-    except Exception:
-        cm._track_isrc_cache[clean_isrc] = None
-        return None
 
-    album_record_label = ""
-    album_ids = full.get("album_ids") or []
-    release_dates = full.get("release_dates") or []
+def _album_order(track_obj):
+    """Album ids ordered oldest release first to approximate the original master."""
+    album_ids = track_obj.get("album_ids") or []
+    release_dates = track_obj.get("release_dates") or []
 
     album_order: list[int] = []
     if isinstance(album_ids, list) and album_ids:
@@ -146,23 +135,43 @@ def resolve_track_by_isrc(cm, isrc):
             album_order = [album_id for _, album_id in paired]
         else:
             album_order = list(album_ids)
+    return album_order
 
-    for album_id in album_order[:5]:
-        try:
-            album_meta = cm.get_album(album_id) or {}
-        except Exception:
-            album_meta = {}
-        candidate = (album_meta.get("label") or "").strip()
-        if candidate:
-            album_record_label = candidate
-            break
 
+def _album_label(cm, album_id):
+    try:
+        album_meta = cm.get_album(album_id) or {}
+    except Exception:
+        album_meta = {}
+    return (album_meta.get("label") or "").strip()
+
+
+def _first_album_label(cm, track_obj):
+    """
+    Label of the oldest of the first five albums that has one, else "".
+
+    The oldest album usually carries the label, so it is fetched alone;
+    the other four are fetched concurrently only when it does not.
+    """
+    album_ids = _album_order(track_obj)[:5]
+    if not album_ids:
+        return ""
+    label = _album_label(cm, album_ids[0])
+    if label:
+        return label
+    for future in fan_out(*(partial(_album_label, cm, album_id) for album_id in album_ids[1:])):
+        if future.result():
+            return future.result()
+    return ""
+
+
+def _isrc_track_record(cm_track_id, full, clean_isrc, album_record_label):
     artist_names = full.get("artist_names") or []
     if not artist_names:
         raw_artists = full.get("artists") or []
         artist_names = [a["name"] for a in raw_artists if isinstance(a, dict) and a.get("name")]
 
-    result = {
+    return {
         "cm_track_id": cm_track_id,
         "name": full.get("name"),
         "isrc": full.get("isrc") or clean_isrc,
@@ -174,6 +183,42 @@ def resolve_track_by_isrc(cm, isrc):
         "track_record_label": full.get("record_label") or full.get("label"),
         "match_confidence": 1.0,
     }
+
+
+def resolve_track_by_isrc(cm, isrc):
+    """Resolve canonical Chartmetric track metadata by ISRC."""
+    clean_isrc = (isrc or "").strip().upper()
+    if not clean_isrc:
+        return None
+
+    cached = cm._track_isrc_cache.get(clean_isrc, MISSING)
+    if cached is not MISSING:
+        logger.debug("resolve_track_by_isrc: cache hit for %s", clean_isrc)
+        tracing.record_cache_hit("track_isrc")
+        return cached
+
+    # Tracks analysed in parallel often share one ISRC override; resolve it once.
+    return cm._inflight.do(("isrc", clean_isrc), lambda: _resolve_track_by_isrc(cm, clean_isrc))
+
+
+def _resolve_track_by_isrc(cm, clean_isrc):
+    cached = cm._track_isrc_cache.get(clean_isrc, MISSING)
+    if cached is not MISSING:
+        return cached
+    try:
+        ids_row = _ids_row(cm.get_track_ids_by_isrc(clean_isrc) or {})
+        cm_ids = ids_row.get("chartmetric_ids") or []
+        if not cm_ids:
+            cm._track_isrc_cache[clean_isrc] = None
+            return None
+        cm_track_id = cm_ids[0]
+        full = cm.get_track(cm_track_id) or {}
+    except Exception:
+        cm._track_isrc_cache[clean_isrc] = None
+        return None
+
+    album_record_label = _first_album_label(cm, full)
+    result = _isrc_track_record(cm_track_id, full, clean_isrc, album_record_label)
     cm._track_isrc_cache[clean_isrc] = result
     return result
 
@@ -194,6 +239,32 @@ def _print_credentials():
         print(f"{name:<32} {status}")
 
 
+def _artist_record(artist_name, search_result, meta, career, platform_ids):
+    """Normalized enrich_artist payload from the raw Chartmetric responses."""
+    if isinstance(career, list):
+        career = career[0] if career else {}
+    if not isinstance(career, dict):
+        career = {}
+    return {
+        "input_name": artist_name,
+        "cm_id": search_result.get("id"),
+        "name": search_result.get("name") or meta.get("name"),
+        "sp_followers": search_result.get("sp_followers"),
+        "sp_monthly_listeners": search_result.get("sp_monthly_listeners"),
+        "spotify_followers_to_listeners_ratio": search_result.get("spotify_followers_to_listeners_ratio"),
+        "spotify_listeners_to_followers_ratio": search_result.get("spotify_listeners_to_followers_ratio"),
+        "tiktok_followers": search_result.get("tiktok_followers"),
+        "cm_artist_score": search_result.get("cm_artist_score"),
+        "record_label": meta.get("record_label"),
+        "genres": meta.get("genres"),
+        "career": career,
+        "geo_cities": [],
+        "platform_ids": platform_ids,
+        "search_result": search_result,
+        "metadata": meta,
+    }
+
+
 def enrich_artist(cm, artist_name):
     """
     Reusable artist enrichment function.
@@ -203,9 +274,19 @@ def enrich_artist(cm, artist_name):
     if not artist_name:
         return None
     cache_key = artist_name.lower().strip()
-    if cache_key in cm._artist_cache:
+    cached = cm._artist_cache.get(cache_key, MISSING)
+    if cached is not MISSING:
         logger.debug("enrich_artist: cache hit for %r", artist_name)
-        return cm._artist_cache[cache_key]
+        tracing.record_cache_hit("artist")
+        return cached
+    # Two tracks needing the same artist at the same moment share one lookup.
+    return cm._inflight.do(("artist", cache_key), lambda: _enrich_artist(cm, artist_name, cache_key))
+
+
+def _enrich_artist(cm, artist_name, cache_key):
+    cached = cm._artist_cache.get(cache_key, MISSING)
+    if cached is not MISSING:
+        return cached
     logger.debug("enrich_artist: searching for %r", artist_name)
     t0 = time.perf_counter()
     try:
@@ -221,236 +302,230 @@ def enrich_artist(cm, artist_name):
 
     cm_id = search_result.get("id")
     logger.debug("enrich_artist: found cm_id=%s for %r, fetching metadata", cm_id, artist_name)
+    # The three lookups are independent; run them concurrently.
+    meta_f, career_f, ids_f = fan_out(
+        lambda: cm.get_artist(cm_id),
+        lambda: cm.get_artist_career(cm_id),
+        lambda: cm.get_artist_platform_ids(cm_id),
+    )
     try:
-        meta = cm.get_artist(cm_id)
+        meta = meta_f.result()
     except Exception:
         logger.warning("enrich_artist: get_artist failed for cm_id=%s", cm_id, exc_info=True)
         meta = {}
-    career = {}
     try:
-        career = cm.get_artist_career(cm_id)
+        career = career_f.result()
     except Exception:
         career = {}
-    if isinstance(career, list):
-        career = career[0] if career else {}
-    if not isinstance(career, dict):
-        career = {}
-    cities = []
     try:
-        ids = cm.get_artist_platform_ids(cm_id)
+        ids = ids_f.result()
         platform_ids = ids[0] if isinstance(ids, list) and ids else (ids or {})
     except Exception:
         platform_ids = {}
-    cities = []
 
     logger.debug("enrich_artist: done %r in %.2fs", artist_name, time.perf_counter() - t0)
-    result = {
-        "input_name": artist_name,
-        "cm_id": cm_id,
-        "name": search_result.get("name") or meta.get("name"),
-        "sp_followers": search_result.get("sp_followers"),
-        "sp_monthly_listeners": search_result.get("sp_monthly_listeners"),
-        "spotify_followers_to_listeners_ratio": search_result.get("spotify_followers_to_listeners_ratio"),
-        "spotify_listeners_to_followers_ratio": search_result.get("spotify_listeners_to_followers_ratio"),
-        "tiktok_followers": search_result.get("tiktok_followers"),
-        "cm_artist_score": search_result.get("cm_artist_score"),
-        "record_label": meta.get("record_label"),
-        "genres": meta.get("genres"),
-        "career": career,
-        "geo_cities": cities,
-        "platform_ids": platform_ids,
-        "search_result": search_result,
-        "metadata": meta,
-    }
+    result = _artist_record(artist_name, search_result, meta, career, platform_ids)
     cm._artist_cache[cache_key] = result
     return result
 
 
-def find_original_isrc(cm, artist_name, song_name):
-    """Find likely original track ISRC via Chartmetric track search."""
-    if not artist_name or not song_name:
-        return None
-    logger.debug("find_original_isrc: %r – %r", artist_name, song_name)
-    _t0 = time.perf_counter()
+@functools.lru_cache(maxsize=4096)
+def _norm_text(value):
+    # Memoised: the same target song/artist is normalised once per candidate.
+    text = (value or "").lower()
+    text = _NON_ALNUM_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
 
-    def _norm(value):
-        text = (value or "").lower()
-        text = _NON_ALNUM_RE.sub(" ", text)
-        return _SPACE_RE.sub(" ", text).strip()
-
-    def _artist_names(obj):
-        names = []
-        raw_names = obj.get("artist_names")
-        if isinstance(raw_names, list):
-            names.extend([_norm(n) for n in raw_names if n])
-        elif isinstance(raw_names, str):
-            names.append(_norm(raw_names))
-
-        raw_artists = obj.get("artists")
-        if isinstance(raw_artists, list):
-            for item in raw_artists:
-                if isinstance(item, dict):
-                    name = item.get("name")
-                    if name:
-                        names.append(_norm(name))
-                elif isinstance(item, str):
-                    names.append(_norm(item))
-        elif isinstance(raw_artists, str):
-            names.append(_norm(raw_artists))
-
-        # Deduplicate while preserving order.
-        deduped = []
-        seen = set()
-        for name in names:
-            if name and name not in seen:
-                seen.add(name)
-                deduped.append(name)
-        return deduped
-
-    def _artist_match(target, candidates):
-        if not target or not candidates:
-            return False
-        target_tokens = [t for t in target.split() if t]
-        for cand in candidates:
-            if target in cand or cand in target:
-                return True
-            cand_tokens = [t for t in cand.split() if t]
-            overlap = len(set(target_tokens).intersection(cand_tokens))
-            if overlap >= 2:
-                return True
+
+def _candidate_artist_names(obj):
+    names = []
+    raw_names = obj.get("artist_names")
+    if isinstance(raw_names, list):
+        names.extend([_norm_text(n) for n in raw_names if n])
+    elif isinstance(raw_names, str):
+        names.append(_norm_text(raw_names))
+
+    raw_artists = obj.get("artists")
+    if isinstance(raw_artists, list):
+        for item in raw_artists:
+            if isinstance(item, dict):
+                name = item.get("name")
+                if name:
+                    names.append(_norm_text(name))
+            elif isinstance(item, str):
+                names.append(_norm_text(item))
+    elif isinstance(raw_artists, str):
+        names.append(_norm_text(raw_artists))
+
+    # Deduplicate while preserving order.
+    deduped = []
+    seen = set()
+    for name in names:
+        if name and name not in seen:
+            seen.add(name)
+            deduped.append(name)
+    return deduped
+
+
+def _artist_match(target, candidates):
+    if not target or not candidates:
         return False
+    target_tokens = [t for t in target.split() if t]
+    for cand in candidates:
+        if target in cand or cand in target:
+            return True
+        cand_tokens = [t for t in cand.split() if t]
+        overlap = len(set(target_tokens).intersection(cand_tokens))
+        if overlap >= 2:
+            return True
+    return False
 
-    def _score_track_candidate(candidate):
-        score = 0
 
-        target_song = _norm(song_name)
-        target_artist = _norm(artist_name)
-        cand_name = _norm(candidate.get("name"))
-        cand_artists = _artist_names(candidate)
+def _score_track_candidate(candidate, artist_name, song_name):
+    score = 0
 
-        if cand_name == target_song:
-            score += 140
-        elif target_song and target_song in cand_name:
-            score += 80
-        elif cand_name and target_song and any(tok in cand_name for tok in target_song.split()):
-            score += 25
+    target_song = _norm_text(song_name)
+    target_artist = _norm_text(artist_name)
+    cand_name = _norm_text(candidate.get("name"))
+    cand_artists = _candidate_artist_names(candidate)
 
-        artist_match = _artist_match(target_artist, cand_artists)
-        if artist_match:
-            score += 120
-        elif target_artist and cand_artists:
-            # Strong penalty if we have artist data and it doesn't match the requested original artist.
-            score -= 120
+    if cand_name == target_song:
+        score += 140
+    elif target_song and target_song in cand_name:
+        score += 80
+    elif cand_name and target_song and any(tok in cand_name for tok in target_song.split()):
+        score += 25
 
-        if cand_name and any(marker in cand_name.split() for marker in _REMIX_MARKERS):
-            score -= 80
+    artist_match = _artist_match(target_artist, cand_artists)
+    if artist_match:
+        score += 120
+    elif target_artist and cand_artists:
+        # Strong penalty if we have artist data and it doesn't match the requested original artist.
+        score -= 120
 
-        if candidate.get("isrc"):
-            score += 10
+    if cand_name and any(marker in cand_name.split() for marker in _REMIX_MARKERS):
+        score -= 80
 
-        return score
+    if candidate.get("isrc"):
+        score += 10
 
-    query = f"{artist_name} {song_name}"
-    tracks = cm.search(query, "tracks", limit=10)
-    if not tracks:
-        logger.debug("find_original_isrc: no tracks found for %r (%.2fs)", query, time.perf_counter() - _t0)
-        return None
+    return score
+
+
+# Finalists whose full metadata is fetched and re-scored.
+_FINALISTS = 5
+# Highest possible _score_track_candidate(): exact title + artist match + ISRC.
+# A finalist scoring this is ranked first and yields confidence 1.0 whatever
+# the others score, so verification can stop once it is found.
+_MAX_CANDIDATE_SCORE = 140 + 120 + 10
 
-    scored = sorted(
-        [{"track": track, "score": _score_track_candidate(track)} for track in tracks],
-        key=lambda row: row["score"],
-        reverse=True,
-    )
-    logger.debug("find_original_isrc: fetching full metadata for top %d candidates", min(5, len(scored)))
-    finalists = []
-    for row in scored[:5]:
-        track = row["track"]
-        try:
-            full_track = cm.get_track(track.get("id")) or {}
-        except Exception:
-            full_track = {}
-        merged = {**track, **full_track}
-        finalists.append({"track": track, "full": full_track, "score": _score_track_candidate(merged)})
 
+def _finalist(row, full_track, artist_name, song_name):
+    track = row["track"]
+    full_track = full_track or {}
+    merged = {**track, **full_track}
+    return {"track": track, "full": full_track, "score": _score_track_candidate(merged, artist_name, song_name)}
+
+
+def _fetch_finalist(cm, row, artist_name, song_name):
+    try:
+        full_track = cm.get_track(row["track"].get("id"))
+    except Exception:
+        full_track = {}
+    return _finalist(row, full_track, artist_name, song_name)
+
+
+def _verify_candidates(cm, scored, artist_name, song_name):
+    """
+    Fetch full metadata for the top search candidates and re-score them.
+
+    The best search candidate is verified alone first; when it reaches
+    _MAX_CANDIDATE_SCORE the others cannot change the outcome and are never
+    fetched. Otherwise the remaining finalists are fetched concurrently.
+    Returns the finalists sorted by score (ties keep search order).
+    """
+    rows = scored[:_FINALISTS]
+    finalists = [_fetch_finalist(cm, rows[0], artist_name, song_name)]
+    if finalists[0]["score"] < _MAX_CANDIDATE_SCORE:
+        for future in fan_out(*(partial(_fetch_finalist, cm, row, artist_name, song_name) for row in rows[1:])):
+            finalists.append(future.result())
     finalists.sort(key=lambda row: row["score"], reverse=True)
-    top = finalists[0]["track"]
-    full = finalists[0]["full"] or {}
+    return finalists
+
+
+def _match_confidence(finalists):
     top_score = int(finalists[0]["score"])
     score_gap = top_score - int(finalists[1]["score"]) if len(finalists) > 1 else top_score
-    match_confidence = round(max(min((top_score + max(score_gap, 0) * 0.5) / 260.0, 1.0), 0.0), 2)
+    return round(max(min((top_score + max(score_gap, 0) * 0.5) / 260.0, 1.0), 0.0), 2)
 
-    isrc = full.get("isrc") or top.get("isrc")
 
-    # Canonicalize by ISRC to avoid remix/regional variants from search ordering.
-    canonical_full = {}
-    canonical_track_id = None
-    if isrc:
-        try:
-            ids_obj = cm.get_track_ids_by_isrc(isrc) or {}
-            if isinstance(ids_obj, list):
-                ids_row = ids_obj[0] if ids_obj else {}
-            elif isinstance(ids_obj, dict):
-                ids_row = ids_obj
-            else:
-                ids_row = {}
-            cm_ids = ids_row.get("chartmetric_ids") or []
-            if cm_ids:
-                canonical_track_id = cm_ids[0]
-                canonical_full = cm.get_track(canonical_track_id) or {}
-        except Exception:
-            canonical_full = {}
-
-    label_source = canonical_full or full
-    album_record_label = ""
-    album_ids = label_source.get("album_ids") or []
-    release_dates = label_source.get("release_dates") or []
-
-    # Prioritize oldest known release to approximate the original master.
-    album_order: list[int] = []
-    if isinstance(album_ids, list) and album_ids:
-        if isinstance(release_dates, list) and len(release_dates) == len(album_ids):
-            paired = sorted(zip(release_dates, album_ids), key=lambda p: str(p[0] or "9999-99-99"))
-            album_order = [album_id for _, album_id in paired]
-        else:
-            album_order = list(album_ids)
+def _original_track_record(top, full, canonical, isrc, album_record_label, match_confidence):
+    """
+    Assemble find_original_isrc's result.
 
-    for album_id in album_order[:5]:
-        try:
-            album_meta = cm.get_album(album_id) or {}
-        except Exception:
-            album_meta = {}
-        candidate = (album_meta.get("label") or "").strip()
-        if candidate:
-            album_record_label = candidate
-            break
-
-    album_label = (
-        label_source.get("album_label")
-        or top.get("album_label")
-    )
+    `canonical` is the resolve_track_by_isrc() record for the ISRC (None
+    when Chartmetric has no mapping for it). Field by field, its values win
+    over the verified finalist's full metadata, which wins over the search
+    hit `top`; a canonical record built from an empty get_track() therefore
+    falls through to the finalist.
+    """
+    canonical = canonical or {}
     track_record_label = (
-        label_source.get("record_label")
-        or label_source.get("label")
+        canonical.get("track_record_label")
         or full.get("record_label")
         or full.get("label")
         or top.get("record_label")
         or top.get("label")
     )
-    logger.debug("find_original_isrc: done %r – %r in %.2fs (isrc=%s)", artist_name, song_name, time.perf_counter() - _t0, isrc)
     return {
-        "cm_track_id": canonical_track_id or top.get("id"),
-        "name": label_source.get("name") or full.get("name") or top.get("name"),
+        "cm_track_id": canonical.get("cm_track_id") or top.get("id"),
+        "name": canonical.get("name") or full.get("name") or top.get("name"),
         "isrc": isrc,
-        "artist_names": label_source.get("artist_names") or full.get("artist_names") or top.get("artist_names") or [],
-        "release_date": _extract_release_date(label_source),
-        "songwriters": _extract_songwriters(label_source),
-        "album_label": album_label,
+        "artist_names": canonical.get("artist_names") or full.get("artist_names") or top.get("artist_names") or [],
+        "release_date": canonical.get("release_date") or _extract_release_date(full),
+        "songwriters": canonical.get("songwriters") or _extract_songwriters(full),
+        "album_label": canonical.get("album_label") or full.get("album_label") or top.get("album_label"),
         "album_record_label": album_record_label,
         "track_record_label": track_record_label,
         "match_confidence": match_confidence,
     }
 
 
+def find_original_isrc(cm, artist_name, song_name):
+    """Find likely original track ISRC via Chartmetric track search."""
+    if not artist_name or not song_name:
+        return None
+    logger.debug("find_original_isrc: %r – %r", artist_name, song_name)
+    _t0 = time.perf_counter()
+
+    query = f"{artist_name} {song_name}"
+    tracks = cm.search(query, "tracks", limit=10)
+    if not tracks:
+        logger.debug("find_original_isrc: no tracks found for %r (%.2fs)", query, time.perf_counter() - _t0)
+        return None
+
+    scored = sorted(
+        [{"track": track, "score": _score_track_candidate(track, artist_name, song_name)} for track in tracks],
+        key=lambda row: row["score"],
+        reverse=True,
+    )
+    finalists = _verify_candidates(cm, scored, artist_name, song_name)
+    logger.debug("find_original_isrc: verified %d of %d candidates", len(finalists), min(_FINALISTS, len(scored)))
+    top = finalists[0]["track"]
+    full = finalists[0]["full"]
+    match_confidence = _match_confidence(finalists)
+
+    isrc = full.get("isrc") or top.get("isrc")
+
+    # Canonicalize by ISRC to avoid remix/regional variants from search ordering.
+    # Shares resolve_track_by_isrc's cache, so an ISRC seen before costs nothing.
+    canonical = resolve_track_by_isrc(cm, isrc) if isrc else None
+    album_record_label = (canonical or {}).get("album_record_label") or _first_album_label(cm, full)
+
+    logger.debug("find_original_isrc: done %r – %r in %.2fs (isrc=%s)", artist_name, song_name, time.perf_counter() - _t0, isrc)
+    return _original_track_record(top, full, canonical, isrc, album_record_label, match_confidence)
+
+
 def fetch_luminate_by_isrc(lum, isrc):
     """Try Luminate lookup (optional, fails gracefully)."""
     if not isrc:
@@ -474,6 +549,27 @@ def normalize_sc_track(track):
     }
 
 
+def _split_collaborators(artist_name):
+    return [p for p in _COLLAB_RE.split(artist_name) if p.strip()]
+
+
+def _merge_collaborators(enriched):
+    """Merge per-collaborator enrich_artist results, summing audience counts."""
+    enriched = [a for a in enriched if a]
+    if not enriched:
+        return None
+    if len(enriched) == 1:
+        return enriched[0]
+
+    merged = dict(enriched[0])
+    merged["name"] = " & ".join(a["name"] for a in enriched if a.get("name"))
+    merged["sp_monthly_listeners"] = sum(a.get("sp_monthly_listeners") or 0 for a in enriched) or None
+    merged["sp_followers"] = sum(a.get("sp_followers") or 0 for a in enriched) or None
+    merged["tiktok_followers"] = sum(a.get("tiktok_followers") or 0 for a in enriched) or None
+    logger.debug("enrich_artist: merged monthly_listeners=%s", merged["sp_monthly_listeners"])
+    return merged
+
+
 def _enrich_possibly_multi_artist(cm, artist_name):
     """
     Enrich an artist name that may contain multiple collaborators (e.g. "A & B").
@@ -485,25 +581,64 @@ def _enrich_possibly_multi_artist(cm, artist_name):
     """
     if not artist_name:
         return None
-    parts = [p for p in _COLLAB_RE.split(artist_name) if p.strip()]
+    parts = _split_collaborators(artist_name)
     if len(parts) <= 1:
         return enrich_artist(cm, artist_name)
 
     logger.debug("enrich_artist: multi-artist split %r → %r", artist_name, parts)
-    enriched = [enrich_artist(cm, p) for p in parts]
-    enriched = [a for a in enriched if a]
-    if not enriched:
-        return None
-    if len(enriched) == 1:
-        return enriched[0]
+    enriched = [future.result() for future in fan_out(*(partial(enrich_artist, cm, p) for p in parts))]
+    return _merge_collaborators(enriched)
 
-    merged = dict(enriched[0])
-    merged["name"] = " & ".join(a["name"] for a in enriched if a.get("name"))
-    merged["sp_monthly_listeners"] = sum(a.get("sp_monthly_listeners") or 0 for a in enriched) or None
-    merged["sp_followers"] = sum(a.get("sp_followers") or 0 for a in enriched) or None
-    merged["tiktok_followers"] = sum(a.get("tiktok_followers") or 0 for a in enriched) or None
-    logger.debug("enrich_artist: merged monthly_listeners=%s", merged["sp_monthly_listeners"])
-    return merged
+
+def _original_name_from_track(original_track, fallback):
+    """Prefer the authoritative Chartmetric artist names over the parsed title string."""
+    if original_track and original_track.get("artist_names"):
+        cm_names = original_track["artist_names"]
+        return " & ".join(cm_names) if len(cm_names) > 1 else cm_names[0]
+    return fallback
+
+
+def _build_report(norm_track, parsed, sc_metrics, original_artist, remix_artist, original_track):
+    """Score and assemble the per-track report once enrichment is done."""
+    original_geo = (original_artist or {}).get("geo_cities", [])
+    remix_geo = (remix_artist or {}).get("geo_cities", [])
+    original_career = (original_artist or {}).get("career", {})
+    remix_career = (remix_artist or {}).get("career", {})
+
+    projections = project_revenue(sc_metrics.get("plays", 0))
+    opportunity_score = build_opportunity_score(
+        sc_metrics=sc_metrics,
+        original_artist=original_artist or {},
+        remix_artist=remix_artist or {},
+        original_geo=original_geo,
+        remix_geo=remix_geo,
+        original_career=original_career,
+        remix_career=remix_career,
+        revenue_projections=projections,
+    )
+
+    original_isrc = (original_track or {}).get("isrc")
+    luminate_data = None
+    viability = assess_viability(projections)
+
+    return {
+        "sc_url": norm_track.get("permalink_url"),
+        "track_id": norm_track.get("id"),
+        "track_title": norm_track.get("title"),
+        "track_genre": norm_track.get("genre"),
+        "sc_track": norm_track,
+        "sc_metrics": sc_metrics,
+        "parsed_title": parsed,
+        "original_artist": original_artist,
+        "remix_artist": remix_artist,
+        "original_track": original_track,
+        "original_isrc": original_isrc,
+        "luminate_data": luminate_data,
+        "opportunity_score": opportunity_score,
+        "scoring_inputs": scoring_inputs(sc_metrics, original_artist, remix_artist),
+        "revenue": {"projections": projections},
+        "viability": viability,
+    }
 
 
 def analyze_track_object(sc_track, clients, original_isrc_override=None, min_plays=0):
@@ -511,19 +646,22 @@ def analyze_track_object(sc_track, clients, original_isrc_override=None, min_pla
     Core reusable per-track analysis function.
 
     This is the API-ready service function that all workflows call.
+    The report's "trace" holds per-stage timings, upstream calls, cache
+    hits and throttle waits (scripts.tracing).
     """
     sc = clients["sc"]
     cm = clients["cm"]
-    lum = clients["lum"]
     cm_enabled = clients.get("cm_enabled", True)
+    trace = tracing.Trace()
 
     norm_track = normalize_sc_track(sc_track)
     title = norm_track["title"] or ""
     logger.debug("analyze_track: start  %r", title)
-    _t0 = time.perf_counter()
 
-    parsed = parse_remix_title(title)
-    sc_metrics = sc.compute_metrics(sc_track)
+    with trace.span("parse"):
+        parsed = parse_remix_title(title)
+    with trace.span("sc_metrics"):
+        sc_metrics = sc.compute_metrics(sc_track)
 
     plays = sc_metrics.get("plays", 0)
     if min_plays > 0 and plays < min_plays:
@@ -544,69 +682,38 @@ def analyze_track_object(sc_track, clients, original_isrc_override=None, min_pla
         if original_isrc_override:
             logger.debug("analyze_track: resolve by ISRC override %s", original_isrc_override)
             try:
-                original_track = resolve_track_by_isrc(cm, original_isrc_override)
+                with trace.span("isrc_lookup"):
+                    original_track = resolve_track_by_isrc(cm, original_isrc_override)
             except Exception:
                 logger.warning("analyze_track: ISRC override lookup failed", exc_info=True)
 
         # Prefer artist name from Chartmetric (via ISRC); fall back to title parser.
         if original_track and original_track.get("artist_names"):
-            cm_names = original_track["artist_names"]
-            original_name = " & ".join(cm_names) if len(cm_names) > 1 else cm_names[0]
+            original_name = _original_name_from_track(original_track, original_name)
             logger.debug("analyze_track: using CM artist name %r (from ISRC)", original_name)
 
         logger.debug("analyze_track: enrich original artist %r", original_name)
-        original_artist = _enrich_possibly_multi_artist(cm, original_name)
+        with trace.span("original_enrichment"):
+            original_artist = _enrich_possibly_multi_artist(cm, original_name)
         logger.debug("analyze_track: enrich remix artist %r", remix_name)
-        remix_artist = enrich_artist(cm, remix_name) if remix_name else None
+        with trace.span("remix_enrichment"):
+            remix_artist = enrich_artist(cm, remix_name) if remix_name else None
 
         if not original_track and original_name and song_name:
             logger.debug("analyze_track: find_original_isrc for %r – %r", original_name, song_name)
             try:
-                original_track = find_original_isrc(cm, original_name, song_name)
+                with trace.span("isrc_lookup"):
+                    original_track = find_original_isrc(cm, original_name, song_name)
             except Exception:
                 logger.warning("analyze_track: find_original_isrc failed", exc_info=True)
     else:
         logger.debug("analyze_track: Chartmetric disabled, skipping enrichment for %r", title)
 
-    original_geo = (original_artist or {}).get("geo_cities", [])
-    remix_geo = (remix_artist or {}).get("geo_cities", [])
-    original_career = (original_artist or {}).get("career", {})
-    remix_career = (remix_artist or {}).get("career", {})
-
-    projections = project_revenue(sc_metrics.get("plays", 0))
-    opportunity_score = build_opportunity_score(
-        sc_metrics=sc_metrics,
-        original_artist=original_artist or {},
-        remix_artist=remix_artist or {},
-        original_geo=original_geo,
-        remix_geo=remix_geo,
-        original_career=original_career,
-        remix_career=remix_career,
-        revenue_projections=projections,
-    )
-
-    original_isrc = (original_track or {}).get("isrc")
-    luminate_data = None
-    viability = assess_viability(projections)
-    logger.debug("analyze_track: done  %r  total=%.2fs", title, time.perf_counter() - _t0)
-
-    return {
-        "sc_url": norm_track.get("permalink_url"),
-        "track_id": norm_track.get("id"),
-        "track_title": norm_track.get("title"),
-        "track_genre": norm_track.get("genre"),
-        "sc_track": norm_track,
-        "sc_metrics": sc_metrics,
-        "parsed_title": parsed,
-        "original_artist": original_artist,
-        "remix_artist": remix_artist,
-        "original_track": original_track,
-        "original_isrc": original_isrc,
-        "luminate_data": luminate_data,
-        "opportunity_score": opportunity_score,
-        "revenue": {"projections": projections},
-        "viability": viability,
-    }
+    with trace.span("scoring"):
+        report = _build_report(norm_track, parsed, sc_metrics, original_artist, remix_artist, original_track)
+    report["trace"] = trace.to_dict()
+    logger.debug("analyze_track: done  %r  total=%.2fs", title, trace.elapsed)
+    return report
 
 
 def analyze_url(sc_url, clients):
@@ -615,8 +722,12 @@ def analyze_url(sc_url, clients):
     return analyze_track_object(sc_track, clients)
 
 
-def search_song_remixes(song_name, artist_name=None, limit=20, clients=None, min_plays=0, original_isrc=None):
-    """Option 3: Search SoundCloud remixes for a specific song."""
+def search_song_remixes(song_name, artist_name=None, limit=20, clients=None, min_plays=0, original_isrc=None, max_workers=1):
+    """Option 3: Search SoundCloud remixes for a specific song.
+
+    max_workers > 1 analyses tracks on a bounded thread pool; result
+    ordering and shape are the same as the serial run.
+    """
     sc = clients["sc"]
     tracks = sc.search_remixes(song_name=song_name, artist=artist_name, limit=limit)
 
@@ -632,7 +743,12 @@ def search_song_remixes(song_name, artist_name=None, limit=20, clients=None, min
         logger.debug("search_song_remixes: no qualifying remixes for %r, skipping enrichment", song_name)
         return []
 
-    reports = [r for r in (analyze_track_object(track, clients, original_isrc_override=original_isrc, min_plays=min_plays) for track in tracks) if r is not None]
+    analyzed = map_ordered(
+        lambda track: analyze_track_object(track, clients, original_isrc_override=original_isrc, min_plays=min_plays),
+        tracks,
+        max_workers=max_workers,
+    )
+    reports = [r for r in analyzed if r is not None]
     reports.sort(key=lambda r: r.get("opportunity_score", {}).get("overall", 0), reverse=True)
     return reports
 
@@ -670,45 +786,39 @@ def search_artist_remixes(artist_name, limit_songs=8, limit_remixes=6, clients=N
     return ranked
 
 
-def discover_remixes(genre=None, min_plays=0, created_after=None, limit=30, clients=None):
+def discover_remixes(genre=None, min_plays=0, created_after=None, limit=30, clients=None, max_workers=1):
     """Option 4: Discovery mode using search + filters."""
     sc = clients["sc"]
     tracks = sc.search_tracks(query="remix", limit=limit, genre=genre, created_after=created_after)
     tracks = [t for t in tracks if (t.get("playback_count") or 0) >= (min_plays or 0)]
-    reports = [analyze_track_object(track, clients) for track in tracks]
+    reports = map_ordered(lambda track: analyze_track_object(track, clients), tracks, max_workers=max_workers)
     reports.sort(key=lambda r: r.get("opportunity_score", {}).get("overall", 0), reverse=True)
     return reports
 
 
-def process_catalog(filepath, limit_remixes=5, min_plays=0, clients=None):
-    """Option 1: Bulk catalog flow from CSV/XML."""
-    records = parse_catalog_file(filepath)
+def process_catalog(filepath, limit_remixes=5, min_plays=0, clients=None, max_workers=1):
+    """Option 1: Bulk catalog flow from CSV/XML.
 
-    # Deduplicate by ISRC so the same song uploaded twice doesn't get processed twice.
-    seen_isrcs: set[str] = set()
-    deduped: list[dict] = []
-    for r in records:
-        isrc = r.get("isrc")
-        if isrc:
-            if isrc in seen_isrcs:
-                continue
-            seen_isrcs.add(isrc)
-        deduped.append(r)
+    max_workers > 1 searches that many catalog songs concurrently.
+    """
+    # Dedup by normalised ISRC (else artist + title) so a song listed twice is searched once.
+    index = CatalogDedupIndex()
+    songs = list(iter_catalog_songs(filepath, index=index))
+    logger.info("process_catalog: %s", index.stats())
 
-    all_reports = []
-    for record in deduped:
-        artist = record.get("artist")
-        title = record.get("title")
-        if not title:
-            continue
+    def _search(record):
         reports = search_song_remixes(
-            song_name=title, artist_name=artist, limit=limit_remixes, clients=clients
+            song_name=record["title"], artist_name=record.get("artist"), limit=limit_remixes, clients=clients
         )
         if min_plays > 0:
             reports = [
                 r for r in reports
                 if (r.get("sc_metrics") or {}).get("plays", 0) >= min_plays
             ]
+        return reports
+
+    all_reports = []
+    for reports in map_ordered(_search, songs, max_workers=max_workers):
         all_reports.extend(reports)
 
     dedup_map = {r.get("track_id"): r for r in all_reports}
@@ -717,10 +827,11 @@ def process_catalog(filepath, limit_remixes=5, min_plays=0, clients=None):
     return ranked
 
 
-def make_clients():
+def make_clients(artist_cache=None, track_isrc_cache=None):
+    """Build the sync client dict; pass shared caches to keep warm data across calls."""
     return {
         "sc": SoundCloudClient(),
-        "cm": ChartmetricClient(),
+        "cm": ChartmetricClient(artist_cache=artist_cache, track_isrc_cache=track_isrc_cache),
         "lum": LuminateClient(),
         "cm_enabled": cfg.CM_ENABLED,
     }
@@ -738,6 +849,7 @@ def build_arg_parser():
     parser.add_argument("--limit", type=int, default=20, help="Result limit for search/discovery")
     parser.add_argument("--catalog", help="CSV/XML catalog path (Option 1)")
     parser.add_argument("--catalog-limit-remixes", type=int, default=5, help="Per-song remix limit in catalog mode")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel workers for track/song analysis")
     return parser
 
 
@@ -749,7 +861,12 @@ def main():
 
     try:
         if args.catalog:
-            reports = process_catalog(args.catalog, limit_remixes=args.catalog_limit_remixes, clients=clients)
+            reports = process_catalog(
+                args.catalog,
+                limit_remixes=args.catalog_limit_remixes,
+                clients=clients,
+                max_workers=args.workers,
+            )
             print("\nCatalog Results")
             print("-" * 72)
             print(format_summary_table(reports))
@@ -762,6 +879,7 @@ def main():
                 created_after=args.created_after,
                 limit=args.limit,
                 clients=clients,
+                max_workers=args.workers,
             )
             print("\nDiscovery Results")
             print("-" * 72)
@@ -774,6 +892,7 @@ def main():
                 artist_name=args.artist,
                 limit=args.limit,
                 clients=clients,
+                max_workers=args.workers,
             )
             print("\nSong Search Results")
             print("-" * 72)
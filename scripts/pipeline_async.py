@@ -0,0 +1,354 @@
+"""
+asyncio variants of the Remix Radar workflow service layer.
+
+Same control flow and report shape as scripts.pipeline, driven by the
+Async*Client platform clients so the FastAPI server can run many
+searches on one event loop instead of parking a threadpool worker per
+SSE stream. Pure parsing/scoring helpers are shared with pipeline.py.
+
+Usage:
+    from scripts.pipeline_async import analyze_track_object, make_async_clients
+
+    clients = make_async_clients()
+    report = await analyze_track_object(sc_track, clients)
+"""
+
+import asyncio
+import logging
+import time
+
+from scripts import tracing
+from scripts.config import cfg
+from scripts.lru import MISSING
+from scripts.models import parse_remix_title
+from scripts.pipeline import (
+    _FINALISTS,
+    _MAX_CANDIDATE_SCORE,
+    _album_order,
+    _artist_record,
+    _build_report,
+    _finalist,
+    _ids_row,
+    _isrc_track_record,
+    _match_confidence,
+    _merge_collaborators,
+    _original_name_from_track,
+    _original_track_record,
+    _score_track_candidate,
+    _split_collaborators,
+    normalize_sc_track,
+)
+from scripts.platforms import AsyncChartmetricClient, AsyncLuminateClient, AsyncSoundCloudClient
+
+logger = logging.getLogger(__name__)
+
+
+async def _gather_settled(*aws):
+    """gather() that returns exceptions in place so each call keeps its own fallback."""
+    return await asyncio.gather(*aws, return_exceptions=True)
+
+
+async def _none():
+    return None
+
+
+async def _settled_until(aws, stop):
+    """
+    Run `aws` concurrently and collect their results in order, exceptions in
+    place like _gather_settled, up to the first result for which `stop(result)`
+    is true. Anything still pending at that point is cancelled.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    results = []
+    try:
+        for task in tasks:
+            try:
+                result = await task
+            except Exception as exc:
+                result = exc
+            results.append(result)
+            if stop(result):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
+
+
+async def _album_label(cm, album_id):
+    try:
+        album_meta = await cm.get_album(album_id) or {}
+    except Exception:
+        album_meta = {}
+    return (album_meta.get("label") or "").strip()
+
+
+async def _first_album_label(cm, track_obj):
+    """Same order and result as pipeline._first_album_label; stops at the first labelled album."""
+    album_ids = _album_order(track_obj)[:5]
+    if not album_ids:
+        return ""
+    label = await _album_label(cm, album_ids[0])
+    if label:
+        return label
+    labels = await _settled_until((_album_label(cm, album_id) for album_id in album_ids[1:]), bool)
+    return next((label for label in labels if label), "")
+
+
+async def resolve_track_by_isrc(cm, isrc):
+    """Resolve canonical Chartmetric track metadata by ISRC."""
+    clean_isrc = (isrc or "").strip().upper()
+    if not clean_isrc:
+        return None
+    cached = cm._track_isrc_cache.get(clean_isrc, MISSING)
+    if cached is not MISSING:
+        logger.debug("resolve_track_by_isrc: cache hit for %s", clean_isrc)
+        tracing.record_cache_hit("track_isrc")
+        return cached
+    return await cm._inflight.do(("isrc", clean_isrc), lambda: _resolve_track_by_isrc(cm, clean_isrc))
+
+
+async def _resolve_track_by_isrc(cm, clean_isrc):
+    cached = cm._track_isrc_cache.get(clean_isrc, MISSING)
+    if cached is not MISSING:
+        return cached
+    try:
+        ids_row = _ids_row(await cm.get_track_ids_by_isrc(clean_isrc) or {})
+        cm_ids = ids_row.get("chartmetric_ids") or []
+        if not cm_ids:
+            cm._track_isrc_cache[clean_isrc] = None
+            return None
+        cm_track_id = cm_ids[0]
+        full = await cm.get_track(cm_track_id) or {}
+    except Exception:
+        cm._track_isrc_cache[clean_isrc] = None
+        return None
+
+    album_record_label = await _first_album_label(cm, full)
+    result = _isrc_track_record(cm_track_id, full, clean_isrc, album_record_label)
+    cm._track_isrc_cache[clean_isrc] = result
+    return result
+
+
+async def enrich_artist(cm, artist_name):
+    """Async enrich_artist; concurrent callers for one artist share a lookup."""
+    if not artist_name:
+        return None
+    cache_key = artist_name.lower().strip()
+    cached = cm._artist_cache.get(cache_key, MISSING)
+    if cached is not MISSING:
+        logger.debug("enrich_artist: cache hit for %r", artist_name)
+        tracing.record_cache_hit("artist")
+        return cached
+    return await cm._inflight.do(("artist", cache_key), lambda: _enrich_artist(cm, artist_name, cache_key))
+
+
+async def _enrich_artist(cm, artist_name, cache_key):
+    cached = cm._artist_cache.get(cache_key, MISSING)
+    if cached is not MISSING:
+        return cached
+    logger.debug("enrich_artist: searching for %r", artist_name)
+    t0 = time.perf_counter()
+    try:
+        search_result = await cm.find_artist(artist_name)
+    except Exception:
+        logger.warning("enrich_artist: Chartmetric lookup failed for %r", artist_name, exc_info=True)
+        cm._artist_cache[cache_key] = None
+        return None
+    if not search_result:
+        logger.debug("enrich_artist: no result for %r (%.2fs)", artist_name, time.perf_counter() - t0)
+        cm._artist_cache[cache_key] = None
+        return None
+
+    cm_id = search_result.get("id")
+    meta, career, ids = await _gather_settled(
+        cm.get_artist(cm_id),
+        cm.get_artist_career(cm_id),
+        cm.get_artist_platform_ids(cm_id),
+    )
+    if isinstance(meta, Exception):
+        logger.warning("enrich_artist: get_artist failed for cm_id=%s: %s", cm_id, meta)
+        meta = {}
+    if isinstance(career, Exception):
+        career = {}
+    if isinstance(ids, Exception):
+        platform_ids = {}
+    else:
+        platform_ids = ids[0] if isinstance(ids, list) and ids else (ids or {})
+
+    logger.debug("enrich_artist: done %r in %.2fs", artist_name, time.perf_counter() - t0)
+    result = _artist_record(artist_name, search_result, meta, career, platform_ids)
+    cm._artist_cache[cache_key] = result
+    return result
+
+
+async def _enrich_possibly_multi_artist(cm, artist_name):
+    if not artist_name:
+        return None
+    parts = _split_collaborators(artist_name)
+    if len(parts) <= 1:
+        return await enrich_artist(cm, artist_name)
+    logger.debug("enrich_artist: multi-artist split %r → %r", artist_name, parts)
+    enriched = await asyncio.gather(*(enrich_artist(cm, p) for p in parts))
+    return _merge_collaborators(enriched)
+
+
+async def _fetch_finalist(cm, row, artist_name, song_name):
+    try:
+        full_track = await cm.get_track(row["track"].get("id"))
+    except Exception:
+        full_track = {}
+    return _finalist(row, full_track, artist_name, song_name)
+
+
+async def _verify_candidates(cm, scored, artist_name, song_name):
+    """Async pipeline._verify_candidates; the concurrent round also stops at a top-scoring finalist."""
+    rows = scored[:_FINALISTS]
+    finalists = [await _fetch_finalist(cm, rows[0], artist_name, song_name)]
+    if finalists[0]["score"] < _MAX_CANDIDATE_SCORE:
+        finalists += await _settled_until(
+            (_fetch_finalist(cm, row, artist_name, song_name) for row in rows[1:]),
+            lambda finalist: finalist["score"] >= _MAX_CANDIDATE_SCORE,
+        )
+    finalists.sort(key=lambda row: row["score"], reverse=True)
+    return finalists
+
+
+async def find_original_isrc(cm, artist_name, song_name):
+    """Find likely original track ISRC via Chartmetric track search."""
+    if not artist_name or not song_name:
+        return None
+    _t0 = time.perf_counter()
+
+    query = f"{artist_name} {song_name}"
+    tracks = await cm.search(query, "tracks", limit=10)
+    if not tracks:
+        logger.debug("find_original_isrc: no tracks found for %r (%.2fs)", query, time.perf_counter() - _t0)
+        return None
+
+    scored = sorted(
+        [{"track": track, "score": _score_track_candidate(track, artist_name, song_name)} for track in tracks],
+        key=lambda row: row["score"],
+        reverse=True,
+    )
+    finalists = await _verify_candidates(cm, scored, artist_name, song_name)
+    top = finalists[0]["track"]
+    full = finalists[0]["full"]
+    match_confidence = _match_confidence(finalists)
+
+    isrc = full.get("isrc") or top.get("isrc")
+
+    canonical = await resolve_track_by_isrc(cm, isrc) if isrc else None
+    album_record_label = (canonical or {}).get("album_record_label") or await _first_album_label(cm, full)
+    logger.debug("find_original_isrc: done %r – %r in %.2fs (isrc=%s)", artist_name, song_name, time.perf_counter() - _t0, isrc)
+    return _original_track_record(top, full, canonical, isrc, album_record_label, match_confidence)
+
+
+async def fetch_luminate_by_isrc(lum, isrc):
+    """Try Luminate lookup (optional, fails gracefully)."""
+    if not isrc:
+        return None
+    try:
+        return await lum.get_consumption_by_isrc(isrc)
+    except Exception:
+        return None
+
+
+async def analyze_track_object(sc_track, clients, original_isrc_override=None, min_plays=0):
+    """Async per-track analysis; returns the same report dict (and trace) as pipeline.analyze_track_object."""
+    sc = clients["sc"]
+    cm = clients["cm"]
+    cm_enabled = clients.get("cm_enabled", True)
+    trace = tracing.Trace()
+
+    norm_track = normalize_sc_track(sc_track)
+    title = norm_track["title"] or ""
+
+    with trace.span("parse"):
+        parsed = parse_remix_title(title)
+    with trace.span("sc_metrics"):
+        sc_metrics = sc.compute_metrics(sc_track)
+
+    plays = sc_metrics.get("plays", 0)
+    if min_plays > 0 and plays < min_plays:
+        return None
+
+    remix_name = parsed.get("remix_artist") or sc_track.get("user", {}).get("username")
+    song_name = parsed.get("original_song")
+    original_name = parsed.get("original_artist")
+    original_track = None
+    original_artist = None
+    remix_artist = None
+
+    if cm_enabled:
+        if original_isrc_override:
+            try:
+                original_track = await tracing.traced(
+                    trace, "isrc_lookup", resolve_track_by_isrc(cm, original_isrc_override)
+                )
+            except Exception:
+                logger.warning("analyze_track: ISRC override lookup failed", exc_info=True)
+
+        original_name = _original_name_from_track(original_track, original_name)
+
+        # Original/remix enrichment and the ISRC search are independent.
+        need_isrc = not original_track and original_name and song_name
+        # Each runs as its own task, so each span only sees its own calls.
+        original_artist, remix_artist, found_track = await _gather_settled(
+            tracing.traced(trace, "original_enrichment", _enrich_possibly_multi_artist(cm, original_name)),
+            tracing.traced(trace, "remix_enrichment", enrich_artist(cm, remix_name)) if remix_name else _none(),
+            tracing.traced(trace, "isrc_lookup", find_original_isrc(cm, original_name, song_name)) if need_isrc else _none(),
+        )
+        if isinstance(original_artist, Exception):
+            original_artist = None
+        if isinstance(remix_artist, Exception):
+            remix_artist = None
+        if isinstance(found_track, Exception):
+            logger.warning("analyze_track: find_original_isrc failed: %s", found_track)
+        elif need_isrc:
+            original_track = found_track
+    else:
+        logger.debug("analyze_track: Chartmetric disabled, skipping enrichment for %r", title)
+
+    with trace.span("scoring"):
+        report = _build_report(norm_track, parsed, sc_metrics, original_artist, remix_artist, original_track)
+    report["trace"] = trace.to_dict()
+    logger.debug("analyze_track: done  %r  total=%.2fs", title, trace.elapsed)
+    return report
+
+
+async def analyze_url(sc_url, clients):
+    sc_track = await clients["sc"].resolve(sc_url)
+    return await analyze_track_object(sc_track, clients)
+
+
+async def search_song_remixes(song_name, artist_name=None, limit=20, clients=None, min_plays=0,
+                              original_isrc=None, max_concurrency=4):
+    """Async song-remix search; tracks are analysed up to max_concurrency at a time."""
+    sc = clients["sc"]
+    tracks = await sc.search_remixes(song_name=song_name, artist=artist_name, limit=limit)
+    if min_plays > 0:
+        tracks = [t for t in tracks if (t.get("playback_count") or 0) >= min_plays]
+    if not tracks:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _analyze(track):
+        async with semaphore:
+            return await analyze_track_object(track, clients, original_isrc_override=original_isrc, min_plays=min_plays)
+
+    analyzed = await asyncio.gather(*(_analyze(track) for track in tracks))
+    reports = [r for r in analyzed if r is not None]
+    reports.sort(key=lambda r: r.get("opportunity_score", {}).get("overall", 0), reverse=True)
+    return reports
+
+
+def make_async_clients(artist_cache=None, track_isrc_cache=None):
+    """Build the async client dict; pass shared caches to keep warm data across calls."""
+    return {
+        "sc": AsyncSoundCloudClient(),
+        "cm": AsyncChartmetricClient(artist_cache=artist_cache, track_isrc_cache=track_isrc_cache),
+        "lum": AsyncLuminateClient(),
+        "cm_enabled": cfg.CM_ENABLED,
+    }
@@ -1,3 +1,3 @@
-from .soundcloud import SoundCloudClient
-from .chartmetric import ChartmetricClient
-from .luminate import LuminateClient
+from .soundcloud import AsyncSoundCloudClient, SoundCloudClient
+from .chartmetric import AsyncChartmetricClient, ChartmetricClient
+from .luminate import AsyncLuminateClient, LuminateClient
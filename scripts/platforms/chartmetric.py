@@ -4,7 +4,17 @@ Chartmetric API Client for Remix Radar.
 Chartmetric tracks 9M+ artists across streaming, social media, charts,
 and radio. It is MANDATORY for the hackathon.
 
-Rate limit: 4 requests/second (enforced via 0.3s delay between calls).
+Rate limit: 4 requests/second, enforced by a process-wide token bucket
+shared by every ChartmetricClient and worker thread.
+
+Entity lookups (artists, careers, tracks, albums, ID mappings, search)
+are served from a persistent SQLite response cache when fresh enough;
+see CM_CACHE_TTLS in config.py for the per-family TTLs.
+
+search() additionally goes through an in-process memo keyed by the
+normalised query, and identical concurrent searches share one request.
+find_artist() only expands to its "The X" / "DJ X" variants when the
+plain name has no exact top hit. search_stats counts what that saves.
 
 Usage:
     from scripts.platforms.chartmetric import ChartmetricClient
@@ -13,60 +23,168 @@ Usage:
     artist = cm.find_artist("The Weeknd")
     geo = cm.get_where_people_listen(artist["id"])
     ids = cm.get_artist_platform_ids(artist["id"])
+
+    # Async variant for the FastAPI server:
+    cm = AsyncChartmetricClient()
+    artist = await cm.find_artist("The Weeknd")
 """
 
+import asyncio
 import logging
+import threading
 import time
+from functools import partial
 
+import httpx
 import requests
 
+from scripts import metrics, tracing
+from scripts.concurrency import AsyncSingleFlight, SingleFlight, fan_out
 from scripts.config import cfg
+from scripts.lru import MISSING, LRUCache
+from scripts.ratelimit import TokenBucket
+from scripts.response_cache import FRESH, STALE, ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# One bucket per process so parallel workers never exceed the quota together.
+rate_limiter = TokenBucket(cfg.CM_RATE_LIMIT_RPS, cfg.CM_RATE_LIMIT_BURST)
+
+# Shared across clients and restarts; None when disabled via CM_CACHE_ENABLED=0.
+response_cache = ResponseCache(cfg.CM_CACHE_PATH, cfg.CM_CACHE_TTLS) if cfg.CM_CACHE_ENABLED else None
+
+
+# Parsed /search results by normalised query, shared by every client in the process.
+search_memo = LRUCache(maxsize=cfg.CM_SEARCH_MEMO_SIZE, ttl=cfg.CM_SEARCH_MEMO_TTL)
+
+
+class SearchStats:
+    """Process-wide counters for search() coalescing and find_artist() early exits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0          # search() calls
+        self.memo_hits = 0         # answered from search_memo
+        self.upstream = 0          # sent on to the response cache / API
+        self.variants_skipped = 0  # find_artist variant searches not needed
+
+    def count(self, field, n=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def stats(self):
+        with self._lock:
+            coalesced = self.requests - self.memo_hits - self.upstream
+            return {
+                "requests": self.requests,
+                "memo_hits": self.memo_hits,
+                "coalesced": max(coalesced, 0),  # joined an identical in-flight search
+                "upstream": self.upstream,
+                "variants_skipped": self.variants_skipped,
+                "saved": self.requests - self.upstream + self.variants_skipped,
+            }
+
+
+search_stats = SearchStats()
+
+
+def _norm_query(query):
+    return " ".join(str(query or "").split()).casefold()
+
+
+def _search_key(query, entity_type, limit):
+    """Memo / in-flight key: case- and whitespace-insensitive query."""
+    return ("search", entity_type, _norm_query(query), limit)
+
+
+def _is_exact_hit(artist, name):
+    """True when the best plain-name search result is that exact artist name."""
+    return bool(artist) and _norm_query(artist.get("name")) == _norm_query(name)
+
+
+def new_artist_cache():
+    """Bounded enrich_artist cache (lowercased artist name -> record or None)."""
+    return LRUCache(
+        maxsize=cfg.CM_ARTIST_CACHE_SIZE,
+        max_bytes=cfg.CM_ARTIST_CACHE_BYTES,
+        ttl=cfg.CM_ARTIST_CACHE_TTL,
+        negative_ttl=cfg.CM_NEGATIVE_CACHE_TTL,
+    )
+
+
+def new_track_isrc_cache():
+    """Bounded resolve_track_by_isrc cache (uppercased ISRC -> record or None)."""
+    return LRUCache(
+        maxsize=cfg.CM_ISRC_CACHE_SIZE,
+        max_bytes=cfg.CM_ISRC_CACHE_BYTES,
+        ttl=cfg.CM_ISRC_CACHE_TTL,
+        negative_ttl=cfg.CM_NEGATIVE_CACHE_TTL,
+    )
+
 
 class ChartmetricClient:
     """Client for the Chartmetric API (api.chartmetric.com)."""
 
-    def __init__(self):
+    def __init__(self, artist_cache=None, track_isrc_cache=None):
+        """
+        Args:
+            artist_cache:     Mapping keyed by lowercased artist name. Defaults
+                              to a private bounded LRUCache (new_artist_cache());
+                              pass a shared one to keep it across requests.
+            track_isrc_cache: Mapping keyed by uppercased ISRC (same semantics).
+        """
         self.base = cfg.CM_BASE
-        self._artist_cache: dict = {}     # keyed by lowercased name, lives for one request
-        self._track_isrc_cache: dict = {} # keyed by uppercased ISRC, lives for one request
+        self._artist_cache = artist_cache if artist_cache is not None else new_artist_cache()
+        self._track_isrc_cache = track_isrc_cache if track_isrc_cache is not None else new_track_isrc_cache()
+        self._inflight = SingleFlight()   # dedups concurrent searches / enrich_artist / ISRC lookups
 
     def _get(self, path, params=None):
-        """Authenticated GET with rate-limit throttling (0.3s between calls).
+        """GET via the persistent response cache (when enabled for this path)."""
+        if response_cache is None:
+            return self._fetch(path, params)
+        return response_cache.get_or_fetch(path, params, lambda: self._fetch(path, params))
+
+    def _fetch(self, path, params=None):
+        """Authenticated GET throttled by the shared token bucket.
 
         Automatically retries once on 401 with a fresh token in case the
         cached token expired mid-run (e.g. during a long catalog search).
         """
         token = cfg.cm_token()
-        time.sleep(cfg.CM_RATE_LIMIT_DELAY)
+        tracing.record_throttle(rate_limiter.acquire())
+        tracing.record_call("cm", path)
         logger.debug("CM →  %s", path)
         t0 = time.perf_counter()
-        resp = requests.get(
-            f"{self.base}{path}",
-            headers={"Authorization": f"Bearer {token}"},
-            params=params or {},
-            timeout=30,
-        )
-        elapsed = time.perf_counter() - t0
-        logger.debug("CM ←  %s  %.2fs  HTTP %s", path, elapsed, resp.status_code)
+        resp = self._send(path, token, params)
+        logger.debug("CM ←  %s  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
 
         if resp.status_code == 401:
             logger.warning("CM 401 on %s — forcing token refresh and retrying", path)
             cfg._tokens.pop("cm", None)
             token = cfg.cm_token()
-            time.sleep(cfg.CM_RATE_LIMIT_DELAY)
-            resp = requests.get(
+            tracing.record_throttle(rate_limiter.acquire())
+            tracing.record_call("cm", path)
+            resp = self._send(path, token, params)
+            logger.debug("CM ←  %s (retry)  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
+
+        resp.raise_for_status()
+        return resp.json()
+
+    def _send(self, path, token, params):
+        """One GET, counted in the upstream metrics (status "error" when no response arrives)."""
+        t0 = time.perf_counter()
+        try:
+            resp = cfg.http.get(
                 f"{self.base}{path}",
                 headers={"Authorization": f"Bearer {token}"},
                 params=params or {},
                 timeout=30,
             )
-            logger.debug("CM ←  %s (retry)  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
-
-        resp.raise_for_status()
-        return resp.json()
+        except requests.RequestException:
+            metrics.observe_upstream("cm", path, "error", time.perf_counter() - t0)
+            raise
+        metrics.observe_upstream("cm", path, resp.status_code, time.perf_counter() - t0)
+        return resp
 
     # ── SEARCH ─────────────────────────────────────────────────────
 
@@ -85,16 +203,32 @@ class ChartmetricClient:
             sp_followers, sp_monthly_listeners, cm_artist_score.
             Track objects include id, name, isrc, artist_names.
         """
-        data = self._get("/search", {"q": query, "type": entity_type, "limit": limit})
-        return data.get("obj", {}).get(entity_type, [])
+        key = _search_key(query, entity_type, limit)
+        search_stats.count("requests")
+        cached = search_memo.get(key, MISSING)
+        if cached is not MISSING:
+            search_stats.count("memo_hits")
+            tracing.record_cache_hit("cm_search_memo")
+            return list(cached)
+
+        def fetch():
+            search_stats.count("upstream")
+            data = self._get("/search", {"q": query, "type": entity_type, "limit": limit})
+            results = data.get("obj", {}).get(entity_type, [])
+            search_memo[key] = results
+            return results
+
+        return list(self._inflight.do(key, fetch))
 
     def find_artist(self, name, limit=5):
         """
         Smart artist search with automatic name-variant handling.
 
-        Searches for the name plus common prefixes ("The", "DJ") and
-        returns the best match ranked by cm_artist_score. Handles
-        edge cases like "Weeknd" matching to "The Weeknd".
+        Searches for the name first; if its top result (by cm_artist_score)
+        is an exact name match, that is returned. Otherwise the common
+        prefixes ("The", "DJ") are searched concurrently too and the best
+        match across all three is returned. Handles edge cases like
+        "Weeknd" matching to "The Weeknd".
 
         Args:
             name:  Artist name (may be partial).
@@ -103,11 +237,19 @@ class ChartmetricClient:
         Returns:
             Best-matching artist dict, or None.
         """
-        variants = [name, f"The {name}", f"DJ {name}"]
-        candidates = []
-        for variant in variants:
-            candidates.extend(self.search(variant, "artists", limit=limit))
+        candidates = self.search(name, "artists", limit=limit)
+        best = self._best_artist(candidates)
+        if _is_exact_hit(best, name):
+            search_stats.count("variants_skipped", 2)
+            return best
+        variants = [f"The {name}", f"DJ {name}"]
+        for future in fan_out(*(partial(self.search, v, "artists", limit=limit) for v in variants)):
+            candidates.extend(future.result())
+        return self._best_artist(candidates)
 
+    @staticmethod
+    def _best_artist(candidates):
+        """Deduplicate variant-search candidates and pick the highest cm_artist_score."""
         if not candidates:
             return None
 
@@ -323,3 +465,150 @@ class ChartmetricClient:
                     })
         cities.sort(key=lambda c: c["listeners"], reverse=True)
         return cities
+
+
+class AsyncChartmetricClient:
+    """
+    asyncio variant of ChartmetricClient for the FastAPI server.
+
+    Shares the process-wide token bucket and persistent response cache
+    with the sync client, and covers the endpoints used by enrichment.
+    """
+
+    parse_geo_data = staticmethod(ChartmetricClient.parse_geo_data)
+
+    def __init__(self, artist_cache=None, track_isrc_cache=None):
+        self.base = cfg.CM_BASE
+        self._artist_cache = artist_cache if artist_cache is not None else new_artist_cache()
+        self._track_isrc_cache = track_isrc_cache if track_isrc_cache is not None else new_track_isrc_cache()
+        self._inflight = AsyncSingleFlight()
+        self._revalidations = set()  # strong refs: the loop only holds tasks weakly
+
+    async def _get(self, path, params=None):
+        """
+        GET via the persistent response cache (when enabled for this path).
+
+        Cache reads and writes are SQLite I/O behind a lock shared with the
+        sync threads, so they run in a worker thread, off the event loop.
+        """
+        if response_cache is None:
+            return await self._fetch(path, params)
+        state, value = await asyncio.to_thread(response_cache.lookup, path, params)
+        if state is None:
+            return await self._fetch(path, params)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if response_cache.claim_revalidation(path, params):
+                task = asyncio.ensure_future(self._revalidate(path, params))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidation_done)
+            return value
+        value = await self._fetch(path, params)
+        await asyncio.to_thread(response_cache.store, path, params, value)
+        return value
+
+    async def _revalidate(self, path, params):
+        try:
+            value = await self._fetch(path, params)
+        except asyncio.CancelledError as exc:
+            # Release the claim off the loop; shielded so a second cancel cannot strand it.
+            await asyncio.shield(asyncio.to_thread(response_cache.finish_revalidation, path, params, error=exc))
+            raise
+        except Exception as exc:
+            await asyncio.to_thread(response_cache.finish_revalidation, path, params, error=exc)
+        else:
+            await asyncio.to_thread(response_cache.finish_revalidation, path, params, value=value)
+
+    def _revalidation_done(self, task):
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("CM background revalidation failed: %r", task.exception())
+
+    async def _fetch(self, path, params=None):
+        """Authenticated GET throttled by the shared token bucket; retries once on 401."""
+        token = await asyncio.to_thread(cfg.cm_token)
+        delay = rate_limiter.reserve()
+        tracing.record_throttle(delay)
+        tracing.record_call("cm", path)
+        await asyncio.sleep(delay)
+        logger.debug("CM →  %s", path)
+        t0 = time.perf_counter()
+        resp = await self._send(path, token, params)
+        logger.debug("CM ←  %s  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
+
+        if resp.status_code == 401:
+            logger.warning("CM 401 on %s — forcing token refresh and retrying", path)
+            cfg._tokens.pop("cm", None)
+            token = await asyncio.to_thread(cfg.cm_token)
+            delay = rate_limiter.reserve()
+            tracing.record_throttle(delay)
+            tracing.record_call("cm", path)
+            await asyncio.sleep(delay)
+            resp = await self._send(path, token, params)
+            logger.debug("CM ←  %s (retry)  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
+
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _send(self, path, token, params):
+        """One GET, counted in the upstream metrics (status "error" when no response arrives)."""
+        t0 = time.perf_counter()
+        try:
+            resp = await cfg.ahttp.get(
+                f"{self.base}{path}",
+                headers={"Authorization": f"Bearer {token}"},
+                params=params or {},
+                timeout=30,
+            )
+        except httpx.TransportError:
+            metrics.observe_upstream("cm", path, "error", time.perf_counter() - t0)
+            raise
+        metrics.observe_upstream("cm", path, resp.status_code, time.perf_counter() - t0)
+        return resp
+
+    async def search(self, query, entity_type="artists", limit=5):
+        key = _search_key(query, entity_type, limit)
+        search_stats.count("requests")
+        cached = search_memo.get(key, MISSING)
+        if cached is not MISSING:
+            search_stats.count("memo_hits")
+            tracing.record_cache_hit("cm_search_memo")
+            return list(cached)
+
+        async def fetch():
+            search_stats.count("upstream")
+            data = await self._get("/search", {"q": query, "type": entity_type, "limit": limit})
+            results = data.get("obj", {}).get(entity_type, [])
+            search_memo[key] = results
+            return results
+
+        return list(await self._inflight.do(key, fetch))
+
+    async def find_artist(self, name, limit=5):
+        candidates = await self.search(name, "artists", limit=limit)
+        best = ChartmetricClient._best_artist(candidates)
+        if _is_exact_hit(best, name):
+            search_stats.count("variants_skipped", 2)
+            return best
+        variants = [f"The {name}", f"DJ {name}"]
+        results = await asyncio.gather(*(self.search(v, "artists", limit=limit) for v in variants))
+        return ChartmetricClient._best_artist(candidates + [c for batch in results for c in batch])
+
+    async def get_artist(self, cm_id):
+        return (await self._get(f"/artist/{cm_id}")).get("obj", {})
+
+    async def get_artist_career(self, cm_id):
+        return (await self._get(f"/artist/{cm_id}/career")).get("obj", {})
+
+    async def get_artist_platform_ids(self, cm_id):
+        return (await self._get(f"/artist/chartmetric/{cm_id}/get-ids")).get("obj", [])
+
+    async def get_track(self, cm_track_id):
+        return (await self._get(f"/track/{cm_track_id}")).get("obj", {})
+
+    async def get_track_ids_by_isrc(self, isrc):
+        return (await self._get(f"/track/isrc/{isrc}/get-ids")).get("obj", [])
+
+    async def get_album(self, cm_album_id):
+        return (await self._get(f"/album/{cm_album_id}")).get("obj", {})
@@ -7,12 +7,18 @@ sales, airplay, and Billboard chart data across 63 territories.
 Known issues:
   - search size param must be >= 10 or results silently return empty
   - Data endpoints may return HTTP 500 during service outages
+
+AsyncLuminateClient mirrors the ISRC lookups for the async server path.
 """
 
+import asyncio
+import time
 from datetime import datetime, timedelta
 
+import httpx
 import requests
 
+from scripts import metrics, tracing
 from scripts.config import cfg
 
 
@@ -31,11 +37,19 @@ class LuminateClient:
         }
 
     def _get(self, path, params=None):
-        resp = requests.get(
-            f"{self.base}{path}",
-            headers=self._headers(),
-            params=params or {},
-        )
+        tracing.record_call("lum", path)
+        headers = self._headers()
+        t0 = time.perf_counter()
+        try:
+            resp = cfg.http.get(
+                f"{self.base}{path}",
+                headers=headers,
+                params=params or {},
+            )
+        except requests.RequestException:
+            metrics.observe_upstream("lum", path, "error", time.perf_counter() - t0)
+            raise
+        metrics.observe_upstream("lum", path, resp.status_code, time.perf_counter() - t0)
         resp.raise_for_status()
         return resp.json()
 
@@ -128,3 +142,86 @@ class LuminateClient:
             if "stream" in name:
                 return m.get("value")
         return None
+
+
+class AsyncLuminateClient:
+    """asyncio variant of LuminateClient (search and ISRC consumption lookups)."""
+
+    _default_dates = staticmethod(LuminateClient._default_dates)
+    extract_stream_count = staticmethod(LuminateClient.extract_stream_count)
+
+    def __init__(self):
+        self.base = cfg.LUM_BASE
+
+    async def _headers(self):
+        token = await asyncio.to_thread(cfg.lum_token)
+        return {
+            "Authorization": f"Bearer {token}",
+            "x-api-key": cfg.LUM_API_KEY,
+            "Accept": "application/vnd.luminate-data.svc-apibff.v1+json",
+        }
+
+    async def _get(self, path, params=None):
+        tracing.record_call("lum", path)
+        headers = await self._headers()
+        t0 = time.perf_counter()
+        try:
+            resp = await cfg.ahttp.get(
+                f"{self.base}{path}",
+                headers=headers,
+                params=params or {},
+            )
+        except httpx.TransportError:
+            metrics.observe_upstream("lum", path, "error", time.perf_counter() - t0)
+            raise
+        metrics.observe_upstream("lum", path, resp.status_code, time.perf_counter() - t0)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def search(self, query, entity_type="artist", size=10):
+        """Search Luminate. size must be >= 10."""
+        data = await self._get("/search", {
+            "query": query,
+            "entity_type": entity_type,
+            "size": max(size, 10),
+        })
+        return data.get("results", [])
+
+    async def get_song_by_isrc(self, isrc, location="US",
+                               start_date=None, end_date=None):
+        start_date, end_date = self._default_dates(start_date, end_date)
+        return await self._get(f"/songs/{isrc}", {
+            "id_type": "isrc", "metrics": "all",
+            "location": location,
+            "start_date": start_date, "end_date": end_date,
+            "metadata_level": "max",
+        })
+
+    async def get_recording_by_isrc(self, isrc, location="US",
+                                    start_date=None, end_date=None):
+        start_date, end_date = self._default_dates(start_date, end_date)
+        return await self._get(f"/musical_recordings/{isrc}", {
+            "id_type": "isrc", "metrics": "all",
+            "location": location,
+            "start_date": start_date, "end_date": end_date,
+            "metadata_level": "max",
+        })
+
+    async def get_consumption_by_isrc(self, isrc, location="US",
+                                      start_date=None, end_date=None):
+        """Try /songs/ then /musical_recordings/. Returns None if both fail."""
+        try:
+            data = await self.get_song_by_isrc(isrc, location, start_date, end_date)
+            if data.get("title"):
+                return data
+        except httpx.HTTPStatusError:
+            pass
+        try:
+            data = await self.get_recording_by_isrc(
+                isrc, location, start_date, end_date
+            )
+            if data.get("title"):
+                return data
+        except httpx.HTTPStatusError:
+            pass
+        return None
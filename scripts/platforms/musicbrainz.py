@@ -4,10 +4,16 @@ import time
 
 import musicbrainzngs
 
+from scripts.config import cfg
+
 musicbrainzngs.set_useragent("RemixRadar", "0.1", "hello@remixradar.com")
+if cfg.MB_HOST:
+    # Self-hosted mirror or the local fake services: no public 1 req/s quota.
+    musicbrainzngs.set_hostname(cfg.MB_HOST, use_https=False)
+    musicbrainzngs.set_rate_limit(False)
 
 _WRITER_TYPES = {"composer", "lyricist", "writer"}
-_MB_RATE_DELAY = 1.1  # seconds — MusicBrainz allows 1 req/sec for anonymous clients
+_MB_RATE_DELAY = cfg.MB_RATE_DELAY  # seconds — MusicBrainz allows 1 req/sec for anonymous clients
 
 
 def get_work_parties(artist_name: str, song_title: str) -> list[dict]:
@@ -16,15 +16,22 @@ Usage:
     track = sc.resolve("https://soundcloud.com/artist/track")
     metrics = sc.compute_metrics(track)
     remixes = sc.search_remixes("Blinding Lights", artist="The Weeknd")
+
+    # Async variant (same methods, awaitable) for the FastAPI server:
+    sc = AsyncSoundCloudClient()
+    track = await sc.resolve("https://soundcloud.com/artist/track")
 """
 
+import asyncio
 import json
 import logging
 import time
 from datetime import datetime
 
+import httpx
 import requests
 
+from scripts import metrics, tracing
 from scripts.config import cfg
 
 logger = logging.getLogger(__name__)
@@ -47,24 +54,28 @@ class SoundCloudClient:
         """
         params = params or {}
         params["client_id"] = self.client_id
+        tracing.record_call("sc", path)
         logger.debug("SC →  %s", path)
-        t0 = time.perf_counter()
+        t0 = t_request = time.perf_counter()
         try:
-            resp = requests.get(
+            resp = cfg.http.get(
                 f"{self.base}{path}",
                 params=params,
                 headers=self.headers,
                 timeout=20,
             )
         except (requests.exceptions.SSLError, requests.exceptions.ConnectionError) as exc:
+            metrics.observe_upstream("sc", path, "error", time.perf_counter() - t0)
             logger.warning("SC SSL/connection error on %s — retrying once: %s", path, exc)
             time.sleep(1.5)
-            resp = requests.get(
+            t_request = time.perf_counter()
+            resp = cfg.http.get(
                 f"{self.base}{path}",
                 params=params,
                 headers=self.headers,
                 timeout=20,
             )
+        metrics.observe_upstream("sc", path, resp.status_code, time.perf_counter() - t_request)
         elapsed = time.perf_counter() - t0
         logger.debug("SC ←  %s  %.2fs  HTTP %s", path, elapsed, resp.status_code)
         resp.raise_for_status()
@@ -141,22 +152,26 @@ class SoundCloudClient:
         Returns:
             List of track objects, sorted by playback_count descending.
         """
+        artist_tracks = self.search_tracks(f"{artist} {song_name} remix", limit=limit) if artist else []
+        song_tracks = self.search_tracks(f"{song_name} remix", limit=limit)
+        return self._merge_remix_results(artist_tracks, song_tracks, artist, limit)
+
+    @classmethod
+    def _merge_remix_results(cls, artist_tracks, song_tracks, artist, limit):
+        """Combine the artist-query (trusted) and song-query (filtered) result sets."""
         seen_ids: set[int] = set()
         results: list[dict] = []
 
-        if artist:
-            artist_query = f"{artist} {song_name} remix"
-            for t in self.search_tracks(artist_query, limit=limit):
-                tid = t.get("id")
-                if tid and tid not in seen_ids:
-                    seen_ids.add(tid)
-                    results.append(t)
-
-        song_query = f"{song_name} remix"
-        for t in self.search_tracks(song_query, limit=limit):
+        for t in artist_tracks:
+            tid = t.get("id")
+            if tid and tid not in seen_ids:
+                seen_ids.add(tid)
+                results.append(t)
+
+        for t in song_tracks:
             tid = t.get("id")
             if tid and tid not in seen_ids:
-                if artist and not self._mentions_artist(t, artist):
+                if artist and not cls._mentions_artist(t, artist):
                     continue
                 seen_ids.add(tid)
                 results.append(t)
@@ -298,3 +313,68 @@ class SoundCloudClient:
         """
         meta = track.get("publisher_metadata") or {}
         return meta.get("isrc")
+
+
+class AsyncSoundCloudClient:
+    """
+    asyncio variant of SoundCloudClient for the FastAPI server.
+
+    Covers the endpoints the search workflows use; the pure helpers
+    (compute_metrics, extract_isrc) are shared with the sync client.
+    """
+
+    compute_metrics = staticmethod(SoundCloudClient.compute_metrics)
+    extract_isrc = staticmethod(SoundCloudClient.extract_isrc)
+    _mentions_artist = staticmethod(SoundCloudClient._mentions_artist)
+
+    def __init__(self):
+        self.base = cfg.SC_BASE
+        self.client_id = cfg.SC_CLIENT_ID
+        self.headers = cfg.SC_HEADERS
+
+    async def _get(self, path, params=None):
+        """Async GET with client_id; retries once on transport errors."""
+        params = dict(params or {})
+        params["client_id"] = self.client_id
+        tracing.record_call("sc", path)
+        logger.debug("SC →  %s", path)
+        t0 = t_request = time.perf_counter()
+        try:
+            resp = await cfg.ahttp.get(f"{self.base}{path}", params=params, headers=self.headers, timeout=20)
+        except httpx.TransportError as exc:
+            metrics.observe_upstream("sc", path, "error", time.perf_counter() - t0)
+            logger.warning("SC SSL/connection error on %s — retrying once: %s", path, exc)
+            await asyncio.sleep(1.5)
+            t_request = time.perf_counter()
+            resp = await cfg.ahttp.get(f"{self.base}{path}", params=params, headers=self.headers, timeout=20)
+        metrics.observe_upstream("sc", path, resp.status_code, time.perf_counter() - t_request)
+        logger.debug("SC ←  %s  %.2fs  HTTP %s", path, time.perf_counter() - t0, resp.status_code)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def resolve(self, url):
+        return await self._get("/resolve", {"url": url})
+
+    async def get_track(self, track_id):
+        return await self._get(f"/tracks/{track_id}")
+
+    async def search_tracks(self, query, limit=50, genre=None, created_after=None):
+        params = {"q": query, "limit": limit}
+        if genre:
+            params["genres"] = genre
+        if created_after:
+            params["created_at[from]"] = created_after
+        data = await self._get("/search/tracks", params)
+        return data.get("collection", [])
+
+    async def search_remixes(self, song_name, artist=None, limit=50):
+        """Same two-query strategy as SoundCloudClient.search_remixes, issued concurrently."""
+        song_query = self.search_tracks(f"{song_name} remix", limit=limit)
+        if artist:
+            artist_tracks, song_tracks = await asyncio.gather(
+                self.search_tracks(f"{artist} {song_name} remix", limit=limit),
+                song_query,
+            )
+        else:
+            artist_tracks, song_tracks = [], await song_query
+        return SoundCloudClient._merge_remix_results(artist_tracks, song_tracks, artist, limit)
@@ -0,0 +1,103 @@
+"""
+Process-wide token-bucket rate limiting for upstream APIs.
+
+The bucket refills at `rate` tokens per second up to `capacity`. Each
+request takes one token; when the bucket is empty the caller waits only
+as long as it takes for the next token to accrue, so time spent on the
+network already counts toward the budget and idle periods allow short
+bursts.
+
+reserve() never blocks — it books a token and returns how long the
+caller must wait before using it. That lets threaded and asyncio callers
+share one bucket:
+
+    time.sleep(bucket.reserve())          # threads
+    await asyncio.sleep(bucket.reserve()) # coroutines
+
+try_acquire() is the server-side form: it takes a token only if one is
+available now, so an over-quota request can be rejected with a 429.
+
+Usage:
+    from scripts.ratelimit import TokenBucket
+
+    bucket = TokenBucket(rate=4.0, capacity=4)
+    bucket.acquire()  # blocks until a token is available
+"""
+
+import math
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller in the process."""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._wait_total = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self):
+        """Book one token and return the seconds to wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            self._acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative balance = callers queued ahead of us.
+            delay = -self._tokens / self.rate
+            self._throttled += 1
+            self._wait_total += delay
+            return delay
+
+    def acquire(self):
+        """Block the calling thread until a token is available. Returns seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def try_acquire(self):
+        """Take a token only if one is available right now; never books ahead."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1.0:
+                self._throttled += 1
+                return False
+            self._tokens -= 1.0
+            self._acquired += 1
+            return True
+
+    def _queue_depth(self):
+        self._refill(time.monotonic())
+        return math.ceil(-self._tokens) if self._tokens < 0 else 0
+
+    def queue_depth(self):
+        """Number of callers holding a reservation they are still waiting on."""
+        with self._lock:
+            return self._queue_depth()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "wait_seconds_total": round(self._wait_total, 3),
+                "queue_depth": self._queue_depth(),
+            }
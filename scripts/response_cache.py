@@ -0,0 +1,249 @@
+"""
+Persistent on-disk response cache for upstream GET endpoints.
+
+Responses are stored in a local SQLite file keyed by path + sorted query
+params, so they survive across clients, requests and process restarts.
+Each endpoint family has its own freshness window and an extra
+stale-while-revalidate window: inside the stale window the cached body is
+returned immediately and a background refresh is scheduled.
+
+Usage:
+    from scripts.response_cache import ResponseCache
+
+    cache = ResponseCache("/tmp/cm.sqlite3", [
+        ("album", r"^/album/\\d+$", 7 * 86400, 86400),
+    ])
+    data = cache.get_or_fetch("/album/123", None, lambda: fetch("/album/123"))
+    cache.stats()
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from scripts import tracing
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class ResponseCache:
+    """
+    SQLite-backed TTL cache with stale-while-revalidate.
+
+    Args:
+        path:     SQLite file path (created on first use).
+        policies: Iterable of (family, path_regex, ttl_seconds, stale_seconds).
+                  The first matching regex wins; paths with no match are
+                  never cached.
+        revalidate_workers: Threads used for background refreshes.
+    """
+
+    def __init__(self, path, policies, revalidate_workers=2):
+        self.path = path
+        self._policies = [
+            (family, re.compile(pattern), float(ttl), float(stale))
+            for family, pattern, ttl, stale in policies
+        ]
+        self._revalidate_workers = revalidate_workers
+        self._conn = None
+        self._lock = threading.Lock()
+        self._executor = None
+        self._revalidating: set[str] = set()
+        self._counts: dict[str, Counter] = {}
+
+    # ── Storage ────────────────────────────────────────────────────
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            max_age = max((ttl + stale for _, _, ttl, stale in self._policies), default=0)
+            conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(path, params=None):
+        if not params:
+            return path
+        return f"{path}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+    def policy_for(self, path):
+        """Return (family, ttl, stale) for a path, or None if it is not cacheable."""
+        for family, regex, ttl, stale in self._policies:
+            if regex.match(path):
+                return family, ttl, stale
+        return None
+
+    def lookup(self, path, params=None):
+        """
+        Look up a cached response without fetching.
+
+        Returns:
+            (state, value) where state is FRESH, STALE or MISS.
+            Returns (None, None) for paths that are not cacheable.
+        """
+        policy = self.policy_for(path)
+        if policy is None:
+            return None, None
+        family, ttl, stale = policy
+        key = self.make_key(path, params)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            counts = self._counts.setdefault(family, Counter())
+            if row is None:
+                counts["misses"] += 1
+                return MISS, None
+            age = time.time() - row[1]
+            if age <= ttl:
+                counts["hits"] += 1
+                tracing.record_cache_hit("response_cache")
+                return FRESH, json.loads(row[0])
+            if age <= ttl + stale:
+                counts["stale_hits"] += 1
+                tracing.record_cache_hit("response_cache")
+                return STALE, json.loads(row[0])
+            counts["misses"] += 1
+            counts["expired"] += 1
+            return MISS, None
+
+    def store(self, path, params, value):
+        policy = self.policy_for(path)
+        if policy is None:
+            return
+        key = self.make_key(path, params)
+        body = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, stored_at) VALUES (?, ?, ?)",
+                (key, body, time.time()),
+            )
+            conn.commit()
+            self._counts.setdefault(policy[0], Counter())["stores"] += 1
+
+    # ── Read-through ───────────────────────────────────────────────
+
+    def get_or_fetch(self, path, params, fetch):
+        """
+        Return a cached response or call `fetch()` and store its result.
+
+        Stale entries are returned immediately while `fetch()` runs in the
+        background to refresh them. Uncacheable paths call `fetch()` directly.
+        """
+        state, value = self.lookup(path, params)
+        if state is None:
+            return fetch()
+        if state == FRESH:
+            return value
+        if state == STALE:
+            self.revalidate(path, params, fetch)
+            return value
+        value = fetch()
+        self.store(path, params, value)
+        return value
+
+    def claim_revalidation(self, path, params=None):
+        """Mark a key as being refreshed. Returns False if a refresh is already in flight."""
+        key = self.make_key(path, params)
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def finish_revalidation(self, path, params, value=None, error=None):
+        """Record the outcome of a refresh started with claim_revalidation()."""
+        key = self.make_key(path, params)
+        family = (self.policy_for(path) or ("uncached",))[0]
+        if error is None:
+            self.store(path, params, value)
+        with self._lock:
+            self._revalidating.discard(key)
+            counts = self._counts.setdefault(family, Counter())
+            counts["revalidations"] += 1
+            if error is not None:
+                counts["revalidation_errors"] += 1
+        if error is not None:
+            logger.warning("cache revalidation failed for %s: %s", key, error)
+
+    def revalidate(self, path, params, fetch):
+        """Refresh one entry on the background pool (deduplicated per key)."""
+        if not self.claim_revalidation(path, params):
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._revalidate_workers,
+                    thread_name_prefix="cache-revalidate",
+                )
+            executor = self._executor
+
+        def _run():
+            try:
+                value = fetch()
+            except Exception as exc:
+                self.finish_revalidation(path, params, error=exc)
+            else:
+                self.finish_revalidation(path, params, value=value)
+
+        executor.submit(_run)
+
+    # ── Introspection ──────────────────────────────────────────────
+
+    def stats(self):
+        """Hit/miss counters per endpoint family plus overall hit rate."""
+        with self._lock:
+            families = {name: dict(c) for name, c in self._counts.items()}
+        total = Counter()
+        for c in families.values():
+            total.update(c)
+        lookups = total["hits"] + total["stale_hits"] + total["misses"]
+        served = total["hits"] + total["stale_hits"]
+        return {
+            "path": self.path,
+            "families": families,
+            "hits": total["hits"],
+            "stale_hits": total["stale_hits"],
+            "misses": total["misses"],
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            conn = self._db()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,501 @@
+"""
+Vectorised batch versions of the models.py opportunity-score functions.
+
+Takes one NumPy column per input signal and scores every row at once,
+for re-ranking large sets of cached reports (e.g. after a weight change)
+without a Python call per track. Results match the scalar functions in
+models.py exactly — same operation order, same clamps — which
+scripts/test_scoring.py checks.
+
+log10 is the one step not done by a NumPy ufunc: np.log10 differs from
+math.log10 in the last ulp for roughly 1.5% of inputs, so it is applied
+element-wise with math.log10 to keep results bit-identical.
+
+Rounding to cents is the same kind of exception: np.round(x, 2) picks
+the other side of a near-tie from Python's round() for about 10% of
+revenue values, so _round_cents() re-rounds those few with round().
+
+rescore() is the entry point for re-ranking stored results: it takes the
+scoring_inputs() dicts saved on each report plus a partial weight profile
+(see resolve_profile) and recomputes scores, labels and revenue without
+any network calls.
+
+Usage:
+    from scripts.scoring import project_revenue_batch, report_columns, rescore, score_batch
+
+    cols = report_columns(reports)
+    scores = score_batch(**cols)
+    scores["overall"], scores["label_code"]  # -> float64 / int8 arrays
+
+    rev = project_revenue_batch(plays)
+    rev.streams, rev.revenue, rev.clears    # -> (n, tiers) / (n, tiers, platforms) / (n,)
+    rev.projections(i), rev.viability(i)    # -> project_revenue / assess_viability dicts
+
+    scores, rev = rescore(inputs, {"weights": {"overall": {"demand": 0.4, "revenue": 0.4}}})
+"""
+
+import math
+
+import numpy as np
+
+from scripts.config import cfg
+from scripts.models import (
+    _MOMENTUM_CATEGORY_SCORES,
+    _NOT_VIABLE_RECOMMENDATION,
+    _STAGE_RANKS,
+    _VIABLE_RECOMMENDATION,
+    LABEL_THRESHOLDS,
+    SCORE_WEIGHTS,
+    scoring_inputs,
+)
+
+# Label codes returned by opportunity_scores(); LABELS[code] is the string label.
+LABELS = ("WEAK", "MARGINAL", "MODERATE", "STRONG")
+
+# Momentum category codes, in _MOMENTUM_CATEGORY_SCORES order plus "unknown".
+MOMENTUM_LABELS = tuple(_MOMENTUM_CATEGORY_SCORES)
+MOMENTUM_UNKNOWN = len(MOMENTUM_LABELS)
+_MOMENTUM_SCORE_BY_CODE = np.array([*_MOMENTUM_CATEGORY_SCORES.values(), 45.0], dtype=np.float64)
+# Codes whose label triggers the mid-level stagnation penalty in compute_momentum_score.
+_PENALTY_MOMENTUM_CODES = np.array(
+    [MOMENTUM_LABELS.index(m) for m in ("steady", "decline", "gradual decline")], dtype=np.int8
+)
+_MID_LEVEL = _STAGE_RANKS["mid-level"]
+
+
+def _col(values):
+    """Float64 column with None/NaN treated as 0 (the scalar `value or 0` rule)."""
+    arr = np.asarray(values, dtype=np.float64)
+    return np.nan_to_num(arr, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+
+def _clamp(values, low=0.0, high=100.0):
+    return np.maximum(low, np.minimum(high, values))
+
+
+def _log10(values):
+    return np.fromiter(map(math.log10, values.tolist()), dtype=np.float64, count=values.size)
+
+
+def _round_cents(values):
+    """round(x, 2) per element, bit-identical to Python's round()."""
+    rounded = np.round(values, 2)
+    scaled = values * 100.0
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = np.flatnonzero(frac <= 1e-9 * np.maximum(1.0, np.abs(scaled)))
+    if near_tie.size:
+        rounded[near_tie] = [round(x, 2) for x in values[near_tie].tolist()]
+    return rounded
+
+
+def log_scores(values, floor_value=1_000, cap_value=100_000_000):
+    """Batch _log_score."""
+    v = np.maximum(_col(values), 0.0)
+    positive = v > 0
+    v = np.minimum(v, float(cap_value))
+    den = math.log10(cap_value) - math.log10(floor_value)
+    if den <= 0:
+        return np.zeros_like(v)
+    num = _log10(np.maximum(v, floor_value)) - math.log10(floor_value)
+    return np.where(positive, _clamp((num / den) * 100.0), 0.0)
+
+
+def revenue_scores(mid_revenue, floor_value=500.0, cap_value=500_000.0):
+    """Batch _revenue_score."""
+    return log_scores(mid_revenue, floor_value=floor_value, cap_value=cap_value)
+
+
+def ratio_scores(values):
+    """Batch _ratio_score."""
+    v = _col(values)
+    scaled = _clamp((v / 0.20) * 100.0)
+    return np.where(v <= 0, 0.0, np.where(v >= 0.20, 100.0, scaled))
+
+
+def engagement_scores(engagement_rate):
+    """Batch _engagement_score."""
+    return _clamp((_col(engagement_rate) / 0.03) * 100.0)
+
+
+def stage_codes(stages):
+    """Career stage strings -> _stage_rank codes (unknown -> 0)."""
+    return np.fromiter(
+        (_STAGE_RANKS.get((s or "").strip().lower(), 0) for s in stages), dtype=np.int8
+    )
+
+
+def momentum_codes(labels):
+    """Career momentum strings -> MOMENTUM_LABELS index (unknown -> MOMENTUM_UNKNOWN)."""
+    lookup = {label: code for code, label in enumerate(MOMENTUM_LABELS)}
+    return np.fromiter(
+        (lookup.get((m or "").strip().lower(), MOMENTUM_UNKNOWN) for m in labels), dtype=np.int8
+    )
+
+
+def demand_scores(plays, likes, comments, reposts, engagement_rate, daily_velocity, weights=None):
+    """Batch compute_demand_score; `weights` overrides SCORE_WEIGHTS["demand"]."""
+    w = weights or SCORE_WEIGHTS["demand"]
+    plays = _col(plays)
+    comments = _col(comments)
+    reposts = _col(reposts)
+
+    plays_score = log_scores(plays, floor_value=1_000, cap_value=10_000_000)
+    likes_score = log_scores(likes, floor_value=100, cap_value=1_000_000)
+    engagement_score = engagement_scores(engagement_rate)
+    velocity_score = log_scores(daily_velocity, floor_value=100, cap_value=20_000)
+
+    bonus = np.where(plays >= 5_000_000, 10.0, np.where(plays >= 1_000_000, 5.0, 0.0))
+    bonus = bonus + np.where(comments > 100, 3.0, 0.0) + np.where(reposts > 50, 3.0, 0.0)
+
+    score = (
+        (plays_score * w["plays"])
+        + (likes_score * w["likes"])
+        + (engagement_score * w["engagement"])
+        + (velocity_score * w["velocity"])
+        + bonus
+    )
+    return _clamp(score)
+
+
+def conversion_scores(original_listeners, remix_listeners, remix_loyalty_ratio, geo_divergence, remix_tiktok, weights=None):
+    """Batch compute_conversion_score; `geo_divergence` is compute_geo_divergence() per row (0-1)."""
+    w = weights or SCORE_WEIGHTS["conversion"]
+    original_listeners_score = log_scores(original_listeners, floor_value=10_000, cap_value=100_000_000)
+    remix_listeners_score = log_scores(remix_listeners, floor_value=1_000, cap_value=20_000_000)
+    loyalty_score = ratio_scores(remix_loyalty_ratio)
+    geo_divergence_score = _col(geo_divergence) * 100.0
+    tiktok_score = log_scores(remix_tiktok, floor_value=1_000, cap_value=10_000_000)
+
+    score = (
+        (original_listeners_score * w["original_listeners"])
+        + (remix_listeners_score * w["remix_listeners"])
+        + (loyalty_score * w["loyalty"])
+        + (geo_divergence_score * w["geo_divergence"])
+        + (tiktok_score * w["tiktok"])
+    )
+    return _clamp(score)
+
+
+def momentum_scores(original_stage, remix_stage, remix_momentum, remix_momentum_score, weights=None):
+    """
+    Batch compute_momentum_score.
+
+    Args:
+        original_stage / remix_stage: stage_codes() arrays.
+        remix_momentum:               momentum_codes() array.
+        remix_momentum_score:         Chartmetric momentum_score (None/0 -> 50).
+        weights:                      Overrides SCORE_WEIGHTS["momentum"].
+    """
+    w = weights or SCORE_WEIGHTS["momentum"]
+    original_stage = np.asarray(original_stage, dtype=np.int8)
+    remix_stage = np.asarray(remix_stage, dtype=np.int8)
+    remix_momentum = np.asarray(remix_momentum, dtype=np.int8)
+
+    raw = _col(remix_momentum_score)
+    raw = np.where(raw == 0, 50.0, raw)
+    remix_momentum_value = (_MOMENTUM_SCORE_BY_CODE[remix_momentum] * 0.6) + (raw * 0.4)
+
+    gap = original_stage.astype(np.int16) - remix_stage
+    stage_bonus = np.where(gap >= 3, 20.0, np.where(gap == 2, 12.0, np.where(gap == 1, 6.0, 0.0)))
+
+    orig_stage_score = original_stage / 5.0 * 100.0
+
+    penalty = np.where(
+        (remix_stage == _MID_LEVEL) & np.isin(remix_momentum, _PENALTY_MOMENTUM_CODES), 15.0, 0.0
+    )
+
+    base = _clamp(remix_momentum_value + stage_bonus - penalty)
+    return _clamp(base * w["remix_momentum"] + orig_stage_score * w["original_stage"])
+
+
+def opportunity_scores(demand, conversion, momentum, revenue_score, weights=None, label_thresholds=None):
+    """
+    Batch compute_opportunity_score.
+
+    `weights` / `label_thresholds` override SCORE_WEIGHTS["overall"] / LABEL_THRESHOLDS.
+
+    Returns:
+        (overall, label_code) — unrounded overall and LABELS index per row.
+    """
+    w = weights or SCORE_WEIGHTS["overall"]
+    thresholds = label_thresholds or LABEL_THRESHOLDS
+    overall = _clamp(
+        (_col(demand) * w["demand"])
+        + (_col(revenue_score) * w["revenue"])
+        + (_col(conversion) * w["conversion"])
+        + (_col(momentum) * w["momentum"])
+    )
+    label_code = np.select(
+        [overall >= threshold for threshold in thresholds.values()],
+        [LABELS.index(label) for label in thresholds],
+        default=0,
+    ).astype(np.int8)
+    return overall, label_code
+
+
+def score_batch(
+    plays, likes, comments, reposts, engagement_rate, daily_velocity,
+    original_listeners, remix_listeners, remix_loyalty_ratio, geo_divergence, remix_tiktok,
+    original_stage, remix_stage, remix_momentum, remix_momentum_score,
+    mid_revenue, weights=None, label_thresholds=None,
+):
+    """
+    Batch build_opportunity_score over column arrays (see report_columns()).
+
+    `weights` is a SCORE_WEIGHTS-shaped dict; `label_thresholds` a
+    LABEL_THRESHOLDS-shaped one. Both default to the models.py values.
+
+    Returns:
+        Dict of arrays: demand, conversion, momentum, revenue, overall
+        (unrounded float64) and label_code (int8 index into LABELS).
+    """
+    weights = weights or SCORE_WEIGHTS
+    demand = demand_scores(
+        plays, likes, comments, reposts, engagement_rate, daily_velocity, weights=weights["demand"]
+    )
+    conversion = conversion_scores(
+        original_listeners, remix_listeners, remix_loyalty_ratio, geo_divergence, remix_tiktok,
+        weights=weights["conversion"],
+    )
+    momentum = momentum_scores(
+        original_stage, remix_stage, remix_momentum, remix_momentum_score, weights=weights["momentum"]
+    )
+    revenue = revenue_scores(mid_revenue)
+    overall, label_code = opportunity_scores(
+        demand, conversion, momentum, revenue, weights=weights["overall"], label_thresholds=label_thresholds
+    )
+    return {
+        "demand": demand,
+        "conversion": conversion,
+        "momentum": momentum,
+        "revenue": revenue,
+        "overall": overall,
+        "label_code": label_code,
+    }
+
+
+_NUMERIC_INPUTS = (
+    "plays", "likes", "comments", "reposts", "engagement_rate", "daily_velocity",
+    "original_listeners", "remix_listeners", "remix_loyalty_ratio", "geo_divergence", "remix_tiktok",
+    "remix_momentum_score",
+)
+
+
+def input_columns(inputs):
+    """score_batch() keyword columns (all but mid_revenue) from models.scoring_inputs() dicts."""
+    inputs = list(inputs)
+    out = {
+        name: np.fromiter((row.get(name) or 0 for row in inputs), dtype=np.float64, count=len(inputs))
+        for name in _NUMERIC_INPUTS
+    }
+    out["original_stage"] = stage_codes(row.get("original_stage") for row in inputs)
+    out["remix_stage"] = stage_codes(row.get("remix_stage") for row in inputs)
+    out["remix_momentum"] = momentum_codes(row.get("remix_momentum") for row in inputs)
+    return out
+
+
+def validate_inputs(inputs):
+    """
+    Raise ValueError unless every row is shaped like a models.scoring_inputs() dict.
+
+    Stored inputs arrive from API clients, so a missing value may be None
+    (scored as 0) but numbers must be numbers and stages/momentum strings.
+    """
+    for i, row in enumerate(inputs):
+        if not isinstance(row, dict):
+            raise ValueError(f"scoring_inputs[{i}] must be an object")
+        for name in _NUMERIC_INPUTS:
+            value = row.get(name)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise ValueError(f"scoring_inputs[{i}].{name} must be a number")
+        for name in ("original_stage", "remix_stage", "remix_momentum"):
+            value = row.get(name)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"scoring_inputs[{i}].{name} must be a string")
+
+
+def report_columns(reports):
+    """Extract score_batch() keyword columns from pipeline report dicts."""
+    out = input_columns(
+        scoring_inputs(report.get("sc_metrics") or {}, report.get("original_artist"), report.get("remix_artist"))
+        for report in reports
+    )
+    out["mid_revenue"] = np.fromiter(
+        (
+            ((((report.get("revenue") or {}).get("projections") or {}).get("mid") or {}).get("revenue") or {})
+            .get("all_dsps_avg", 0.0) or 0
+            for report in reports
+        ),
+        dtype=np.float64,
+        count=len(reports),
+    )
+    return out
+
+
+class RevenueBatch:
+    """
+    project_revenue + assess_viability for many tracks at once.
+
+    Attributes:
+        tiers / platforms: axis labels (cfg.PROJECTION_TIERS / cfg.STREAM_RATES order).
+        streams:           (n, tiers) int64 estimated DSP streams.
+        revenue:           (n, tiers, platforms) float64 revenue, not rounded to cents.
+        mid_revenue:       (n,) mid-tier all_dsps_avg revenue, rounded to cents.
+        clears:            (n,) bool — mid_revenue >= threshold.
+
+    The dict shapes the per-track code uses are built only on request by
+    projections(i) and viability(i).
+    """
+
+    def __init__(self, plays, tiers=None, rates=None, threshold=None):
+        tiers = cfg.PROJECTION_TIERS if tiers is None else tiers
+        rates = cfg.STREAM_RATES if rates is None else rates
+        self.tiers = tuple(tiers)
+        self.platforms = tuple(rates)
+        self.threshold = cfg.VIABILITY_THRESHOLD if threshold is None else threshold
+
+        multipliers = np.array(list(tiers.values()), dtype=np.float64)
+        rate_row = np.array(list(rates.values()), dtype=np.float64)
+        streams = np.trunc(_col(plays)[:, None] * multipliers[None, :])
+        self.streams = streams.astype(np.int64)
+        self.revenue = streams[:, :, None] * rate_row[None, None, :]
+
+        if "mid" in self.tiers and "all_dsps_avg" in self.platforms:
+            mid = self.revenue[:, self.tiers.index("mid"), self.platforms.index("all_dsps_avg")]
+            self.mid_revenue = _round_cents(mid)
+            self.clears = self.mid_revenue >= self.threshold
+        else:
+            self.mid_revenue = None
+            self.clears = None
+
+    def __len__(self):
+        return len(self.streams)
+
+    def projections(self, i):
+        """project_revenue()-shaped dict for row `i`."""
+        streams = self.streams[i].tolist()
+        revenue = self.revenue[i].tolist()
+        return {
+            tier: {
+                "estimated_streams": streams[t],
+                "revenue": {
+                    platform: round(revenue[t][p], 2)
+                    for p, platform in enumerate(self.platforms)
+                },
+            }
+            for t, tier in enumerate(self.tiers)
+        }
+
+    def viability(self, i):
+        """assess_viability()-shaped dict for row `i`."""
+        clears = bool(self.clears[i])
+        return {
+            "clears_threshold": clears,
+            "mid_revenue": float(self.mid_revenue[i]),
+            "threshold": self.threshold,
+            "recommendation": _VIABLE_RECOMMENDATION if clears else _NOT_VIABLE_RECOMMENDATION,
+        }
+
+
+def project_revenue_batch(plays, tiers=None, rates=None, threshold=None):
+    """Batch project_revenue/assess_viability over a play-count column; see RevenueBatch."""
+    return RevenueBatch(plays, tiers=tiers, rates=rates, threshold=threshold)
+
+
+_PROFILE_KEYS = ("weights", "label_thresholds", "viability_threshold", "projection_tiers", "stream_rates")
+
+
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f"{name} must be a non-negative number")
+    return float(value)
+
+
+def _merge_numbers(defaults, overrides, name):
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{name} must be an object")
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        if key not in merged:
+            raise ValueError(f"Unknown {name} key: {key}")
+        merged[key] = _number(value, f"{name}.{key}")
+    return merged
+
+
+def resolve_profile(profile=None):
+    """
+    Merge a partial re-scoring profile over the current defaults.
+
+    Accepted keys (all optional):
+        weights:             {group: {name: weight}} over models.SCORE_WEIGHTS.
+        label_thresholds:    {"STRONG"|"MODERATE"|"MARGINAL": min overall} over LABEL_THRESHOLDS.
+        viability_threshold: USD, over cfg.VIABILITY_THRESHOLD.
+        projection_tiers:    {tier: multiplier} over cfg.PROJECTION_TIERS.
+        stream_rates:        {platform: USD per stream} over cfg.STREAM_RATES.
+
+    Raises ValueError on unknown keys or negative / non-numeric values.
+    """
+    profile = profile or {}
+    unknown = sorted(set(profile) - set(_PROFILE_KEYS))
+    if unknown:
+        raise ValueError(f"Unknown profile keys: {', '.join(unknown)}")
+
+    weight_overrides = profile.get("weights") or {}
+    if not isinstance(weight_overrides, dict):
+        raise ValueError("weights must be an object")
+    for group in weight_overrides:
+        if group not in SCORE_WEIGHTS:
+            raise ValueError(f"Unknown weight group: {group}")
+    weights = {
+        group: _merge_numbers(defaults, weight_overrides.get(group) or {}, f"weights.{group}")
+        for group, defaults in SCORE_WEIGHTS.items()
+    }
+
+    viability_threshold = profile.get("viability_threshold")
+    return {
+        "weights": weights,
+        "label_thresholds": _merge_numbers(
+            LABEL_THRESHOLDS, profile.get("label_thresholds") or {}, "label_thresholds"
+        ),
+        "viability_threshold": (
+            cfg.VIABILITY_THRESHOLD if viability_threshold is None
+            else _number(viability_threshold, "viability_threshold")
+        ),
+        "projection_tiers": _merge_numbers(
+            cfg.PROJECTION_TIERS, profile.get("projection_tiers") or {}, "projection_tiers"
+        ),
+        "stream_rates": _merge_numbers(cfg.STREAM_RATES, profile.get("stream_rates") or {}, "stream_rates"),
+    }
+
+
+def rescore(inputs, profile=None):
+    """
+    Re-score stored results under a (partial) profile without refetching.
+
+    Args:
+        inputs:  models.scoring_inputs() dicts, one per result.
+        profile: Partial profile for resolve_profile(); None = current defaults.
+
+    Returns:
+        (scores, revenue) — score_batch() arrays and the RevenueBatch the
+        revenue scores were derived from (projections/viability per row).
+
+    Raises ValueError for an invalid profile or malformed inputs (see validate_inputs).
+    """
+    profile = resolve_profile(profile)
+    inputs = list(inputs)
+    validate_inputs(inputs)
+    cols = input_columns(inputs)
+    revenue = project_revenue_batch(
+        cols["plays"],
+        tiers=profile["projection_tiers"],
+        rates=profile["stream_rates"],
+        threshold=profile["viability_threshold"],
+    )
+    scores = score_batch(
+        **cols,
+        mid_revenue=revenue.mid_revenue,
+        weights=profile["weights"],
+        label_thresholds=profile["label_thresholds"],
+    )
+    return scores, revenue
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+XML catalog shape check for the streaming reader.
+
+_iter_xml must keep the rule of the DOM parser it replaced: if a file
+contains any <track> element, only <track> elements are records, even
+when <item>/<record>/<entry> elements come first; files without <track>
+fall back to those shapes.
+
+Usage:
+    python scripts/test_catalog.py
+    python -m pytest scripts/test_catalog.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.catalog import stream_catalog_records  # noqa: E402
+
+
+def titles(xml):
+    with tempfile.NamedTemporaryFile("w", suffix=".xml", delete=False, encoding="utf-8") as f:
+        f.write(xml)
+    try:
+        return [record["title"] for record in stream_catalog_records(f.name)]
+    finally:
+        os.unlink(f.name)
+
+
+def test_track_wins_wherever_it_appears():
+    assert titles("<c><item><title>A</title></item><track><title>B</title></track></c>") == ["B"]
+    assert titles("<c><track><title>B</title></track><entry><title>A</title></entry></c>") == ["B"]
+
+
+def test_fallback_shapes_without_track():
+    xml = "<c xmlns='urn:x'><entry><title>A</title></entry><record><title>C</title></record></c>"
+    assert titles(xml) == ["A", "C"]
+
+
+if __name__ == "__main__":
+    test_track_wins_wherever_it_appears()
+    test_fallback_shapes_without_track()
+    print("catalog XML shapes: OK")
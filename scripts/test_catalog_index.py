@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Checks for ISRC normalisation and the catalog dedup index.
+
+Covers normalize_isrc spellings (case, hyphens, whitespace, "ISRC:"
+prefixes) and rejects, order-independent ISRC/title dedup in
+CatalogDedupIndex, _IntSet growth past its load limit, and the stats()
+counters.
+
+Usage:
+    python scripts/test_catalog_index.py
+    python -m pytest scripts/test_catalog_index.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.catalog_index import CatalogDedupIndex, _IntSet, normalize_isrc  # noqa: E402
+
+
+def test_normalize_isrc_spellings():
+    for raw in ("USRC11902726", "usrc11902726", "US-RC1-19-02726", " USRC11902726 ",
+                "US RC1 19 02726", "ISRC: US-RC1-19-02726", "us_rc1.19.02726"):
+        assert normalize_isrc(raw) == "USRC11902726", raw
+
+
+def test_normalize_isrc_rejects_invalid():
+    for raw in (None, "", "   ", "USRC1190272", "USRC119027267", "1SRC11902726", "USRC1190272X", "not an isrc"):
+        assert normalize_isrc(raw) is None, raw
+
+
+def test_isrc_and_title_dedup_is_order_independent():
+    plain = {"artist": "A", "title": "Song", "isrc": None}
+    coded = {"artist": "A", "title": "Song", "isrc": "USRC17607839"}
+    for first, second in ((plain, coded), (coded, plain)):
+        index = CatalogDedupIndex()
+        assert index.add(dict(first)) and index.add(dict(second))
+
+
+def test_duplicates_by_isrc_and_by_title():
+    index = CatalogDedupIndex()
+    assert index.add({"artist": "A", "title": "Song", "isrc": "USRC17607839"})
+    assert not index.add({"artist": "B", "title": "Other", "isrc": "us-rc1-76-07839"})
+    assert index.add({"artist": "A", "title": "Song", "isrc": "GBAHT2000651"})  # another recording
+    assert index.add({"artist": "Café", "title": "Night Drive", "isrc": None})
+    assert not index.add({"artist": "cafe", "title": "Night  Drive!", "isrc": "bogus"})
+    assert index.stats() == {
+        "rows": 5,
+        "unique": 3,
+        "duplicate_isrc": 1,
+        "duplicate_title": 1,
+        "invalid_isrc": 1,
+        "index_bytes": index._keys.nbytes,
+    }
+
+
+def test_add_normalises_isrc_in_place():
+    record = {"artist": "A", "title": "Song", "isrc": "us-rc1-76-07839"}
+    CatalogDedupIndex().add(record)
+    assert record["isrc"] == "USRC17607839"
+    record = {"artist": "A", "title": "Song", "isrc": "garbage"}
+    CatalogDedupIndex().add(record)
+    assert record["isrc"] is None
+
+
+def test_intset_grows_past_limit():
+    keys = _IntSet(capacity=4)
+    limit, nbytes = keys._limit, keys.nbytes
+    values = [(i * 7919) << 40 | i for i in range(1, limit * 5)] + [0, 2**64 - 2]
+    assert all(keys.add(v) for v in values)
+    assert len(keys) == len(values) and keys.nbytes > nbytes and keys._limit > limit
+    assert not any(keys.add(v) for v in values)
+    assert len(keys) == len(values)
+
+
+if __name__ == "__main__":
+    test_normalize_isrc_spellings()
+    test_normalize_isrc_rejects_invalid()
+    test_isrc_and_title_dedup_is_order_independent()
+    test_duplicates_by_isrc_and_by_title()
+    test_add_normalises_isrc_in_place()
+    test_intset_grows_past_limit()
+    print("catalog dedup index: OK")
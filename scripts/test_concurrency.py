@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Deadlock check for SingleFlight on the shared fan-out pool.
+
+With FANOUT_WORKERS=1, a flight leader running outside the pool can be
+waiting on fan_out() calls queued behind a pool worker that joined the
+same flight. Followers on fan-out workers must run their call inline
+rather than block. Covers that exact interleaving, then a stress run of
+many threads with overlapping keys, each step bounded by a timeout.
+
+Usage:
+    python scripts/test_concurrency.py
+    python -m pytest scripts/test_concurrency.py
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SOUNDCLOUD_CLIENT_ID", "test-client-id")  # skip the client_id auto-fetch
+
+from scripts import concurrency  # noqa: E402
+from scripts.concurrency import SingleFlight, fan_out, map_ordered  # noqa: E402
+from scripts.config import cfg  # noqa: E402
+
+TIMEOUT = 10.0
+
+
+def _with_one_worker(test):
+    """Run `test` against a fresh one-worker fan-out pool, then restore the shared one."""
+    saved_workers, saved_executor = cfg.FANOUT_WORKERS, concurrency._fanout_executor
+    cfg.FANOUT_WORKERS, concurrency._fanout_executor = 1, None
+    try:
+        test()
+    finally:
+        executor = concurrency._fanout_executor
+        cfg.FANOUT_WORKERS, concurrency._fanout_executor = saved_workers, saved_executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _run_bounded(flight, target):
+    """Run `target` on a thread; on timeout unblock waiting followers and fail."""
+    errors = []
+
+    def run():
+        try:
+            target()
+        except BaseException as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    if thread.is_alive():
+        for call in list(flight._calls.values()):
+            if not call.done():
+                call.set_exception(TimeoutError("unstuck by test"))
+        raise AssertionError("SingleFlight deadlocked the fan-out pool")
+    if errors:
+        raise errors[0]
+
+
+def test_follower_on_pool_worker_does_not_wait_for_leader():
+    flight = SingleFlight()
+    leader_started = threading.Event()
+    follower_running = threading.Event()
+    results = {}
+
+    def leader():
+        leader_started.set()
+        assert follower_running.wait(TIMEOUT)
+        # Queued on the single worker behind the follower below.
+        return [f.result() for f in fan_out(lambda: "a", lambda: "b")]
+
+    def follower():
+        follower_running.set()
+        return flight.do("key", lambda: "inline")
+
+    def scenario():
+        lead = threading.Thread(target=lambda: results.setdefault("leader", flight.do("key", leader)))
+        lead.start()
+        assert leader_started.wait(TIMEOUT)
+        results["follower"] = [f.result() for f in fan_out(follower, lambda: "other")]
+        lead.join()
+
+    _with_one_worker(lambda: _run_bounded(flight, scenario))
+    assert results == {"leader": ["a", "b"], "follower": ["inline", "other"]}
+    assert flight.shared == 0
+
+
+def test_overlapping_keys_stress():
+    flight = SingleFlight()
+    rng = random.Random(4)
+    keys = [rng.randrange(4) for _ in range(200)]
+
+    def leaf(key):
+        def call():
+            time.sleep(0.001)
+            return key * 10
+        return call
+
+    def lookup(key):
+        def work():
+            parts = fan_out(leaf(key), leaf(key))  # leaders off the pool queue work behind followers
+            return sum(part.result() for part in parts)
+        return flight.do(key, work)
+
+    def item(key):
+        # The direct lookup leads from a map_ordered thread; the fanned-out ones can
+        # join flights led elsewhere while sitting on the only pool worker.
+        futures = fan_out(lambda: lookup(key), lambda: lookup((key + 1) % 4))
+        return [lookup(key)] + [future.result() for future in futures]
+
+    results = []
+    _with_one_worker(lambda: _run_bounded(
+        flight, lambda: results.extend(map_ordered(item, keys, max_workers=16))
+    ))
+    assert results == [[key * 20, key * 20, (key + 1) % 4 * 20] for key in keys]
+
+
+if __name__ == "__main__":
+    test_follower_on_pool_worker_does_not_wait_for_leader()
+    test_overlapping_keys_stress()
+    print("single-flight on the fan-out pool: OK")
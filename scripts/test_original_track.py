@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Field precedence in find_original_isrc's result.
+
+The canonical record resolved by ISRC wins field by field over the
+verified finalist. When Chartmetric maps the ISRC to a track whose
+get_track() comes back empty, the finalist's release date, songwriters
+and labels must survive. The Chartmetric client is replaced by a small
+in-memory stand-in; no upstream service is contacted.
+
+Usage:
+    python scripts/test_original_track.py
+    python -m pytest scripts/test_original_track.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SOUNDCLOUD_CLIENT_ID", "test-client-id")  # skip the client_id auto-fetch
+
+from scripts.concurrency import SingleFlight  # noqa: E402
+from scripts.pipeline import _isrc_track_record, _original_track_record, find_original_isrc  # noqa: E402
+
+ISRC = "USRC17607839"
+FINALIST = {
+    "id": 1,
+    "name": "Night Drive",
+    "artist_names": ["Cafe"],
+    "isrc": ISRC,
+    "release_date": "2019-11-29",
+    "songwriters": ["Writer One"],
+    "album_label": "Finalist Label",
+    "album_ids": [7],
+}
+
+
+class StubChartmetric:
+    """Just enough of ChartmetricClient for find_original_isrc."""
+
+    def __init__(self, canonical_track):
+        self.canonical_track = canonical_track
+        self._track_isrc_cache = {}
+        self._inflight = SingleFlight()
+
+    def search(self, query, entity_type="artists", limit=5):
+        return [{key: FINALIST[key] for key in ("id", "name", "artist_names", "isrc")}]
+
+    def get_track(self, track_id):
+        return dict(FINALIST) if track_id == 1 else dict(self.canonical_track)
+
+    def get_track_ids_by_isrc(self, isrc):
+        return [{"chartmetric_ids": [99]}]
+
+    def get_album(self, album_id):
+        return {"label": "Album Record Label"} if album_id == 7 else {}
+
+
+def test_empty_canonical_track_keeps_finalist_fields():
+    result = find_original_isrc(StubChartmetric(canonical_track={}), "Cafe", "Night Drive")
+    assert result["cm_track_id"] == 99
+    assert result["name"] == "Night Drive" and result["artist_names"] == ["Cafe"]
+    assert result["release_date"] == "2019-11-29"
+    assert result["songwriters"] == ["Writer One"]
+    assert result["album_label"] == "Finalist Label"
+    assert result["album_record_label"] == "Album Record Label"
+
+
+def test_canonical_fields_win():
+    canonical = _isrc_track_record(99, {
+        "name": "Night Drive (Original Mix)",
+        "release_date": "2018-01-05",
+        "songwriters": ["Writer Two"],
+        "album_label": "Canonical Label",
+    }, ISRC, "Canonical Record Label")
+    result = _original_track_record(FINALIST, FINALIST, canonical, ISRC, "Canonical Record Label", 0.9)
+    assert result["name"] == "Night Drive (Original Mix)"
+    assert result["release_date"] == "2018-01-05"
+    assert result["songwriters"] == ["Writer Two"]
+    assert result["album_label"] == "Canonical Label"
+    assert result["artist_names"] == ["Cafe"]  # canonical had none
+
+
+if __name__ == "__main__":
+    test_empty_canonical_track_keeps_finalist_fields()
+    test_canonical_fields_win()
+    print("original track field precedence: OK")
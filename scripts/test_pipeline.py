@@ -25,6 +25,10 @@ Usage:
     # Run with a custom SoundCloud URL:
     python scripts/test_pipeline.py "https://soundcloud.com/artist/track-name"
 
+    # Run offline: start the fake services in another shell, then paste
+    # the `export SC_BASE=...` lines they print into this one.
+    python -m scripts.fakes
+
 Prerequisites:
     pip install -r requirements.txt
     .env file in project root with API credentials (see HANDOVER.md)
@@ -51,8 +55,8 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 # SoundCloud uses an unofficial public client_id extracted from their web app.
 # This is NOT an official OAuth credential — it could break at any time.
 # If the hackathon provides official SoundCloud creds, replace this.
-SC_CLIENT_ID = "b73paRnaV82c1ypnjCCsgrFwg47vYs8a"
-SC_BASE = "https://api-v2.soundcloud.com"
+SC_CLIENT_ID = os.getenv("SOUNDCLOUD_CLIENT_ID", "b73paRnaV82c1ypnjCCsgrFwg47vYs8a")
+SC_BASE = os.getenv("SC_BASE", "https://api-v2.soundcloud.com")
 
 # SoundCloud's api-v2 rejects requests without browser-like headers.
 # These mimic what the SoundCloud web app sends.
@@ -63,10 +67,10 @@ SC_HEADERS = {
     "Origin": "https://soundcloud.com",
 }
 
-CM_BASE = "https://api.chartmetric.com/api"
+CM_BASE = os.getenv("CM_BASE", "https://api.chartmetric.com/api")
 CM_REFRESH_TOKEN = os.getenv("CHARTMETRIC_REFRESH_TOKEN")
 
-LUM_BASE = "https://api.luminatedata.com"
+LUM_BASE = os.getenv("LUM_BASE", "https://api.luminatedata.com")
 LUM_API_KEY = os.getenv("LUMINATE_API_KEY")
 LUM_EMAIL = os.getenv("LUMINATE_EMAIL")
 LUM_PASSWORD = os.getenv("LUMINATE_PASSWORD")
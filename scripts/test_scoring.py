@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Parity check: scripts.scoring (batch) vs scripts.models (scalar).
+
+Also checks project_revenue_batch against project_revenue/assess_viability
+on play counts around every cent tie and the viability threshold, and
+rescore() on stored scoring_inputs against the scalar path — with the
+default weights and with SCORE_WEIGHTS temporarily set to a custom profile.
+
+Scores a seeded set of synthetic reports — random values plus the edge
+cases the scalar functions special-case (None/0 inputs, milestone and
+floor/cap boundaries, every career stage and momentum label) — with
+both implementations and requires bit-identical component scores and
+identical rounded overall scores and labels.
+
+Usage:
+    python scripts/test_scoring.py
+    python -m pytest scripts/test_scoring.py
+"""
+
+import copy
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts import models  # noqa: E402
+from scripts.models import (  # noqa: E402
+    _revenue_score,
+    assess_viability,
+    build_opportunity_score,
+    compute_conversion_score,
+    compute_demand_score,
+    compute_momentum_score,
+    project_revenue,
+    scoring_inputs,
+)
+from scripts.scoring import (  # noqa: E402
+    LABELS,
+    project_revenue_batch,
+    report_columns,
+    rescore,
+    resolve_profile,
+    score_batch,
+)
+
+STAGES = [None, "", "undiscovered", "developing", "Mid-Level", " mid-level ", "mainstream", "superstar", "legendary", "unknown"]
+MOMENTA = [None, "", "decline", "Gradual Decline", "steady", "growth", "explosive growth", "sideways"]
+CITIES = ["London", "Berlin", "Paris", "Lagos", "Seoul", "Austin", "Toronto", "Madrid", "Tokyo", "Lima", "Oslo", "Cairo"]
+EDGE_COUNTS = [None, 0, 1, 99, 100, 999, 1_000, 10_000, 999_999, 1_000_000, 4_999_999, 5_000_000, 10_000_000, 10**8, 10**9]
+
+
+def _count(rng):
+    if rng.random() < 0.3:
+        return rng.choice(EDGE_COUNTS)
+    return int(10 ** rng.uniform(0, 9))
+
+
+def _artist(rng):
+    if rng.random() < 0.1:
+        return None
+    return {
+        "sp_monthly_listeners": _count(rng),
+        "spotify_followers_to_listeners_ratio": rng.choice([None, 0, 0.05, 0.2, 0.35, rng.random() * 0.4]),
+        "tiktok_followers": _count(rng),
+        "geo_cities": [{"name": c} for c in rng.sample(CITIES, rng.randint(0, 10))],
+        "career": {
+            "stage": rng.choice(STAGES),
+            "momentum": rng.choice(MOMENTA),
+            "momentum_score": rng.choice([None, 0, 12.5, 50, 88.0, rng.uniform(0, 100)]),
+        },
+    }
+
+
+def make_reports(n=5_000, seed=1234):
+    rng = random.Random(seed)
+    reports = []
+    for _ in range(n):
+        plays = _count(rng)
+        likes = _count(rng)
+        sc_metrics = {
+            "plays": plays,
+            "likes": likes,
+            "comments": rng.choice([None, 0, 100, 101, rng.randint(0, 500)]),
+            "reposts": rng.choice([None, 0, 50, 51, rng.randint(0, 200)]),
+            "engagement_rate": rng.choice([None, 0, 0.03, 0.5, round(rng.random() * 0.06, 4)]),
+            "daily_velocity": _count(rng),
+        }
+        reports.append({
+            "sc_metrics": sc_metrics,
+            "original_artist": _artist(rng),
+            "remix_artist": _artist(rng),
+            "revenue": {"projections": project_revenue(plays or 0)},
+        })
+    return reports
+
+
+def _scalar(report):
+    sc_metrics = report["sc_metrics"]
+    original = report["original_artist"] or {}
+    remix = report["remix_artist"] or {}
+    original_geo = original.get("geo_cities", [])
+    remix_geo = remix.get("geo_cities", [])
+    original_career = original.get("career", {})
+    remix_career = remix.get("career", {})
+    projections = report["revenue"]["projections"]
+    return {
+        "demand": compute_demand_score(sc_metrics),
+        "conversion": compute_conversion_score(original, remix, original_geo, remix_geo),
+        "momentum": compute_momentum_score(original_career, remix_career),
+        "revenue": _revenue_score(projections["mid"]["revenue"]["all_dsps_avg"]),
+        "payload": build_opportunity_score(
+            sc_metrics, original, remix, original_geo, remix_geo, original_career, remix_career, projections
+        ),
+    }
+
+
+def test_batch_matches_scalar():
+    reports = make_reports()
+    batch = score_batch(**report_columns(reports))
+    mismatches = []
+    for i, report in enumerate(reports):
+        expected = _scalar(report)
+        for key in ("demand", "conversion", "momentum", "revenue"):
+            if float(batch[key][i]) != expected[key]:
+                mismatches.append((i, key, float(batch[key][i]), expected[key]))
+        payload = expected["payload"]
+        if round(float(batch["overall"][i]), 1) != payload["overall"]:
+            mismatches.append((i, "overall", float(batch["overall"][i]), payload["overall"]))
+        if LABELS[batch["label_code"][i]] != payload["label"]:
+            mismatches.append((i, "label", LABELS[batch["label_code"][i]], payload["label"]))
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[:5]}"
+
+
+def test_empty_batch():
+    batch = score_batch(**report_columns([]))
+    assert all(len(values) == 0 for values in batch.values())
+
+
+def test_revenue_batch_matches_scalar():
+    rng = random.Random(99)
+    # Plays whose mid revenue lands on or next to the $50K threshold, plus small counts (cent ties).
+    plays = [None, 0, 1, 2, 3, 3_333_333, 3_333_334, 3_333_332, *range(1, 2_000)]
+    plays += [_count(rng) for _ in range(20_000)]
+    batch = project_revenue_batch(plays)
+    mismatches = []
+    for i, value in enumerate(plays):
+        expected = project_revenue(value or 0)
+        if batch.projections(i) != expected:
+            mismatches.append((i, "projections", value))
+        if batch.viability(i) != assess_viability(expected):
+            mismatches.append((i, "viability", value))
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[:5]}"
+    assert batch.clears.tolist() == [batch.viability(i)["clears_threshold"] for i in range(len(plays))]
+
+
+def _assert_rescore_matches(reports, profile=None):
+    inputs = [
+        scoring_inputs(r["sc_metrics"], r["original_artist"], r["remix_artist"]) for r in reports
+    ]
+    scores, revenue = rescore(inputs, profile)
+    mismatches = []
+    for i, report in enumerate(reports):
+        plays = report["sc_metrics"]["plays"] or 0
+        expected = _scalar({**report, "revenue": {"projections": project_revenue(plays)}})["payload"]
+        got = {
+            "overall": round(float(scores["overall"][i]), 1),
+            "label": LABELS[scores["label_code"][i]],
+            "demand": round(float(scores["demand"][i]), 1),
+            "conversion": round(float(scores["conversion"][i]), 1),
+            "momentum": round(float(scores["momentum"][i]), 1),
+        }
+        if got != expected:
+            mismatches.append((i, got, expected))
+        if revenue.viability(i) != assess_viability(project_revenue(plays)):
+            mismatches.append((i, "viability"))
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[:5]}"
+
+
+def test_rescore_default_profile():
+    _assert_rescore_matches(make_reports(n=2_000, seed=7))
+
+
+def test_rescore_custom_profile():
+    profile = {
+        "weights": {"overall": {"demand": 0.3, "revenue": 0.4}, "demand": {"likes": 0.5}},
+        "label_thresholds": {"STRONG": 60, "MARGINAL": 30},
+    }
+    resolved = resolve_profile(profile)
+    saved_weights = copy.deepcopy(models.SCORE_WEIGHTS)
+    saved_thresholds = dict(models.LABEL_THRESHOLDS)
+    try:
+        for group, weights in resolved["weights"].items():
+            models.SCORE_WEIGHTS[group].update(weights)
+        models.LABEL_THRESHOLDS.update(resolved["label_thresholds"])
+        _assert_rescore_matches(make_reports(n=2_000, seed=8), profile)
+    finally:
+        for group, weights in saved_weights.items():
+            models.SCORE_WEIGHTS[group].update(weights)
+        models.LABEL_THRESHOLDS.update(saved_thresholds)
+
+
+def test_resolve_profile_rejects_bad_input():
+    for bad in (
+        {"weight": {}},
+        {"weights": {"nope": {}}},
+        {"weights": {"overall": {"demand": -1}}},
+        {"label_thresholds": {"GREAT": 90}},
+        {"viability_threshold": "lots"},
+    ):
+        try:
+            resolve_profile(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_empty_batch()
+    test_revenue_batch_matches_scalar()
+    test_rescore_default_profile()
+    test_rescore_custom_profile()
+    test_resolve_profile_rejects_bad_input()
+    print("scoring parity: OK")
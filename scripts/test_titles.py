@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Golden-corpus check for parse_remix_title.
+
+scripts/testdata/remix_titles_golden.json holds
+[title, original_artist, original_song, remix_artist] rows recorded from
+the regex-based parser the single-pass scanner replaced, covering nested
+and unclosed groups, covers, trailing "- Remix" markers, every separator
+and the Unicode case-folding quirks of re.IGNORECASE.
+
+Usage:
+    python scripts/test_titles.py
+    python -m pytest scripts/test_titles.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.models import parse_many, parse_remix_title  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "testdata", "remix_titles_golden.json")
+
+
+def load_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_golden_corpus():
+    mismatches = []
+    for title, original_artist, original_song, remix_artist in load_golden():
+        parsed = parse_remix_title(title)
+        got = (parsed["original_artist"], parsed["original_song"], parsed["remix_artist"])
+        if got != (original_artist, original_song, remix_artist):
+            mismatches.append((title, got, (original_artist, original_song, remix_artist)))
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[:5]}"
+
+
+def test_parse_many_matches_single():
+    titles = [row[0] for row in load_golden()]
+    assert parse_many(titles + titles) == [parse_remix_title(t) for t in titles + titles]
+
+
+def test_marker_kind_and_cover():
+    parsed = parse_remix_title("Revelries - Blinding Lights (Weeknd Cover Remix)")
+    assert parsed["is_cover"] is True and parsed["remix_kind"] == "remix"
+    assert parse_remix_title("Dua Lipa - Levitating [Tiesto Edit]")["remix_kind"] == "edit"
+    assert parse_remix_title("Dua Lipa - Levitating - Bootleg")["remix_kind"] == "bootleg"
+    assert parse_remix_title("Dua Lipa - Levitating")["remix_kind"] is None
+
+
+def test_memo_returns_fresh_dicts():
+    first = parse_remix_title("A - B (C Remix)")
+    first["remix_artist"] = "mutated"
+    assert parse_remix_title("A - B (C Remix)")["remix_artist"] == "C"
+
+
+if __name__ == "__main__":
+    test_golden_corpus()
+    test_parse_many_matches_single()
+    test_marker_kind_and_cover()
+    test_memo_returns_fresh_dicts()
+    print("title parser golden corpus: OK")
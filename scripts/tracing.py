@@ -0,0 +1,147 @@
+"""
+Per-request stage timing for the pipeline.
+
+A Trace collects named spans; while a span is open, the platform clients
+and caches report into it through module-level hooks:
+
+    record_call(service, path)   # one upstream HTTP request
+    record_cache_hit(cache)      # a lookup answered without a request
+    record_throttle(seconds)     # time spent waiting on the rate limiter
+
+The open span lives in a ContextVar, so asyncio tasks inherit it and
+fan_out() and map_ordered() carry it into their worker threads. With no span open every
+hook is a single ContextVar read, so untraced code pays next to nothing.
+
+Usage:
+    from scripts.tracing import Trace
+
+    trace = Trace()
+    with trace.span("parse"):
+        parsed = parse_remix_title(title)
+    with trace.span("original_enrichment"):
+        artist = enrich_artist(cm, name)   # CM calls / cache hits land on this span
+    report["trace"] = trace.to_dict()
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_span: ContextVar = ContextVar("trace_span", default=None)
+
+# Path segments holding an ID, ISRC or other value.
+_ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*")
+
+
+def path_template(path):
+    """Replace ID-like path segments: "/artist/123/career" -> "/artist/{id}/career"."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def endpoint(service, path):
+    """Group key for a request: ("cm", "/artist/123/career") -> "cm:/artist/{id}/career"."""
+    return f"{service}:{path_template(path)}"
+
+
+class Span:
+    """One timed stage; counters are updated from any thread or task."""
+
+    __slots__ = ("name", "trace", "start", "end", "calls", "cache_hits", "throttle_wait")
+
+    def __init__(self, name, trace):
+        self.name = name
+        self.trace = trace
+        self.start = time.perf_counter()
+        self.end = None
+        self.calls = Counter()
+        self.cache_hits = Counter()
+        self.throttle_wait = 0.0
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - self.trace.start) * 1000, 2),
+            "duration_ms": round(self.duration * 1000, 2),
+            "calls": dict(self.calls),
+            "cache_hits": dict(self.cache_hits),
+            "throttle_wait_ms": round(self.throttle_wait * 1000, 2),
+        }
+
+
+class Trace:
+    """The spans of one request (e.g. one analyze_track_object call)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        """Time the block and attribute upstream calls made inside it to `name`."""
+        span = Span(name, self)
+        with self._lock:
+            self.spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def to_dict(self):
+        """JSON-ready trace: per-span rows plus request totals."""
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        calls, cache_hits = Counter(), Counter()
+        for span in spans:
+            calls.update(span["calls"])
+            cache_hits.update(span["cache_hits"])
+        return {
+            "total_ms": round(self.elapsed * 1000, 2),
+            "spans": spans,
+            "calls": dict(calls),
+            "upstream_calls": sum(calls.values()),
+            "cache_hits": dict(cache_hits),
+            "throttle_wait_ms": round(sum(span["throttle_wait_ms"] for span in spans), 2),
+        }
+
+
+async def traced(trace, name, aw):
+    """Await `aw` inside trace.span(name); wrap gathered coroutines so each gets its own span."""
+    with trace.span(name):
+        return await aw
+
+
+# ── Hooks called by the clients and caches ─────────────────────────
+
+def record_call(service, path):
+    span = _current_span.get()
+    if span is not None:
+        with span.trace._lock:
+            span.calls[endpoint(service, path)] += 1
+
+
+def record_cache_hit(cache):
+    span = _current_span.get()
+    if span is not None:
+        with span.trace._lock:
+            span.cache_hits[cache] += 1
+
+
+def record_throttle(seconds):
+    span = _current_span.get()
+    if span is not None and seconds > 0:
+        with span.trace._lock:
+            span.throttle_wait += seconds
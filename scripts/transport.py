@@ -0,0 +1,169 @@
+"""
+Shared HTTP transport for Remix Radar.
+
+Every platform client and the token refresh paths in config.py go
+through one HttpTransport so that TCP+TLS connections are pooled and
+kept alive per upstream host instead of being re-opened for every call.
+The async clients use AsyncHttpTransport, an httpx.AsyncClient with the
+same pool limits.
+
+Usage:
+    from scripts.config import cfg
+
+    resp = cfg.http.get("https://api.chartmetric.com/api/search", params=...)
+    cfg.http.stats()  # -> {"api.chartmetric.com": {"requests": 40, "connections": 2, ...}}
+
+    resp = await cfg.ahttp.get("https://api.chartmetric.com/api/search", params=...)
+"""
+
+import asyncio
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class HttpTransport:
+    """
+    Keep-alive session pool with one requests.Session per upstream host.
+
+    Args:
+        pool_connections: Number of urllib3 host pools each session caches.
+        pool_maxsize:     Max keep-alive connections held open per host.
+                          Should be >= the number of worker threads that
+                          hit the same host concurrently.
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=16):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session(self, url):
+        """Return the shared session for the host of `url`, creating it on first use."""
+        key = self._host_key(url)
+        sess = self._sessions.get(key)
+        if sess is not None:
+            return sess
+        with self._lock:
+            sess = self._sessions.get(key)
+            if sess is None:
+                sess = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                self._sessions[key] = sess
+                logger.debug("HTTP pool opened for %s (maxsize=%d)", key, self.pool_maxsize)
+        return sess
+
+    def request(self, method, url, **kwargs):
+        return self.session(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """
+        Connection-reuse counters per upstream host.
+
+        Returns:
+            Dict keyed by netloc with:
+                requests     — requests sent through the pool
+                connections  — TCP(+TLS) connections actually opened
+                reused       — requests served on an already-open connection
+                reuse_ratio  — reused / requests
+        """
+        out = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for key, sess in sessions:
+            n_req = 0
+            n_conn = 0
+            for adapter in set(sess.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for pool_key in list(pools.keys()):
+                    pool = pools.get(pool_key)
+                    if pool is None:
+                        continue
+                    n_req += pool.num_requests
+                    n_conn += pool.num_connections
+            host = urlsplit(key).netloc
+            reused = max(n_req - n_conn, 0)
+            out[host] = {
+                "requests": n_req,
+                "connections": n_conn,
+                "reused": reused,
+                "reuse_ratio": round(reused / n_req, 4) if n_req else 0.0,
+            }
+        return out
+
+    def close(self):
+        """Close every pooled connection (e.g. on server shutdown)."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for sess in sessions:
+            sess.close()
+
+
+class AsyncHttpTransport:
+    """
+    Shared httpx.AsyncClient for the async platform clients.
+
+    The underlying client is bound to the event loop it was created on, so
+    it is (re)created lazily for the currently running loop.
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=16):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._client = None
+        self._loop = None
+        self._requests = 0
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize * self.pool_connections,
+                    max_keepalive_connections=self.pool_maxsize * self.pool_connections,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def request(self, method, url, **kwargs):
+        self._requests += 1
+        return await self._get_client().request(method, url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self):
+        return {"requests": self._requests, "open": self._client is not None}
+
+    async def aclose(self):
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
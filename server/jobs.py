@@ -0,0 +1,458 @@
+"""
+Persistent background catalog jobs.
+
+A job is an uploaded catalog expanded into one row per song in a local
+SQLite store. Songs are searched by a fixed pool of asyncio workers and
+each song's summarized results are checkpointed as soon as it finishes,
+so progress survives browser disconnects and server restarts: on startup
+every queued/running job is re-enqueued and only songs that never
+finished are searched again.
+
+The catalog is streamed into SQLite in chunks, and the worker queue holds
+job ids only; workers claim one pending song at a time from the store, so
+memory stays flat however large the catalog. Store calls are blocking
+SQLite I/O and always run in a worker thread (asyncio.to_thread).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from itertools import islice
+
+from scripts import pipeline_async
+from scripts.catalog import iter_catalog_songs
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+TERMINAL = {COMPLETED, CANCELLED, FAILED}
+
+SONG_PENDING = "pending"
+SONG_RUNNING = "running"
+SONG_DONE = "done"
+SONG_SKIPPED = "skipped"
+
+_INSERT_CHUNK = 5000  # song rows per insert transaction in create_job
+
+
+def rank_results(items):
+    """Dedup summarized tracks by track_id and rank by overall opportunity score."""
+    dedup_map = {item["track_id"]: item for item in items}
+    return sorted(
+        dedup_map.values(),
+        key=lambda row: (row.get("opportunity_score") or {}).get("overall", 0),
+        reverse=True,
+    )
+
+
+class JobStore:
+    """SQLite persistence for catalog jobs and their per-song checkpoints."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " filename TEXT,"
+                " params TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS songs ("
+                " job_id TEXT NOT NULL,"
+                " idx INTEGER NOT NULL,"
+                " title TEXT NOT NULL,"
+                " artist TEXT,"
+                " isrc TEXT,"
+                " status TEXT NOT NULL,"
+                " seq INTEGER,"
+                " reason TEXT,"
+                " error TEXT,"
+                " results TEXT,"
+                " PRIMARY KEY (job_id, idx));"
+                "CREATE INDEX IF NOT EXISTS songs_by_status ON songs (job_id, status, idx);"
+                "CREATE INDEX IF NOT EXISTS songs_by_seq ON songs (job_id, seq);"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ── Jobs ───────────────────────────────────────────────────────
+
+    def create_job(self, filename, params, records):
+        """
+        Insert one pending row per record, then the job itself; returns the job id.
+
+        `records` may be a lazy iterator: rows are inserted in chunks of
+        _INSERT_CHUNK, each in its own short transaction, so neither the
+        catalog nor the lock is held for the whole upload. The job row goes
+        in last, so a half-loaded catalog is never visible or resumed.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        rows = (
+            (job_id, idx, r["title"], r.get("artist"), r.get("isrc"), SONG_PENDING)
+            for idx, r in enumerate(records, start=1)
+        )
+        try:
+            while True:
+                chunk = list(islice(rows, _INSERT_CHUNK))
+                if not chunk:
+                    break
+                with self._lock:
+                    conn = self._db()
+                    conn.executemany(
+                        "INSERT INTO songs (job_id, idx, title, artist, isrc, status) VALUES (?, ?, ?, ?, ?, ?)",
+                        chunk,
+                    )
+                    conn.commit()
+            now = time.time()
+            with self._lock:
+                conn = self._db()
+                conn.execute(
+                    "INSERT INTO jobs (id, filename, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, filename, json.dumps(params), QUEUED, now, now),
+                )
+                conn.commit()
+        except BaseException:
+            with self._lock:
+                conn = self._db()
+                conn.execute("DELETE FROM songs WHERE job_id = ?", (job_id,))
+                conn.commit()
+            raise
+        return job_id
+
+    def get_job(self, job_id):
+        """Job row plus per-status song counts, or None if unknown."""
+        with self._lock:
+            conn = self._db()
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM songs WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return self._job_dict(row, counts)
+
+    def list_jobs(self, limit=50):
+        with self._lock:
+            conn = self._db()
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            counts = {}
+            for job_id, status, n in conn.execute(
+                "SELECT job_id, status, COUNT(*) FROM songs GROUP BY job_id, status"
+            ).fetchall():
+                counts.setdefault(job_id, {})[status] = n
+        return [self._job_dict(row, counts.get(row["id"], {})) for row in rows]
+
+    @staticmethod
+    def _job_dict(row, counts):
+        done = counts.get(SONG_DONE, 0)
+        skipped = counts.get(SONG_SKIPPED, 0)
+        return {
+            "job_id": row["id"],
+            "filename": row["filename"],
+            "params": json.loads(row["params"]),
+            "status": row["status"],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "total": sum(counts.values()),
+            "done": done,
+            "skipped": skipped,
+            "remaining": counts.get(SONG_PENDING, 0) + counts.get(SONG_RUNNING, 0),
+        }
+
+    def set_status(self, job_id, status, error=None, only_from=None):
+        """Update a job's status; with `only_from`, only if it is currently in that set."""
+        with self._lock:
+            conn = self._db()
+            sql = "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?"
+            args = [status, error, time.time(), job_id]
+            if only_from:
+                sql += f" AND status IN ({','.join('?' * len(only_from))})"
+                args.extend(only_from)
+            changed = conn.execute(sql, args).rowcount
+            conn.commit()
+        return bool(changed)
+
+    def active_job_ids(self):
+        """Jobs that were queued or running (e.g. when the server last stopped)."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def complete_if_finished(self, job_id):
+        """Mark a queued/running job completed once none of its songs are pending or running."""
+        with self._lock:
+            conn = self._db()
+            changed = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)"
+                " AND NOT EXISTS (SELECT 1 FROM songs WHERE job_id = ? AND status IN (?, ?))",
+                (COMPLETED, time.time(), job_id, QUEUED, RUNNING, job_id, SONG_PENDING, SONG_RUNNING),
+            ).rowcount
+            conn.commit()
+        return bool(changed)
+
+    # ── Songs ──────────────────────────────────────────────────────
+
+    def reset_running_songs(self):
+        """Return songs interrupted mid-search (server stop) to pending."""
+        with self._lock:
+            conn = self._db()
+            conn.execute("UPDATE songs SET status = ? WHERE status = ?", (SONG_PENDING, SONG_RUNNING))
+            conn.commit()
+
+    def delete_orphan_songs(self):
+        """Drop song rows of a job whose upload was interrupted before its job row was written."""
+        with self._lock:
+            conn = self._db()
+            conn.execute("DELETE FROM songs WHERE job_id NOT IN (SELECT id FROM jobs)")
+            conn.commit()
+
+    def claim_next_song(self, job_id):
+        """
+        Mark the job's next pending song as running (and the job as running).
+
+        Returns (job params, song dict), or None if the job is unknown,
+        finished/cancelled, or has no pending songs left.
+        """
+        with self._lock:
+            conn = self._db()
+            job = conn.execute("SELECT status, params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None or job["status"] in TERMINAL:
+                return None
+            row = conn.execute(
+                "SELECT idx, title, artist, isrc FROM songs WHERE job_id = ? AND status = ? ORDER BY idx LIMIT 1",
+                (job_id, SONG_PENDING),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE songs SET status = ? WHERE job_id = ? AND idx = ?", (SONG_RUNNING, job_id, row["idx"])
+            )
+            if job["status"] == QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (RUNNING, time.time(), job_id)
+                )
+            conn.commit()
+        return json.loads(job["params"]), dict(row)
+
+    def release_song(self, job_id, idx):
+        """Put a running song back to pending (its search was cancelled)."""
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "UPDATE songs SET status = ? WHERE job_id = ? AND idx = ? AND status = ?",
+                (SONG_PENDING, job_id, idx, SONG_RUNNING),
+            )
+            conn.commit()
+
+    def finish_song(self, job_id, idx, status, results=None, reason=None, error=None):
+        """Checkpoint one song's outcome; `seq` orders completions for streaming."""
+        with self._lock:
+            conn = self._db()
+            conn.execute(
+                "UPDATE songs SET status = ?, reason = ?, error = ?, results = ?,"
+                " seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM songs WHERE job_id = ?)"
+                " WHERE job_id = ? AND idx = ?",
+                (status, reason, error, json.dumps(results or []), job_id, job_id, idx),
+            )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+            conn.commit()
+
+    def finished_songs(self, job_id, after_seq=0):
+        """Finished songs in completion order, with their summarized results."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT idx, title, artist, isrc, status, seq, reason, error, results FROM songs"
+                " WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq),
+            ).fetchall()
+        out = []
+        for row in rows:
+            song = dict(row)
+            song["results"] = json.loads(song["results"] or "[]")
+            out.append(song)
+        return out
+
+    def results(self, job_id):
+        items = [item for song in self.finished_songs(job_id) for item in song["results"]]
+        return rank_results(items)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class JobManager:
+    """
+    Runs catalog jobs from a JobStore on a fixed pool of asyncio workers.
+
+    The queue holds job ids. A worker takes a job id, claims that job's next
+    pending song from the store and puts the id back before searching, so
+    concurrent jobs share the workers round-robin.
+
+    Args:
+        store:     JobStore holding jobs and song checkpoints.
+        clients:   Async client dict (see pipeline_async.make_async_clients).
+        summarize: Callable turning one analysis report into a result row.
+        workers:   Songs searched concurrently across all jobs.
+    """
+
+    def __init__(self, store, clients, summarize, workers=4):
+        self.store = store
+        self.clients = clients
+        self.summarize = summarize
+        self.workers = workers
+        self._queue: asyncio.Queue | None = None
+        self._queued: set[str] = set()  # job ids currently in the queue
+        self._worker_tasks: list[asyncio.Task] = []
+        self._running: dict[str, set[asyncio.Task]] = {}
+        self._stopping = False
+
+    async def start(self):
+        """Start the worker pool and re-enqueue jobs left unfinished by a previous run."""
+        self._queue = asyncio.Queue()
+        self._queued = set()
+        self._stopping = False
+        await asyncio.to_thread(self.store.delete_orphan_songs)
+        await asyncio.to_thread(self.store.reset_running_songs)
+        for job_id in await asyncio.to_thread(self.store.active_job_ids):
+            logger.info("jobs: resuming %s", job_id)
+            self._enqueue(job_id)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+
+    async def stop(self):
+        """Stop workers; in-flight songs stay pending and resume on the next start()."""
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await asyncio.to_thread(self.store.reset_running_songs)
+
+    async def submit(self, catalog_path, filename, params):
+        """Stream a catalog file into a new job and queue it. Returns the job dict."""
+        records = iter_catalog_songs(catalog_path, params.get("offset", 0), params.get("count", 0))
+        job_id = await asyncio.to_thread(self.store.create_job, filename, params, records)
+        self._enqueue(job_id)
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    async def cancel(self, job_id):
+        """Cancel a job; its running songs are stopped and left pending for resume()."""
+        if not await asyncio.to_thread(self.store.set_status, job_id, CANCELLED, only_from=(QUEUED, RUNNING)):
+            return False
+        for task in list(self._running.get(job_id, ())):
+            task.cancel()
+        return True
+
+    async def resume(self, job_id):
+        """Re-queue the unfinished songs of a cancelled or failed job."""
+        if not await asyncio.to_thread(self.store.set_status, job_id, QUEUED, only_from=(CANCELLED, FAILED)):
+            return False
+        self._enqueue(job_id)
+        return True
+
+    def _enqueue(self, job_id):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            song = None
+            try:
+                claimed = await asyncio.to_thread(self.store.claim_next_song, job_id)
+                if claimed is None:
+                    # Nothing left to start (or the job was cancelled): drop it from the rotation.
+                    await asyncio.to_thread(self.store.complete_if_finished, job_id)
+                    continue
+                params, song = claimed
+                self._enqueue(job_id)  # let another worker start the job's next song meanwhile
+                await self._run_song(job_id, params, song)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("jobs: worker error on %s", job_id)
+                await self._fail_job(job_id, song, exc)
+            finally:
+                self._queue.task_done()
+
+    async def _fail_job(self, job_id, song, exc):
+        """Mark a job failed after a store error and hand its claimed song back, so resume() can retry it."""
+        try:
+            await asyncio.to_thread(
+                self.store.set_status, job_id, FAILED, error=str(exc), only_from=(QUEUED, RUNNING)
+            )
+            if song is not None:
+                await asyncio.to_thread(self.store.release_song, job_id, song["idx"])
+        except Exception:
+            # The store is still failing; start() resets running songs on the next boot.
+            logger.exception("jobs: could not mark %s failed", job_id)
+
+    async def _run_song(self, job_id, params, song):
+        # Same per-song budget as the catalog SSE stream: 45s per remix slot + 30s buffer.
+        timeout = params["limit_remixes"] * 45 + 30
+        task = asyncio.create_task(asyncio.wait_for(
+            pipeline_async.search_song_remixes(
+                song["title"], song.get("artist"), params["limit_remixes"], self.clients,
+                params.get("min_plays", 0), song.get("isrc"),
+            ),
+            timeout=timeout,
+        ))
+        running = self._running.setdefault(job_id, set())
+        running.add(task)
+        t0 = time.perf_counter()
+        try:
+            reports = await task
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.store.release_song, job_id, song["idx"])
+            if self._stopping:
+                raise
+            return  # the job was cancelled
+        except asyncio.TimeoutError:
+            logger.warning("jobs: %s #%d TIMEOUT after %ds: %r", job_id, song["idx"], timeout, song["title"])
+            await asyncio.to_thread(self.store.finish_song, job_id, song["idx"], SONG_SKIPPED, reason="timeout")
+        except Exception as exc:
+            logger.warning("jobs: %s #%d ERROR: %r — %s", job_id, song["idx"], song["title"], exc)
+            await asyncio.to_thread(
+                self.store.finish_song, job_id, song["idx"], SONG_SKIPPED, reason="error", error=str(exc)
+            )
+        else:
+            items = [self.summarize(report) for report in reports]
+            await asyncio.to_thread(self.store.finish_song, job_id, song["idx"], SONG_DONE, results=items)
+            logger.info(
+                "jobs: %s #%d done: %r  found=%d  elapsed=%.1fs",
+                job_id, song["idx"], song["title"], len(items), time.perf_counter() - t0,
+            )
+        finally:
+            running.discard(task)
+        await asyncio.to_thread(self.store.complete_if_finished, job_id)
@@ -1,7 +1,9 @@
 """FastAPI entrypoint for RemixRadar MVP."""
 
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -19,14 +21,47 @@ for _mod in (
     "scripts.platforms.soundcloud",
     "scripts.pipeline",
     "server.routes.search",
+    "server.jobs",
 ):
     logging.getLogger(_mod).setLevel(logging.DEBUG)
 
+from scripts import metrics
+from scripts.config import cfg
+from server.jobs import JobManager, JobStore
+from server.metrics import MetricsMiddleware, registry_collector
+from server.registry import ClientRegistry
+from server.routes.admin import router as admin_router
+from server.routes.jobs import router as jobs_router
 from server.routes.meta import router as meta_router
-from server.routes.search import router as search_router
+from server.routes.metrics import router as metrics_router
+from server.routes.search import _summarize_report, router as search_router
 from server.routes.tracks import router as tracks_router
 
-app = FastAPI(title="RemixRadar API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the shared clients and caches once; close pooled connections on shutdown."""
+    app.state.registry = ClientRegistry()
+    collector = registry_collector(app.state.registry)
+    metrics.REGISTRY.register_collector(collector)
+    # Background catalog jobs; unfinished jobs from a previous run resume here.
+    app.state.jobs = JobManager(
+        JobStore(cfg.JOBS_DB_PATH),
+        app.state.registry.async_clients,
+        _summarize_report,
+        workers=cfg.JOB_WORKERS,
+    )
+    await app.state.jobs.start()
+    try:
+        yield
+    finally:
+        metrics.REGISTRY.unregister_collector(collector)
+        await app.state.jobs.stop()
+        await asyncio.to_thread(app.state.jobs.store.close)
+        await app.state.registry.aclose()
+
+
+app = FastAPI(title="RemixRadar API", version="0.1.0", lifespan=lifespan)
 
 # In local dev the Vite proxy handles routing, so CORS is only needed for
 # direct browser→backend calls (e.g. when testing the production build locally).
@@ -44,10 +79,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so CORS preflights and 404s are counted too.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(search_router)
 app.include_router(tracks_router)
 app.include_router(meta_router)
+app.include_router(admin_router)
+app.include_router(jobs_router)
+app.include_router(metrics_router)
 
 
 @app.get("/health")
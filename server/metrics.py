@@ -0,0 +1,150 @@
+"""
+Prometheus metrics for the API server.
+
+Route traffic is recorded by MetricsMiddleware (a plain ASGI wrapper, so
+streaming responses pass through untouched); SSE search streams are wrapped
+with metered_stream() for per-event counts and stream durations. Upstream
+API metrics come from the platform clients (scripts/metrics.py), and the
+cache / rate-limiter counters already kept by ClientRegistry are read at
+scrape time by registry_collector() rather than copied on every request.
+"""
+
+import time
+
+from scripts import metrics
+
+HTTP_REQUESTS = metrics.counter(
+    "remixradar_http_requests_total",
+    "API requests by route template, method and response status.",
+    ("route", "method", "status"),
+)
+HTTP_LATENCY = metrics.histogram(
+    "remixradar_http_request_duration_seconds",
+    "API request duration by route template (for SSE routes: until the stream ends).",
+    ("route", "method"),
+)
+HTTP_IN_FLIGHT = metrics.gauge(
+    "remixradar_http_requests_in_flight",
+    "API requests currently being served.",
+)
+SSE_STREAMS_ACTIVE = metrics.gauge(
+    "remixradar_sse_streams_active",
+    "Open SSE search streams by route.",
+    ("route",),
+)
+SSE_EVENTS = metrics.counter(
+    "remixradar_sse_events_total",
+    "SSE events sent by route and event type.",
+    ("route", "event"),
+)
+SSE_DURATION = metrics.histogram(
+    "remixradar_sse_stream_duration_seconds",
+    "SSE search stream duration by route, including client disconnects.",
+    ("route",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0, 1800.0),
+)
+
+
+class MetricsMiddleware:
+    """Count and time every HTTP request under its route template ("unmatched" for 404s)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels()
+        in_flight.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the (shared) scope.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUESTS.labels(route, scope["method"], status).inc()
+            HTTP_LATENCY.labels(route, scope["method"]).observe(time.perf_counter() - t0)
+
+
+def _event_type(chunk):
+    """The `event:` name of one encoded SSE block (see search._sse_event)."""
+    if chunk.startswith("event: "):
+        return chunk[7:chunk.find("\n")]
+    return "message"
+
+
+async def metered_stream(route, events):
+    """Re-yield an SSE generator, counting events by type and timing the whole stream."""
+    active = SSE_STREAMS_ACTIVE.labels(route)
+    active.inc()
+    t0 = time.perf_counter()
+    try:
+        async for chunk in events:
+            SSE_EVENTS.labels(route, _event_type(chunk)).inc()
+            yield chunk
+    finally:
+        active.dec()
+        SSE_DURATION.labels(route).observe(time.perf_counter() - t0)
+        await events.aclose()
+
+
+def _cache_samples(caches):
+    hits, misses, ratio, size = [], [], [], []
+    for name, stats in caches.items():
+        if not stats:
+            continue
+        labels = {"cache": name}
+        hits.append((labels, stats.get("hits", 0) + stats.get("stale_hits", 0)))
+        misses.append((labels, stats.get("misses", 0)))
+        ratio.append((labels, stats.get("hit_rate")))
+        size.append((labels, stats.get("size")))
+    return [
+        ("remixradar_cache_hits_total", "counter", "Cache lookups answered from the cache.", hits),
+        ("remixradar_cache_misses_total", "counter", "Cache lookups that fell through.", misses),
+        ("remixradar_cache_hit_ratio", "gauge", "Hits / lookups since process start.", ratio),
+        ("remixradar_cache_entries", "gauge", "Entries currently held (in-memory caches).", size),
+    ]
+
+
+def registry_collector(registry):
+    """A scrape-time collector over ClientRegistry.stats(); register it with metrics.REGISTRY."""
+
+    def collect():
+        stats = registry.stats()
+        limiter = stats["cm_rate_limiter"]
+        inflight = stats["inflight_shared"]
+        samples = _cache_samples({
+            "artist": stats["artist_cache"],
+            "track_isrc": stats["track_isrc_cache"],
+            "title_parse": stats["title_parse_cache"],
+            "cm_search_memo": stats["cm_search"]["memo"],
+            "response_cache": stats["response_cache"],
+        })
+        samples.extend([
+            ("remixradar_cm_rate_limiter_queue_depth", "gauge",
+             "Callers currently waiting on the Chartmetric token bucket.",
+             [({}, limiter["queue_depth"])]),
+            ("remixradar_cm_rate_limiter_acquired_total", "counter",
+             "Chartmetric tokens handed out.", [({}, limiter["acquired"])]),
+            ("remixradar_cm_rate_limiter_throttled_total", "counter",
+             "Chartmetric requests that had to wait for a token.", [({}, limiter["throttled"])]),
+            ("remixradar_cm_rate_limiter_wait_seconds_total", "counter",
+             "Total time spent waiting for Chartmetric tokens.", [({}, limiter["wait_seconds_total"])]),
+            ("remixradar_cm_inflight_shared_total", "counter",
+             "Chartmetric requests answered by joining an identical in-flight request.",
+             [({"client": kind}, value) for kind, value in inflight.items()]),
+        ])
+        return samples
+
+    return collect
@@ -0,0 +1,59 @@
+"""Application-scoped platform clients and warm caches for the API server."""
+
+from fastapi import Request
+
+from scripts.config import cfg
+from scripts.models import title_parse_cache_stats
+from scripts.pipeline import make_clients
+from scripts.pipeline_async import make_async_clients
+from scripts.platforms import chartmetric
+
+
+class ClientRegistry:
+    """
+    Clients and enrichment caches that live for the whole server process.
+
+    Created once in the FastAPI lifespan hook. The sync clients (used by
+    threadpool routes) and the async clients (used by the SSE search
+    routes) share one pair of thread-safe LRU + TTL caches, so an artist or
+    ISRC enriched by one request is warm for the next.
+    """
+
+    def __init__(self):
+        self.artist_cache = chartmetric.new_artist_cache()
+        self.track_isrc_cache = chartmetric.new_track_isrc_cache()
+        self.clients = make_clients(
+            artist_cache=self.artist_cache,
+            track_isrc_cache=self.track_isrc_cache,
+        )
+        self.async_clients = make_async_clients(
+            artist_cache=self.artist_cache,
+            track_isrc_cache=self.track_isrc_cache,
+        )
+
+    def stats(self):
+        """Cache, connection-pool and rate-limiter counters for the admin endpoint."""
+        response_cache = chartmetric.response_cache
+        return {
+            "artist_cache": self.artist_cache.stats(),
+            "track_isrc_cache": self.track_isrc_cache.stats(),
+            "title_parse_cache": title_parse_cache_stats(),
+            "inflight_shared": {
+                "sync": self.clients["cm"]._inflight.shared,
+                "async": self.async_clients["cm"]._inflight.shared,
+            },
+            "response_cache": response_cache.stats() if response_cache is not None else None,
+            "cm_search": {**chartmetric.search_stats.stats(), "memo": chartmetric.search_memo.stats()},
+            "http_pools": cfg.http.stats(),
+            "async_http": cfg.ahttp.stats(),
+            "cm_rate_limiter": chartmetric.rate_limiter.stats(),
+        }
+
+    async def aclose(self):
+        cfg.http.close()
+        await cfg.ahttp.aclose()
+
+
+def get_registry(request: Request) -> ClientRegistry:
+    """FastAPI dependency returning the app-lifetime ClientRegistry."""
+    return request.app.state.registry
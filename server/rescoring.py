@@ -0,0 +1,57 @@
+"""Re-rank stored result summaries under a new scoring profile."""
+
+import numpy as np
+
+from scripts.scoring import LABELS, rescore, resolve_profile
+
+
+def _tenths(value):
+    """Summary scale: the 0-100 score rounded as compute_opportunity_score does, shown as 0-10."""
+    return round(round(float(value), 1) / 10.0, 1)
+
+
+def rescore_results(results: list[dict], profile: dict | None = None, limit: int | None = None) -> dict:
+    """
+    Recompute scores, labels, revenue and viability for API result rows.
+
+    Rows carry the `scoring_inputs` saved at analysis time, so nothing is
+    refetched. Rows stored before scoring_inputs existed keep their old
+    scores and are listed after the re-ranked ones. Only the rows actually
+    returned (`limit`) have their dicts rebuilt.
+
+    Raises ValueError for an invalid profile (see scripts.scoring.resolve_profile)
+    or malformed scoring_inputs (see scripts.scoring.validate_inputs); the
+    index in the message counts re-scorable rows only.
+    """
+    resolved = resolve_profile(profile)
+    scorable = [item for item in results if item.get("scoring_inputs")]
+    unscored = [item for item in results if not item.get("scoring_inputs")]
+    scores, revenue = rescore([item["scoring_inputs"] for item in scorable], resolved)
+
+    order = np.argsort(-scores["overall"], kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    ranked = []
+    for i in order.tolist():
+        item = dict(scorable[i])
+        item["heat_score"] = round(float(scores["demand"][i]) / 10.0, 1)
+        item["opportunity_score"] = {
+            "overall": _tenths(scores["overall"][i]),
+            "label": LABELS[scores["label_code"][i]],
+            "demand": _tenths(scores["demand"][i]),
+            "conversion": _tenths(scores["conversion"][i]),
+            "momentum": _tenths(scores["momentum"][i]),
+        }
+        item["revenue"] = {"projections": revenue.projections(i)}
+        item["viability"] = revenue.viability(i)
+        ranked.append(item)
+    if limit is not None:
+        unscored = unscored[: max(0, limit - len(ranked))]
+
+    return {
+        "profile": resolved,
+        "count": len(ranked) + len(unscored),
+        "rescored": len(scorable),
+        "unscored": len(results) - len(scorable),
+        "results": ranked + unscored,
+    }
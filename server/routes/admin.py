@@ -0,0 +1,13 @@
+"""Operational routes: cache, connection-pool and rate-limiter counters."""
+
+from fastapi import APIRouter, Depends
+
+from server.registry import ClientRegistry, get_registry
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/stats")
+def get_stats(registry: ClientRegistry = Depends(get_registry)):
+    """Return hit/miss/eviction counters for the process-wide caches and pools."""
+    return registry.stats()
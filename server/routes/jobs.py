@@ -0,0 +1,177 @@
+"""Background catalog job routes: submit, poll, stream, cancel and resume."""
+
+from __future__ import annotations
+
+import asyncio
+import xml.etree.ElementTree as ET
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+
+from scripts.catalog import SUPPORTED_SUFFIXES, catalog_suffix
+from server.jobs import SONG_SKIPPED, TERMINAL, JobManager
+from server.rescoring import rescore_results
+from server.routes.search import _sse_event
+from server.schemas import RescoreJobRequest
+from server.uploads import release_upload, spool_upload
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+_POLL_SECS = 0.5
+
+
+def get_jobs(request: Request) -> JobManager:
+    """FastAPI dependency returning the app-lifetime JobManager."""
+    return request.app.state.jobs
+
+
+def _require_job(jobs: JobManager, job_id: str) -> dict:
+    job = jobs.store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+@router.post("/catalog")
+async def submit_catalog_job(
+    file: UploadFile = File(...),
+    limit_remixes: int = Form(5),
+    min_plays: int = Form(0),
+    offset: int = Form(0),
+    count: int = Form(0),
+    jobs: JobManager = Depends(get_jobs),
+):
+    """Queue a catalog upload as a persistent background job."""
+    suffix = catalog_suffix(file.filename)
+    if suffix is None:
+        raise HTTPException(status_code=400, detail=f"Catalog file must be one of: {', '.join(SUPPORTED_SUFFIXES)}")
+    params = {
+        "limit_remixes": max(1, min(int(limit_remixes or 5), 20)),
+        "min_plays": max(0, int(min_plays or 0)),
+        "offset": max(0, int(offset or 0)),
+        "count": max(0, int(count or 0)),
+    }
+    temp_path, size = await spool_upload(file, suffix)
+    try:
+        if not size:
+            raise HTTPException(status_code=400, detail="Uploaded catalog file is empty")
+        # Songs are copied into the job store, so the upload is not needed afterwards.
+        try:
+            return await jobs.submit(temp_path, file.filename, params)
+        except (ValueError, ET.ParseError) as exc:
+            # Unreadable catalog: malformed XML, bad encoding, or a missing optional reader.
+            raise HTTPException(status_code=400, detail=f"Could not read catalog: {exc}") from exc
+    finally:
+        release_upload(temp_path)
+
+
+@router.get("")
+def list_jobs(jobs: JobManager = Depends(get_jobs)):
+    """Most recent jobs with progress counts."""
+    return {"jobs": jobs.store.list_jobs()}
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, jobs: JobManager = Depends(get_jobs)):
+    """Job status and progress counts."""
+    return _require_job(jobs, job_id)
+
+
+@router.get("/{job_id}/results")
+def get_job_results(job_id: str, jobs: JobManager = Depends(get_jobs)):
+    """Ranked, deduplicated results of every song finished so far."""
+    job = _require_job(jobs, job_id)
+    results = jobs.store.results(job_id)
+    return {**job, "count": len(results), "results": results}
+
+
+@router.post("/{job_id}/rescore")
+def rescore_job_results(job_id: str, payload: RescoreJobRequest, jobs: JobManager = Depends(get_jobs)):
+    """Re-rank the stored results of a job under a new weight profile (no refetching)."""
+    job = _require_job(jobs, job_id)
+    try:
+        rescored = rescore_results(jobs.store.results(job_id), payload.profile, payload.limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {**job, **rescored}
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: str, after: int = 0, jobs: JobManager = Depends(get_jobs)):
+    """
+    SSE view of a job. Safe to reconnect: pass the last seen `seq` as `after`.
+
+    Emits the same track/complete events as /api/search/catalog plus:
+      status  {"message": "job_progress", "status": str, "done": N, "skipped": N, "total": N}
+      status  {"message": "song_skipped", "song": str, "index": N, "reason": str, "seq": N}
+      track   {"track": TrackResult, "song": str, "song_index": N, "seq": N}
+    """
+    await asyncio.to_thread(_require_job, jobs, job_id)
+
+    async def stream():
+        last_seq = max(0, after)
+        last_progress = None
+        seen_track_ids: set = set()
+        while True:
+            job = await asyncio.to_thread(jobs.store.get_job, job_id)
+            for song in await asyncio.to_thread(jobs.store.finished_songs, job_id, last_seq):
+                last_seq = song["seq"]
+                if song["status"] == SONG_SKIPPED:
+                    yield _sse_event("status", {
+                        "message": "song_skipped",
+                        "song": song["title"],
+                        "index": song["idx"],
+                        "reason": song["reason"],
+                        "error": song["error"],
+                        "seq": song["seq"],
+                    })
+                    continue
+                for item in song["results"]:
+                    tid = item.get("track_id")
+                    if tid and tid in seen_track_ids:
+                        continue
+                    if tid:
+                        seen_track_ids.add(tid)
+                    yield _sse_event("track", {
+                        "track": item,
+                        "song": song["title"],
+                        "song_index": song["idx"],
+                        "seq": song["seq"],
+                    })
+
+            progress = (job["status"], job["done"], job["skipped"], job["total"])
+            if progress != last_progress:
+                last_progress = progress
+                yield _sse_event("status", {
+                    "message": "job_progress",
+                    "job_id": job_id,
+                    "status": job["status"],
+                    "done": job["done"],
+                    "skipped": job["skipped"],
+                    "total": job["total"],
+                })
+            if job["status"] in TERMINAL:
+                results = await asyncio.to_thread(jobs.store.results, job_id)
+                yield _sse_event("complete", {"status": job["status"], "count": len(results), "results": results})
+                return
+            await asyncio.sleep(_POLL_SECS)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str, jobs: JobManager = Depends(get_jobs)):
+    """Stop a queued or running job. Finished songs are kept; resume picks up the rest."""
+    await asyncio.to_thread(_require_job, jobs, job_id)
+    if not await jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is not queued or running")
+    return await asyncio.to_thread(jobs.store.get_job, job_id)
+
+
+@router.post("/{job_id}/resume")
+async def resume_job(job_id: str, jobs: JobManager = Depends(get_jobs)):
+    """Re-queue the unfinished songs of a cancelled or failed job."""
+    await asyncio.to_thread(_require_job, jobs, job_id)
+    if not await jobs.resume(job_id):
+        raise HTTPException(status_code=409, detail="Only cancelled or failed jobs can be resumed")
+    return await asyncio.to_thread(jobs.store.get_job, job_id)
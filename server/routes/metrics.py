@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from scripts import metrics
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Request, SSE, upstream, cache and rate-limiter metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -2,33 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
-import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 
+from scripts.config import cfg
 from scripts.models import compute_demand_score
-from scripts.catalog import count_csv_rows, stream_catalog_records
-from scripts.pipeline import (
-    analyze_track_object,
-    make_clients,
-    search_song_remixes,
+from scripts.catalog import (
+    SUPPORTED_SUFFIXES,
+    catalog_suffix,
+    count_catalog_rows,
+    count_csv_rows,
+    estimate_csv_rows,
+    iter_catalog_songs,
 )
-from server.schemas import AnalyzeUrlRequest, ArtistSearchRequest, SongSearchRequest
+from scripts import pipeline_async
+from scripts.pipeline import analyze_track_object
+from server.metrics import metered_stream
+from server.registry import ClientRegistry, get_registry
+from server.rescoring import rescore_results
+from server.schemas import AnalyzeUrlRequest, ArtistSearchRequest, RescoreRequest, SongSearchRequest
+from server.uploads import release_upload, spool_upload
 
 router = APIRouter(prefix="/api", tags=["search"])
 _NUMERIC_PREFIX_RE = re.compile(r"^\d{4,}\s+")
 _LABEL_SPLIT_RE = re.compile(r"\s*[|;/]\s*")
 _COUNTRY_SUFFIX_RE = re.compile(r"\b[A-Z]{2,3}$")
 _REMIX_HINT_RE = re.compile(r"\b(remix|edit|bootleg|flip|mashup|rework|vip)\b", re.IGNORECASE)
+# Catalog records read per worker-thread hop (parsing/decompression stays off the event loop).
+_CATALOG_READ_BATCH = 64
 
 
 def _score_label_candidate(label: str) -> int:
@@ -104,21 +116,19 @@ def _classify_heat_trend(sc_metrics: dict) -> str:
     return "steady"
 
 
-def _find_original_reference_track(sc, song_name: str, artist_name: str | None) -> dict | None:
+async def _find_original_reference_track(sc, song_name: str, artist_name: str | None) -> dict | None:
     """Find likely original SoundCloud track for the song query."""
     song_q = (song_name or "").strip()
     artist_q = (artist_name or "").strip()
     if not song_q:
         return None
 
-    queries = [f"{artist_q} {song_q}" if artist_q else song_q, song_q]
+    queries = [q for q in (f"{artist_q} {song_q}" if artist_q else song_q, song_q) if q]
     seen_ids: set[int] = set()
     candidates: list[dict] = []
 
-    for query in queries:
-        if not query:
-            continue
-        for track in sc.search_tracks(query=query, limit=15):
+    for results in await asyncio.gather(*(sc.search_tracks(query=query, limit=15) for query in queries)):
+        for track in results:
             tid = track.get("id")
             if not tid or tid in seen_ids:
                 continue
@@ -255,6 +265,7 @@ def _summarize_report(report: dict) -> dict:
         },
         "revenue": report.get("revenue", {}),
         "viability": report.get("viability", {}),
+        "scoring_inputs": report.get("scoring_inputs"),
     }
 
 
@@ -263,18 +274,23 @@ def _sse_event(event_type: str, payload: dict) -> str:
     return f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
 
 
+def _timing_event(report: dict, **where) -> str:
+    """SSE `timing` event: the per-stage trace of one analysed track (follows its `track` event)."""
+    return _sse_event("timing", {**where, "track_id": report.get("track_id"), "trace": report.get("trace")})
+
+
 @router.post("/search/artist")
-def search_artist(payload: ArtistSearchRequest):
+async def search_artist(payload: ArtistSearchRequest, registry: ClientRegistry = Depends(get_registry)):
     """SSE stream of fully enriched artist-remix results."""
     if not payload.enrich_chartmetric:
         raise HTTPException(status_code=400, detail="Chartmetric enrichment must stay enabled for MVP.")
 
-    clients = make_clients()
+    clients = registry.async_clients
     sc = clients["sc"]
 
-    def stream():
+    async def stream():
         yield _sse_event("status", {"message": "search_started", "artist": payload.artist_name})
-        seed_tracks = sc.search_tracks(query=f"{payload.artist_name} remix", limit=payload.tracks_to_fetch)
+        seed_tracks = await sc.search_tracks(query=f"{payload.artist_name} remix", limit=payload.tracks_to_fetch)
         if payload.min_plays > 0:
             seed_tracks = [track for track in seed_tracks if (track.get("playback_count") or 0) >= payload.min_plays]
         yield _sse_event("status", {"message": "tracks_found", "count": len(seed_tracks)})
@@ -282,10 +298,11 @@ def search_artist(payload: ArtistSearchRequest):
         reports: list[dict] = []
         for idx, track in enumerate(seed_tracks, start=1):
             try:
-                report = analyze_track_object(track, clients)
+                report = await pipeline_async.analyze_track_object(track, clients)
                 item = _summarize_report(report)
                 reports.append(item)
                 yield _sse_event("track", {"index": idx, "total": len(seed_tracks), "track": item})
+                yield _timing_event(report, index=idx)
             except Exception as exc:
                 yield _sse_event("status", {"message": "track_failed", "index": idx, "error": str(exc)})
 
@@ -294,21 +311,21 @@ def search_artist(payload: ArtistSearchRequest):
         reports.sort(key=lambda row: row.get(sort_key) or 0, reverse=reverse)
         yield _sse_event("complete", {"count": len(reports), "results": reports})
 
-    return StreamingResponse(stream(), media_type="text/event-stream")
+    return StreamingResponse(metered_stream("/api/search/artist", stream()), media_type="text/event-stream")
 
 
 @router.post("/search/song")
-def search_song(payload: SongSearchRequest):
+async def search_song(payload: SongSearchRequest, registry: ClientRegistry = Depends(get_registry)):
     """SSE stream of fully enriched song-remix results."""
     if not payload.enrich_chartmetric:
         raise HTTPException(status_code=400, detail="Chartmetric enrichment must stay enabled for MVP.")
 
-    clients = make_clients()
+    clients = registry.async_clients
     sc = clients["sc"]
 
-    def stream():
+    async def stream():
         yield _sse_event("status", {"message": "search_started", "song": payload.song_name})
-        tracks = sc.search_remixes(payload.song_name, artist=payload.artist_name, limit=payload.tracks_to_fetch)
+        tracks = await sc.search_remixes(payload.song_name, artist=payload.artist_name, limit=payload.tracks_to_fetch)
         if payload.min_plays > 0:
             tracks = [track for track in tracks if (track.get("playback_count") or 0) >= payload.min_plays]
         yield _sse_event("status", {"message": "tracks_found", "count": len(tracks)})
@@ -317,9 +334,9 @@ def search_song(payload: SongSearchRequest):
         reference_row: dict | None = None
 
         try:
-            reference_track = _find_original_reference_track(sc, payload.song_name, payload.artist_name)
+            reference_track = await _find_original_reference_track(sc, payload.song_name, payload.artist_name)
             if reference_track:
-                reference_report = analyze_track_object(
+                reference_report = await pipeline_async.analyze_track_object(
                     reference_track,
                     clients,
                     original_isrc_override=payload.isrc_override,
@@ -332,13 +349,14 @@ def search_song(payload: SongSearchRequest):
                     reference_row["remix_artist"] = payload.artist_name
                 reports.append(reference_row)
                 yield _sse_event("track", {"index": 0, "total": len(tracks), "track": reference_row})
+                yield _timing_event(reference_report, index=0)
         except Exception as exc:
             yield _sse_event("status", {"message": "reference_track_failed", "error": str(exc)})
 
         seen_ids = {reference_row.get("track_id")} if reference_row else set()
         for idx, track in enumerate(tracks, start=1):
             try:
-                report = analyze_track_object(track, clients, original_isrc_override=payload.isrc_override)
+                report = await pipeline_async.analyze_track_object(track, clients, original_isrc_override=payload.isrc_override)
                 item = _summarize_report(report)
                 item["is_reference_original"] = False
                 if item.get("track_id") in seen_ids:
@@ -346,6 +364,7 @@ def search_song(payload: SongSearchRequest):
                 seen_ids.add(item.get("track_id"))
                 reports.append(item)
                 yield _sse_event("track", {"index": idx, "total": len(tracks), "track": item})
+                yield _timing_event(report, index=idx)
             except Exception as exc:
                 yield _sse_event("status", {"message": "track_failed", "index": idx, "error": str(exc)})
 
@@ -354,141 +373,190 @@ def search_song(payload: SongSearchRequest):
         final_reports = ([reference_row] if reference_row else []) + remix_reports
         yield _sse_event("complete", {"count": len(final_reports), "results": final_reports})
 
-    return StreamingResponse(stream(), media_type="text/event-stream")
+    return StreamingResponse(metered_stream("/api/search/song", stream()), media_type="text/event-stream")
 
 
 @router.post("/analyze/url")
-def analyze_url(payload: AnalyzeUrlRequest):
+def analyze_url(payload: AnalyzeUrlRequest, registry: ClientRegistry = Depends(get_registry)):
     """Analyze one SoundCloud URL and return one enriched result."""
-    clients = make_clients()
+    clients = registry.clients
     sc_track = clients["sc"].resolve(payload.sc_url)
     report = analyze_track_object(sc_track, clients)
     return _summarize_report(report)
 
 
+@router.post("/rescore")
+def rescore(payload: RescoreRequest):
+    """Re-rank result rows from an earlier search under a new weight profile (no refetching)."""
+    try:
+        return rescore_results(payload.results, payload.profile, payload.limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.post("/search/catalog")
-async def search_catalog(file: UploadFile = File(...), limit_remixes: int = Form(5), min_plays: int = Form(0), offset: int = Form(0), count: int = Form(0)):
+async def search_catalog(
+    file: UploadFile = File(...),
+    limit_remixes: int = Form(5),
+    min_plays: int = Form(0),
+    offset: int = Form(0),
+    count: int = Form(0),
+    concurrency: int = Form(0),
+    registry: ClientRegistry = Depends(get_registry),
+):
     """
     Catalog workflow — SSE stream of enriched remix results per song.
 
+    Up to `concurrency` songs (default cfg.CATALOG_SONG_CONCURRENCY) are
+    searched at once; each song's tracks are emitted as soon as that song
+    finishes, so `song_index` values may arrive out of order.
+
     Emits:
       status  {"message": "catalog_loaded", "count": N}
       status  {"message": "processing_song", "song": str, "index": N, "total": N}
       track   {"track": TrackResult, "song": str, "song_index": N}
+      timing  {"song_index": N, "track_id": ..., "trace": {...}}  (after each track)
       complete {"count": N, "results": [...]}
     """
-    suffix = Path(file.filename or "").suffix.lower()
-    if suffix not in {".csv", ".xml"}:
-        raise HTTPException(status_code=400, detail="Catalog file must be .csv or .xml")
+    suffix = catalog_suffix(file.filename)
+    if suffix is None:
+        raise HTTPException(status_code=400, detail=f"Catalog file must be one of: {', '.join(SUPPORTED_SUFFIXES)}")
 
     safe_limit = max(1, min(int(limit_remixes or 5), 20))
     safe_min_plays = max(0, int(min_plays or 0))
-    data = await file.read()
-    if not data:
+    safe_concurrency = max(1, min(int(concurrency or cfg.CATALOG_SONG_CONCURRENCY), cfg.CATALOG_MAX_SONG_CONCURRENCY))
+    temp_path, size = await spool_upload(file, suffix)
+    if not size:
+        release_upload(temp_path)
         raise HTTPException(status_code=400, detail="Uploaded catalog file is empty")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(data)
-        temp_path = tmp.name
-
     # How long to wait for a single song before skipping it.
     # Default: 45s per remix slot + 30s buffer. Tune via ?song_timeout=N if needed.
     song_timeout_secs = safe_limit * 45 + 30
+    safe_offset = max(0, int(offset or 0))
+    safe_count = max(0, int(count or 0))
+    clients = registry.async_clients
 
-    def stream():
-        executor = ThreadPoolExecutor(max_workers=1)
+    async def run_song(idx: int, record: dict) -> tuple[int, dict, list[dict] | None, Exception | None, float]:
+        song_t0 = time.perf_counter()
         try:
-            # Fast line count so we can show progress immediately without reading all rows first.
-            approx_total = count_csv_rows(temp_path) if suffix == ".csv" else None
-            yield _sse_event("status", {"message": "catalog_loaded", "count": approx_total or 0})
-
-            safe_offset = max(0, int(offset or 0))
-            safe_count = max(0, int(count or 0))
+            # wait_for cancels the search on timeout, so it never holds a slot.
+            reports = await asyncio.wait_for(
+                pipeline_async.search_song_remixes(
+                    record["title"], record.get("artist"), safe_limit, clients, safe_min_plays,
+                    record.get("isrc"),
+                ),
+                timeout=song_timeout_secs,
+            )
+        except Exception as exc:
+            return idx, record, None, exc, time.perf_counter() - song_t0
+        return idx, record, reports, None, time.perf_counter() - song_t0
+
+    async def stream():
+        pending: set[asyncio.Task] = set()
+        count_task = None
+        records = None
+        # One reader thread: batch reads and the final close() of the catalog generator never overlap.
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-read")
+        loop = asyncio.get_running_loop()
+        try:
+            # Exact newline count runs in the background; if it isn't done almost
+            # immediately, report a sampled estimate and start searching anyway.
+            approx_total = None
+            estimated = False
+            if suffix == ".csv":
+                count_task = asyncio.create_task(asyncio.to_thread(count_csv_rows, temp_path))
+                done, _ = await asyncio.wait({count_task}, timeout=0.25)
+                if done:
+                    approx_total = count_task.result()
+                    count_task = None
+                else:
+                    approx_total = await asyncio.to_thread(estimate_csv_rows, temp_path)
+                    estimated = True
+            else:
+                # Parquet row count comes from footer metadata; other formats report 0 (unknown).
+                approx_total = await asyncio.to_thread(count_catalog_rows, temp_path)
+            yield _sse_event("status", {"message": "catalog_loaded", "count": approx_total or 0, "estimated": estimated})
+            total_display = approx_total or "?"
 
-            clients = make_clients()
             all_items: list[dict] = []
             seen_track_ids: set = set()
-            seen_isrcs: set[str] = set()
-
-            # Stream rows one at a time — dedup and offset/count applied on the fly.
-            valid_idx = 0  # counts records that pass dedup + have a title
-            idx = 0        # counts records actually searched (after offset/count slice)
-            for record in stream_catalog_records(temp_path):
-                if not record.get("title"):
-                    continue
-                isrc = record.get("isrc")
-                if isrc:
-                    if isrc in seen_isrcs:
-                        continue
-                    seen_isrcs.add(isrc)
-
-                valid_idx += 1
-                if valid_idx <= safe_offset:
-                    continue
-                if safe_count > 0 and (valid_idx - safe_offset) > safe_count:
-                    break
-
-                idx += 1
-                title = record["title"]
-                artist = record.get("artist")
-                total_display = approx_total or "?"
-                logger.info("catalog [%d] starting: %r by %r", idx, title, artist)
-                song_t0 = time.perf_counter()
-                yield _sse_event("status", {
-                    "message": "processing_song",
-                    "song": title,
-                    "index": idx,
-                    "total": total_display,
-                })
-
-                future = executor.submit(
-                    search_song_remixes,
-                    title, artist, safe_limit, clients, safe_min_plays,
-                    record.get("isrc"),
-                )
-                try:
-                    reports = future.result(timeout=song_timeout_secs)
-                except FuturesTimeoutError:
-                    logger.warning(
-                        "catalog [%d] TIMEOUT after %ds, skipping: %r",
-                        idx, song_timeout_secs, title,
-                    )
+            records = iter_catalog_songs(temp_path, safe_offset, safe_count)
+            songs = enumerate(records, start=1)  # idx counts records actually searched
+            buffered: deque = deque()
+            exhausted = False
+
+            while pending or not exhausted:
+                if count_task is not None and count_task.done():
+                    if not count_task.exception():
+                        total_display = count_task.result()
+                        yield _sse_event("status", {"message": "catalog_counted", "count": total_display})
+                    count_task = None
+                # Keep up to safe_concurrency songs in flight.
+                while not exhausted and len(pending) < safe_concurrency:
+                    if not buffered:
+                        buffered.extend(await loop.run_in_executor(reader, lambda: list(islice(songs, _CATALOG_READ_BATCH))))
+                    if not buffered:
+                        exhausted = True
+                        break
+                    idx, record = buffered.popleft()
+                    logger.info("catalog [%d] starting: %r by %r", idx, record["title"], record.get("artist"))
                     yield _sse_event("status", {
-                        "message": "song_skipped",
-                        "reason": "timeout",
-                        "song": title,
+                        "message": "processing_song",
+                        "song": record["title"],
                         "index": idx,
                         "total": total_display,
                     })
-                    continue
-                except Exception as exc:
-                    logger.warning(
-                        "catalog [%d] ERROR, skipping: %r — %s",
-                        idx, title, exc,
-                    )
-                    yield _sse_event("status", {
-                        "message": "song_skipped",
-                        "reason": "error",
-                        "song": title,
-                        "index": idx,
-                        "total": total_display,
-                        "error": str(exc),
-                    })
-                    continue
+                    pending.add(asyncio.create_task(run_song(idx, record)))
+                if not pending:
+                    break
 
-                logger.info(
-                    "catalog [%d] done: %r  found=%d  elapsed=%.1fs",
-                    idx, title, len(reports), time.perf_counter() - song_t0,
-                )
-                for report in reports:
-                    item = _summarize_report(report)
-                    tid = item.get("track_id")
-                    if tid and tid in seen_track_ids:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: t.result()[0]):
+                    idx, record, reports, exc, elapsed = task.result()
+                    title = record["title"]
+                    if isinstance(exc, asyncio.TimeoutError):
+                        logger.warning(
+                            "catalog [%d] TIMEOUT after %ds, skipping: %r",
+                            idx, song_timeout_secs, title,
+                        )
+                        yield _sse_event("status", {
+                            "message": "song_skipped",
+                            "reason": "timeout",
+                            "song": title,
+                            "index": idx,
+                            "total": total_display,
+                        })
                         continue
-                    if tid:
-                        seen_track_ids.add(tid)
-                    all_items.append(item)
-                    yield _sse_event("track", {"track": item, "song": title, "song_index": idx})
+                    if exc is not None:
+                        logger.warning(
+                            "catalog [%d] ERROR, skipping: %r — %s",
+                            idx, title, exc,
+                        )
+                        yield _sse_event("status", {
+                            "message": "song_skipped",
+                            "reason": "error",
+                            "song": title,
+                            "index": idx,
+                            "total": total_display,
+                            "error": str(exc),
+                        })
+                        continue
+
+                    logger.info(
+                        "catalog [%d] done: %r  found=%d  elapsed=%.1fs",
+                        idx, title, len(reports), elapsed,
+                    )
+                    for report in reports:
+                        item = _summarize_report(report)
+                        tid = item.get("track_id")
+                        if tid and tid in seen_track_ids:
+                            continue
+                        if tid:
+                            seen_track_ids.add(tid)
+                        all_items.append(item)
+                        yield _sse_event("track", {"track": item, "song": title, "song_index": idx})
+                        yield _timing_event(report, song_index=idx)
 
             dedup_map = {item["track_id"]: item for item in all_items}
             ranked = sorted(
@@ -498,9 +566,14 @@ async def search_catalog(file: UploadFile = File(...), limit_remixes: int = Form
             )
             yield _sse_event("complete", {"count": len(ranked), "results": list(ranked)})
         finally:
-            executor.shutdown(wait=False)
-            path_obj = Path(temp_path)
-            if path_obj.exists():
-                path_obj.unlink()
-
-    return StreamingResponse(stream(), media_type="text/event-stream")
+            # Client disconnected or stream finished: stop any songs still running.
+            for task in pending:
+                task.cancel()
+            if count_task is not None:
+                await asyncio.gather(count_task, return_exceptions=True)  # release the mmap before unlinking
+            if records is not None:
+                await loop.run_in_executor(reader, records.close)  # release the file handle / parser
+            reader.shutdown(wait=False)
+            release_upload(temp_path)
+
+    return StreamingResponse(metered_stream("/api/search/catalog", stream()), media_type="text/event-stream")
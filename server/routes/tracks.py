@@ -2,11 +2,12 @@
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from scripts.pipeline import analyze_track_object, make_clients
+from scripts.pipeline import analyze_track_object
 from scripts.platforms.musicbrainz import get_work_parties
 
+from server.registry import ClientRegistry, get_registry
 from server.schemas import LicensingResponse, TrackDetailRequest
 
 router = APIRouter(prefix="/api/tracks", tags=["tracks"])
@@ -55,13 +56,13 @@ def get_licensing(track_id: int, song_title: str = "", artist_name: str = ""):
 
 
 @router.post("/detail")
-def get_track_detail(payload: TrackDetailRequest):
+def get_track_detail(payload: TrackDetailRequest, registry: ClientRegistry = Depends(get_registry)):
     """
     Optional detail endpoint for compatibility with prior planning.
 
     The frontend can skip this and rely on SSE payloads; this route
     remains available for direct detail retrieval by SoundCloud URL.
     """
-    clients = make_clients()
+    clients = registry.clients
     sc_track = clients["sc"].resolve(payload.sc_url)
     return analyze_track_object(sc_track, clients)
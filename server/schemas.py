@@ -53,3 +53,18 @@ class TrackDetailRequest(BaseModel):
     """Payload for optional explicit track detail analysis endpoint."""
 
     sc_url: str = Field(min_length=8)
+
+
+class RescoreRequest(BaseModel):
+    """Payload for re-ranking result rows under a new scoring profile."""
+
+    results: list[dict] = Field(default_factory=list, description="Result rows from a previous search.")
+    profile: dict = Field(default_factory=dict, description="Partial weight/threshold profile.")
+    limit: int | None = Field(default=None, ge=1)
+
+
+class RescoreJobRequest(BaseModel):
+    """Payload for re-ranking a stored job's results under a new scoring profile."""
+
+    profile: dict = Field(default_factory=dict, description="Partial weight/threshold profile.")
+    limit: int | None = Field(default=None, ge=1)
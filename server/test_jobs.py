@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Failure handling for background catalog jobs.
+
+A store error inside a worker (e.g. SQLite "database is locked") must mark
+the job failed and hand its claimed song back, so the job shows as failed
+and POST /api/jobs/{id}/resume can finish it. The song search itself is
+replaced by a local coroutine; no upstream service is contacted.
+
+Usage:
+    python server/test_jobs.py
+    python -m pytest server/test_jobs.py
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SOUNDCLOUD_CLIENT_ID", "test-client-id")  # skip the client_id auto-fetch
+
+from server import jobs  # noqa: E402
+
+
+class FlakyStore(jobs.JobStore):
+    """JobStore whose finish_song fails while `fail` is set."""
+
+    fail = True
+
+    def finish_song(self, *args, **kwargs):
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        return super().finish_song(*args, **kwargs)
+
+
+async def _fake_search(song_name, artist_name=None, limit=5, clients=None, min_plays=0, isrc=None):
+    return [{"track_id": song_name, "opportunity_score": {"overall": 5}}]
+
+
+async def _wait_for(store, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await asyncio.to_thread(store.get_job, job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job {job_id} stuck in {job['status']!r}")
+
+
+async def _store_error_then_resume(tmp):
+    catalog = os.path.join(tmp, "catalog.csv")
+    with open(catalog, "w", encoding="utf-8") as f:
+        f.write("artist,title,isrc\nA,One,\nB,Two,\nC,Three,\n")
+    store = FlakyStore(os.path.join(tmp, "jobs.sqlite3"))
+    manager = jobs.JobManager(store, clients={}, summarize=lambda report: report, workers=1)
+    await manager.start()
+    try:
+        job = await manager.submit(catalog, "catalog.csv", {"limit_remixes": 1})
+        failed = await _wait_for(store, job["job_id"], {jobs.FAILED})
+        assert "database is locked" in failed["error"]
+        assert failed["done"] == 0 and failed["remaining"] == 3  # the claimed song is pending again
+
+        store.fail = False
+        assert await manager.resume(job["job_id"])
+        done = await _wait_for(store, job["job_id"], jobs.TERMINAL)
+        assert done["status"] == jobs.COMPLETED
+        assert (done["done"], done["remaining"]) == (3, 0)
+    finally:
+        await manager.stop()
+        store.close()
+
+
+def test_store_error_fails_job_and_resume_finishes_it():
+    original = jobs.pipeline_async.search_song_remixes
+    jobs.pipeline_async.search_song_remixes = _fake_search
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(_store_error_then_resume(tmp))
+    finally:
+        jobs.pipeline_async.search_song_remixes = original
+
+
+if __name__ == "__main__":
+    test_store_error_fails_job_and_resume_finishes_it()
+    print("job failure/resume: OK")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Malformed rows sent to the rescore routes.
+
+Result rows come back from API clients, so their scoring_inputs may be
+anything. rescore_results must reject non-numeric numbers, non-string
+stages and non-object inputs with ValueError (POST /api/rescore answers
+400), while rows without scoring_inputs stay unscored and None values
+still score as 0.
+
+Usage:
+    python server/test_rescoring.py
+    python -m pytest server/test_rescoring.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SOUNDCLOUD_CLIENT_ID", "test-client-id")  # skip the client_id auto-fetch
+
+from server.rescoring import rescore_results  # noqa: E402
+
+GOOD = {"plays": 250_000, "likes": 4_000, "remix_stage": "developing", "remix_momentum": None}
+
+
+def _rejected(scoring_inputs):
+    try:
+        rescore_results([{"scoring_inputs": GOOD}, {"scoring_inputs": scoring_inputs}])
+    except ValueError as exc:
+        return str(exc)
+    raise AssertionError(f"accepted {scoring_inputs!r}")
+
+
+def test_malformed_inputs_raise_value_error():
+    assert _rejected({"plays": "lots"}) == "scoring_inputs[1].plays must be a number"
+    assert _rejected({"likes": {"n": 3}}) == "scoring_inputs[1].likes must be a number"
+    assert _rejected({"engagement_rate": True}) == "scoring_inputs[1].engagement_rate must be a number"
+    assert _rejected({"remix_stage": 3}) == "scoring_inputs[1].remix_stage must be a string"
+    assert _rejected("plays=100") == "scoring_inputs[1] must be an object"
+    assert _rejected([100, 200]) == "scoring_inputs[1] must be an object"
+
+
+def test_missing_inputs_stay_unscored():
+    rows = [{"scoring_inputs": None, "track_id": "old"}, {"scoring_inputs": dict(GOOD, likes=None)}]
+    out = rescore_results(rows)
+    assert (out["rescored"], out["unscored"]) == (1, 1)
+    assert [row.get("track_id") for row in out["results"]] == [None, "old"]
+
+
+def test_rescore_route_answers_400():
+    from fastapi.testclient import TestClient
+
+    from server.main import app
+
+    with TestClient(app) as client:
+        resp = client.post("/api/rescore", json={"results": [{"scoring_inputs": {"plays": "lots"}}]})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "scoring_inputs[0].plays must be a number"
+
+
+if __name__ == "__main__":
+    test_malformed_inputs_raise_value_error()
+    test_missing_inputs_stay_unscored()
+    test_rescore_route_answers_400()
+    print("rescore input validation: OK")
@@ -0,0 +1,74 @@
+"""Upload helpers shared by the catalog routes."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from fastapi import UploadFile
+
+_COPY_CHUNK = 1 << 20
+_PROC_FD = "/proc/self/fd"
+
+# Symlink path -> duplicated descriptor of the spool file it points at.
+_held_fds: dict[str, int] = {}
+_held_lock = threading.Lock()
+
+
+def _name_spooled(src, suffix: str) -> tuple[str, int] | None:
+    """
+    Name Starlette's on-disk spool file instead of copying it.
+
+    The spool is an unlinked temp file, so it is reached through a
+    /proc/self/fd symlink carrying the catalog suffix (the readers pick
+    the format from it). The descriptor is duplicated so the file outlives
+    the UploadFile; release_upload() closes it. Returns None for uploads
+    still in memory or where /proc is unavailable, and the caller copies.
+    """
+    if not getattr(src, "_rolled", False) or not os.path.isdir(_PROC_FD):
+        return None
+    src.flush()
+    fd = os.dup(src.fileno())
+    path = os.path.join(tempfile.gettempdir(), f"upload-{uuid.uuid4().hex}{suffix}")
+    try:
+        os.symlink(f"{_PROC_FD}/{fd}", path)
+    except OSError:
+        os.close(fd)
+        return None
+    with _held_lock:
+        _held_fds[path] = fd
+    return path, os.fstat(fd).st_size
+
+
+async def spool_upload(file: UploadFile, suffix: str) -> tuple[str, int]:
+    """
+    Make an upload readable by path.
+
+    Starlette already spools bodies over 1 MiB to disk; that file is used
+    in place. Small in-memory uploads (and platforms without /proc) are
+    copied in 1 MiB chunks on a worker thread, so the upload is never held
+    in memory as one bytes object. Returns (path, size_in_bytes); the
+    caller owns the path and must hand it to release_upload().
+    """
+    def _spool():
+        named = _name_spooled(file.file, suffix)
+        if named is not None:
+            return named
+        file.file.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            shutil.copyfileobj(file.file, tmp, _COPY_CHUNK)
+            return tmp.name, tmp.tell()
+
+    return await asyncio.to_thread(_spool)
+
+
+def release_upload(path: str) -> None:
+    """Delete a path returned by spool_upload(); safe to call more than once."""
+    Path(path).unlink(missing_ok=True)
+    with _held_lock:
+        fd = _held_fds.pop(path, None)
+    if fd is not None:
+        os.close(fd)